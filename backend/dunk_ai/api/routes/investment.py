@@ -1,11 +1,54 @@
+from datetime import date
+from functools import lru_cache
+from typing import Literal, Optional
+
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, Field
 
 from dunk_ai.services.investment_ai import InvestmentAI
-from dunk_ai.tools.investment_navigator.investment import InvestmentNavigator
+from dunk_ai.tools.investment_navigator.forecasting import FIT_TIMEOUT
+from dunk_ai.tools.investment_navigator.projection import MAX_PROJECTION_PATHS, MAX_PROJECTION_YEARS, PROJECTION_PATHS
 
 router = APIRouter(prefix="/api/investment", tags=["Investment Navigator"])
 
-inv = InvestmentNavigator()
+
+class PortfolioTransactionRequest(BaseModel):
+    symbol: str = Field(..., description="Stock name/ticker, or fund name/scheme code")
+    side: Literal["buy", "sell"]
+    quantity: float = Field(..., gt=0)
+    price: float = Field(..., gt=0, description="Price per share or unit")
+    trade_date: date
+    asset_type: Literal["stock", "mutual_fund"] = "stock"
+
+
+class SipProjectionRequest(BaseModel):
+    monthly_amount: float = Field(..., ge=0)
+    years: int = Field(..., ge=1, le=MAX_PROJECTION_YEARS)
+    ticker: Optional[str] = Field(None, description="Stock to take return and volatility from")
+    scheme: Optional[str] = Field(None, description="Fund name or mfapi scheme code to take them from")
+    annual_return_pct: Optional[float] = Field(None, gt=-100)
+    annual_volatility_pct: Optional[float] = Field(None, ge=0)
+    goal: Optional[float] = Field(None, gt=0, description="Target corpus")
+    initial_amount: float = Field(0.0, ge=0)
+    step_up_pct: float = Field(0.0, ge=0, description="Yearly SIP increase in percent")
+    paths: int = Field(PROJECTION_PATHS, ge=1, le=MAX_PROJECTION_PATHS)
+    seed: Optional[int] = None
+
+
+@lru_cache(maxsize=None)
+def _navigator():
+    # The market-data stack is imported by the first investment request,
+    # not by workers that only serve other routers
+    from dunk_ai.tools.investment_navigator.investment import InvestmentNavigator
+
+    return InvestmentNavigator()
+
+
+@lru_cache(maxsize=None)
+def _investment_ai() -> InvestmentAI:
+    return InvestmentAI()
+
 
 def _ensure_success(data):
     if "error" in data:
@@ -17,7 +60,7 @@ def _ensure_success(data):
 def get_stock_details(ticker: str):
     """Fetch full stock analytics (price, RSI, volatility, forecast, etc)."""
     try:
-        data = _ensure_success(inv.get_stock_analytics(ticker))
+        data = _ensure_success(_navigator().get_stock_analytics(ticker))
         return data
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -27,7 +70,7 @@ def get_stock_details(ticker: str):
 def get_stock_summary(ticker: str):
     """Fetch only AI insight summary (for chatbot or dashboard view)."""
     try:
-        data = _ensure_success(inv.get_stock_analytics(ticker))
+        data = _ensure_success(_navigator().get_stock_analytics(ticker))
         return {
             "ticker": data["ticker"],
             "summary": data["insight_summary"],
@@ -39,14 +82,22 @@ def get_stock_summary(ticker: str):
 
 @router.get("/plot/{ticker}")
 def get_forecast_plot(ticker: str):
-    """Return path to generated forecast chart."""
+    """
+    Return path to the forecast chart, rendering it only if its data changed.
+
+    A render still running after the wait answers 202 with a Retry-After
+    header and no chart_path; retrying later returns the chart.
+    """
     try:
-        data = _ensure_success(inv.get_stock_analytics(ticker))
-        return {
-            "ticker": ticker,
-            "chart_path": data.get("forecast_chart_path"),
-            "forecast_confidence": data.get("forecast_confidence")
-        }
+        data = _ensure_success(_navigator().get_stock_chart(ticker))
+        if data["chart_status"] == "pending":
+            return JSONResponse(
+                status_code=202, content=data,
+                headers={"Retry-After": str(data["retry_after_seconds"])}
+            )
+        return data
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -56,8 +107,7 @@ def get_ai_insight(ticker: str):
     """
     Generate an AI-powered investment insight using DeepSeek R1 via Ollama.
     """
-    ai = InvestmentAI()
-    result = ai.generate_ai_insight(ticker)
+    result = _investment_ai().generate_ai_insight(ticker)
     return result
 
 
@@ -67,7 +117,7 @@ def get_live_price(query: str):
     Fetch the latest price snapshot for a stock from Yahoo/NSE/Google.
     """
     try:
-        data = _ensure_success(inv.get_stock_price(query))
+        data = _ensure_success(_navigator().get_stock_price(query))
         return data
     except HTTPException:
         raise
@@ -75,13 +125,51 @@ def get_live_price(query: str):
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+@router.get("/prices")
+def get_live_prices(tickers: str = Query(..., description="Comma-separated stock names or tickers")):
+    """
+    Fetch latest prices for a watchlist as a compact table.
+    """
+    try:
+        return _navigator().get_stock_prices(tickers.split(","))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.get("/forecasts")
+def get_forecasts(
+    tickers: str = Query(..., description="Comma-separated stock names or tickers"),
+    workers: int = Query(None, ge=1, description="Fits kept in flight at once"),
+    timeout: float = Query(FIT_TIMEOUT, gt=0, description="Seconds allowed per fit")
+):
+    """
+    Fetch 7-day ARIMA forecasts for a watchlist, fitted in parallel.
+    """
+    try:
+        return _navigator().get_forecasts(tickers.split(","), max_workers=workers, timeout=timeout)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.get("/price-sources")
+def get_price_source_health():
+    """
+    Report recent latency and success rate of each live price source.
+    """
+    return _navigator().get_price_source_health()
+
+
 @router.get("/mutual-fund")
 def get_mutual_fund_nav(scheme_name: str = Query(..., alias="scheme")):
     """
     Fetch latest NAV for a mutual fund scheme by name.
     """
     try:
-        data = _ensure_success(inv.get_mutual_fund_nav(scheme_name))
+        data = _ensure_success(_navigator().get_mutual_fund_nav(scheme_name))
         return data
     except HTTPException:
         raise
@@ -89,13 +177,108 @@ def get_mutual_fund_nav(scheme_name: str = Query(..., alias="scheme")):
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+@router.get("/mutual-fund/search")
+def search_mutual_funds(
+    query: str = Query(..., alias="q", description="Scheme name"),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Search mutual fund schemes by name in the local scheme index.
+    """
+    try:
+        return _navigator().search_mutual_funds(query, limit=limit)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.get("/mutual-fund/history")
+def get_mutual_fund_history(
+    scheme: str = Query(..., description="Scheme name or mfapi scheme code"),
+    period: str = Query("1y", description="1m, 3m, 6m, 1y, 3y, 5y or max")
+):
+    """
+    Fetch the NAV history of a mutual fund scheme from the NAV cache.
+    """
+    try:
+        return _navigator().get_mutual_fund_history(scheme, period)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.get("/mutual-fund/returns")
+def get_mutual_fund_returns(scheme: str = Query(..., description="Scheme name or mfapi scheme code")):
+    """
+    Trailing 1M-5Y returns and CAGR of a mutual fund scheme.
+    """
+    try:
+        return _navigator().get_mutual_fund_returns(scheme)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
 @router.get("/portfolio/{user_id}")
 def get_portfolio(user_id: str):
     """
-    Return a placeholder portfolio summary (future hook for DB integration).
+    Value a user's portfolio: P&L, allocation weights, XIRR and drawdown.
     """
     try:
-        return inv.portfolio_summary(user_id)
+        return _navigator().portfolio_summary(user_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
     except Exception as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
+
+@router.get("/portfolio/{user_id}/transactions")
+def get_portfolio_transactions(user_id: str):
+    """
+    List a user's portfolio transactions, oldest first.
+    """
+    return _navigator().get_portfolio_transactions(user_id)
+
+
+@router.post("/portfolio/{user_id}/transactions")
+def add_portfolio_transaction(user_id: str, payload: PortfolioTransactionRequest):
+    """
+    Record a buy or sell of a stock or mutual fund.
+    """
+    try:
+        return _navigator().add_portfolio_transaction(user_id, **payload.dict())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
+
+
+@router.delete("/portfolio/{user_id}/transactions/{transaction_id}")
+def delete_portfolio_transaction(user_id: str, transaction_id: int):
+    """
+    Delete one of a user's portfolio transactions.
+
+    Deleting a buy that a later sell depends on is rejected with 400.
+    """
+    try:
+        return _ensure_success(_navigator().delete_portfolio_transaction(user_id, transaction_id))
+    except HTTPException:
+        raise
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.post("/sip/projection")
+def project_sip(payload: SipProjectionRequest):
+    """
+    Monte Carlo SIP projection: percentile bands and the chance of reaching a goal.
+    """
+    try:
+        return _navigator().project_sip(**payload.dict())
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    except Exception as exc:
+        raise HTTPException(status_code=500, detail=str(exc)) from exc
@@ -1,10 +1,15 @@
+import json
 from datetime import date, datetime
-from typing import List, Literal, Optional
+from typing import List, Literal, Optional, Union
 
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from dunk_ai.tools.loan_clarity import (
+    BATCH_REQUEST_MAX_ROWS,
+    SENSITIVITY_REQUEST_MAX_AXIS,
+    SENSITIVITY_REQUEST_MAX_CELLS,
     calculate_affordability,
     calculate_early_settlement,
     calculate_effective_rate,
@@ -13,13 +18,23 @@ from dunk_ai.tools.loan_clarity import (
     calculate_prepayment_impact,
     calculate_tax_benefits,
     compare_loans,
+    extend_year_wise_summary,
     flat_rate,
+    flat_rate_batch,
     generate_amortization_schedule,
+    get_loan_terms,
     get_outstanding_principal,
     get_year_wise_summary,
+    iter_amortization_columns,
+    loan_sensitivity_grid,
     modify_emi,
     modify_tenure,
     reducing_balance,
+    reducing_balance_batch,
+    schedule_columns_to_lists,
+    schedule_columns_to_rows,
+    sensitivity_grid_to_lists,
+    simulate_loan_scenario,
 )
 from dunk_ai.tools.loan_clarity.effective_rate import calculate_apr
 
@@ -39,8 +54,17 @@ class LoanPayloadWithMethod(LoanPayload):
     interest_method: InterestMethod = "reducing"
 
 
+class BatchEmiRequest(BaseModel):
+    principal: List[float] = Field(..., min_length=1, max_length=BATCH_REQUEST_MAX_ROWS)
+    annual_rate: List[float] = Field(..., min_length=1, max_length=BATCH_REQUEST_MAX_ROWS)
+    tenure_years: List[float] = Field(..., min_length=1, max_length=BATCH_REQUEST_MAX_ROWS)
+    repayment_frequency: Union[Frequency, List[Frequency]] = "monthly"
+    interest_method: InterestMethod = "reducing"
+
+
 class ScheduleRequest(LoanPayloadWithMethod):
     start_date: Optional[date] = None
+    layout: Literal["rows", "columns"] = "rows"
 
 
 class OutstandingRequest(LoanPayloadWithMethod):
@@ -53,6 +77,35 @@ class PrepaymentRequest(LoanPayloadWithMethod):
     reduce_emi: bool = True
 
 
+class ScenarioEvent(BaseModel):
+    type: Literal["lump_sum", "emi_change", "rate_change", "holiday"]
+    period: int = Field(..., ge=0)
+    amount: Optional[float] = Field(None, gt=0)
+    emi: Optional[float] = Field(None, gt=0)
+    percent: Optional[float] = Field(None, gt=-100)
+    annual_rate: Optional[float] = Field(None, ge=0)
+    recompute_emi: Optional[bool] = None
+    periods: Optional[int] = Field(None, ge=1)
+    every: Optional[int] = Field(None, ge=1)
+    count: Optional[int] = Field(None, ge=1)
+    until: Optional[int] = Field(None, ge=0)
+
+
+class ScenarioRequest(LoanPayload):
+    events: List[ScenarioEvent] = []
+
+
+class SensitivityRequest(BaseModel):
+    annual_rates: List[float] = Field(..., min_length=1, max_length=SENSITIVITY_REQUEST_MAX_AXIS)
+    tenure_years: List[float] = Field(..., min_length=1, max_length=SENSITIVITY_REQUEST_MAX_AXIS)
+    principals: List[float] = Field(..., min_length=1, max_length=SENSITIVITY_REQUEST_MAX_AXIS)
+    repayment_frequency: Frequency = "monthly"
+    interest_method: InterestMethod = "reducing"
+    processing_fee_percent: float = Field(0.0, ge=0, lt=100)
+    other_charges: float = Field(0.0, ge=0)
+    squeeze: bool = True
+
+
 class EarlySettlementRequest(LoanPayloadWithMethod):
     payments_made: int = Field(..., ge=0)
     prepayment_charges: float = Field(0, ge=0)
@@ -86,6 +139,8 @@ class TaxBenefitsRequest(LoanPayloadWithMethod):
     tax_slab: float = Field(30.0, ge=0, le=30)
     is_first_time_buyer: bool = False
     is_self_occupied: bool = True
+    financial_year: Optional[int] = Field(None, ge=1900, le=2200)
+    start_date: Optional[date] = None
 
 
 class EligibilityRequest(BaseModel):
@@ -151,6 +206,20 @@ def calculate_reducing_balance_emi(payload: LoanPayload):
     }
 
 
+@router.post("/emi/batch")
+def calculate_batch_emi(payload: BatchEmiRequest):
+    batch = flat_rate_batch if payload.interest_method == "flat" else reducing_balance_batch
+    result = _handle_errors(
+        batch,
+        payload.principal,
+        payload.annual_rate,
+        payload.tenure_years,
+        payload.repayment_frequency,
+        max_rows=BATCH_REQUEST_MAX_ROWS,
+    )
+    return {key: values.tolist() for key, values in result.items()}
+
+
 @router.post("/schedule")
 def generate_schedule(payload: ScheduleRequest):
     start_dt = (
@@ -166,9 +235,48 @@ def generate_schedule(payload: ScheduleRequest):
         payload.repayment_frequency,
         payload.interest_method,
         start_dt,
+        as_columns=True,
     )
     summary = get_year_wise_summary(schedule)
-    return {"schedule": schedule, "yearly_summary": summary}
+    if payload.layout == "columns":
+        return {"schedule": schedule_columns_to_lists(schedule), "yearly_summary": summary}
+    return {"schedule": schedule_columns_to_rows(schedule), "yearly_summary": summary}
+
+
+@router.post("/schedule/stream")
+def stream_schedule(payload: ScheduleRequest):
+    """Stream schedule rows as NDJSON, followed by a final `yearly_summary` line."""
+    start_dt = (
+        datetime.combine(payload.start_date, datetime.min.time())
+        if payload.start_date
+        else None
+    )
+    # Validate up front so bad input still returns a 400 instead of a broken stream
+    _handle_errors(
+        get_loan_terms,
+        payload.principal,
+        payload.annual_rate,
+        payload.tenure_years,
+        payload.repayment_frequency,
+        payload.interest_method,
+    )
+
+    def ndjson_lines():
+        summary = []
+        for columns in iter_amortization_columns(
+            payload.principal,
+            payload.annual_rate,
+            payload.tenure_years,
+            payload.repayment_frequency,
+            payload.interest_method,
+            start_dt,
+        ):
+            for row in schedule_columns_to_rows(columns):
+                yield json.dumps(row) + "\n"
+            extend_year_wise_summary(summary, columns)
+        yield json.dumps({"yearly_summary": summary}) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
 
 
 @router.post("/schedule/outstanding")
@@ -201,6 +309,36 @@ def prepayment_impact(payload: PrepaymentRequest):
     return result
 
 
+@router.post("/scenario")
+def prepayment_scenario(payload: ScenarioRequest):
+    result = _handle_errors(
+        simulate_loan_scenario,
+        payload.principal,
+        payload.annual_rate,
+        payload.tenure_years,
+        payload.repayment_frequency,
+        [event.dict(exclude_none=True) for event in payload.events],
+    )
+    return result
+
+
+@router.post("/sensitivity")
+def sensitivity_grid(payload: SensitivityRequest):
+    grid = _handle_errors(
+        loan_sensitivity_grid,
+        payload.annual_rates,
+        payload.tenure_years,
+        payload.principals,
+        payload.repayment_frequency,
+        payload.interest_method,
+        payload.processing_fee_percent,
+        payload.other_charges,
+        parallel=False,
+        max_cells=SENSITIVITY_REQUEST_MAX_CELLS,
+    )
+    return sensitivity_grid_to_lists(grid, squeeze=payload.squeeze)
+
+
 @router.post("/early-settlement")
 def early_settlement(payload: EarlySettlementRequest):
     result = _handle_errors(
@@ -265,6 +403,8 @@ def tax_benefits(payload: TaxBenefitsRequest):
         payload.tax_slab,
         payload.is_first_time_buyer,
         payload.is_self_occupied,
+        payload.financial_year,
+        payload.start_date,
     )
     lifetime = _handle_errors(
         calculate_lifetime_tax_benefits,
@@ -277,6 +417,7 @@ def tax_benefits(payload: TaxBenefitsRequest):
         payload.tax_slab,
         payload.is_first_time_buyer,
         payload.is_self_occupied,
+        payload.start_date,
     )
     return {"annual": result, "lifetime": lifetime}
 
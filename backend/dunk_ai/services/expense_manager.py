@@ -8,13 +8,12 @@ so it can be reused by APIs, MCP tools, or other backends.
 from __future__ import annotations
 
 import logging
+import threading
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
-import joblib
 import numpy as np
-import pandas as pd
 
 
 logger = logging.getLogger(__name__)
@@ -73,17 +72,41 @@ class ExpensePlanner:
                 / "final_gradient_boosting_pipeline.pkl"
             )
         self.model_path = model_path
-        self.model = None
-        self.model_error: Optional[str] = None
+        # The pipeline (and scikit-learn) is only loaded by the first plan
+        self._model: Any = None
+        self._model_error: Optional[str] = None
+        self._model_loaded = False
+        self._model_lock = threading.Lock()
+
+    @property
+    def model(self) -> Any:
+        """The trained pipeline, or None if it could not be loaded."""
+        self._load_model()
+        return self._model
+
+    @property
+    def model_error(self) -> Optional[str]:
+        """Why the pipeline is unavailable, if it is."""
+        self._load_model()
+        return self._model_error
+
+    def _load_model(self) -> None:
+        if self._model_loaded:
+            return
+        with self._model_lock:
+            if self._model_loaded:
+                return
+            if not self.model_path.exists():
+                self._model_error = f"Expense Manager model not found at {self.model_path}"
+            else:
+                try:
+                    import joblib
 
-        if not model_path.exists():
-            self.model_error = f"Expense Manager model not found at {model_path}"
-        else:
-            try:
-                self.model = joblib.load(model_path)
-            except Exception as exc:  # pragma: no cover - environment-specific
-                self.model_error = str(exc)
-                logger.warning("Falling back to rule-based allocations: %s", exc)
+                    self._model = joblib.load(self.model_path)
+                except Exception as exc:  # pragma: no cover - environment-specific
+                    self._model_error = str(exc)
+                    logger.warning("Falling back to rule-based allocations: %s", exc)
+            self._model_loaded = True
 
     def generate_plan(
         self,
@@ -192,6 +215,8 @@ class ExpensePlanner:
         city_tier: str,
         disposable_income: float,
     ) -> Dict[str, float]:
+        import pandas as pd
+
         features = pd.DataFrame(
             [
                 {
@@ -1,28 +1,59 @@
 # tools/investment_navigator/investment.py
 import logging
 import warnings
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
-import matplotlib
-
-matplotlib.use("Agg")
-
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
 import numpy as np
 import requests
-import yfinance as yf
-from statsmodels.tsa.arima.model import ARIMA
-from statsmodels.tools.sm_exceptions import ConvergenceWarning, ValueWarning
 
-# 🔇 Silence all statsmodels warnings globally
+from dunk_ai.tools.investment_navigator.charts import CHART_RETRY_AFTER, ChartRenderer, chart_renderer
+from dunk_ai.tools.investment_navigator.http_client import (
+    BROWSER_HEADERS,
+    AsyncHttpClient,
+    NseSession,
+    http_client,
+    nse_session,
+)
+from dunk_ai.tools.investment_navigator.forecasting import (
+    FIT_TIMEOUT,
+    MIN_FORECAST_BARS,
+    ForecastService,
+    forecast_service,
+)
+from dunk_ai.tools.investment_navigator.history_store import OhlcvStore, frame_to_bars, history_store
+from dunk_ai.tools.investment_navigator.indicators import IndicatorEngine, indicator_engine, rsi_series
+from dunk_ai.tools.investment_navigator.market_data import (
+    MarketDataCache,
+    last_completed_session,
+    market_data_cache,
+)
+from dunk_ai.tools.investment_navigator.mutual_funds import (
+    NavCache,
+    SchemeIndex,
+    nav_cache,
+    nav_returns,
+    period_start,
+    scheme_index,
+)
+from dunk_ai.tools.investment_navigator.portfolio import PortfolioStore, portfolio_store, value_portfolio
+from dunk_ai.tools.investment_navigator.price_sources import (
+    SourceHealth,
+    hedged_call,
+    hedged_call_async,
+    price_source_health,
+)
+from dunk_ai.tools.investment_navigator.projection import PROJECTION_PATHS, estimate_parameters, simulate_sip
+from dunk_ai.tools.investment_navigator.ticker_index import TickerIndex, ticker_index
+
+# 🔇 Silence all statsmodels warnings globally (its ValueWarning and
+# ConvergenceWarning are UserWarnings, so statsmodels need not be imported)
 warnings.filterwarnings("ignore", category=UserWarning)
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=RuntimeWarning)
-warnings.filterwarnings("ignore", category=ValueWarning)
-warnings.filterwarnings("ignore", category=ConvergenceWarning)
 warnings.filterwarnings("ignore", message="A date index has been provided")
 warnings.filterwarnings("ignore", message="No supported index is available")
 warnings.filterwarnings("ignore", message="Prediction results will be given with an integer index")
@@ -32,276 +63,420 @@ warnings.filterwarnings("ignore", message="Maximum Likelihood optimization faile
 logging.getLogger("statsmodels").setLevel(logging.CRITICAL)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[4]
-PLOTS_DIR = PROJECT_ROOT / "assets" / "plots"
+
+YAHOO_SEARCH_URL = "https://query2.finance.yahoo.com/v1/finance/search?q={query}"
+NSE_QUOTE_URL = "https://www.nseindia.com/api/quote-equity?symbol={symbol}"
+NSE_REFERER_URL = "https://www.nseindia.com/get-quotes/equity?symbol={symbol}"
+GOOGLE_QUOTE_URL = "https://www.google.com/finance/quote/{symbol}:NSE"
+MF_SEARCH_URL = "https://api.mfapi.in/mf/search?q={query}"
+
+# Default price-source order before any health data exists
+PRICE_SOURCES = ("yahoo", "nse", "google")
+
+MAX_BATCH_QUOTES = 50
+MAX_BATCH_FORECASTS = 50
+
+# Batched download periods for portfolio valuation, by days since the first trade
+PORTFOLIO_PERIODS = (("1y", 365), ("2y", 730), ("5y", 1826), ("max", None))
+QUOTE_TABLE_COLUMNS = [
+    "query", "ticker", "current_price", "previous_close",
+    "day_change", "day_change_percent", "trend", "source"
+]
+
+
+def _normalize_query(name: str) -> str:
+    return name.strip().lower().replace(" ", "")
+
+
+def _match_from_search(name: str, data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """First quote of a Yahoo search response, if any."""
+    if "quotes" in data and data["quotes"]:
+        match = data["quotes"][0]
+        print(f"[resolve_ticker] ✅ Yahoo found {match['symbol']} for '{name}'")
+        return match
+    return None
+
+
+def _guess_symbol(query: str) -> str:
+    """Guess an NSE symbol when neither the index nor the search knows the name."""
+    guessed_symbol = query.upper() + ".NS"
+    print(f"[resolve_ticker] 🧩 Guessing ticker: {guessed_symbol}")
+    return guessed_symbol
+
+
+def _quote_from_history(ticker: str, data) -> Optional[Dict[str, Any]]:
+    """Price snapshot from recent Yahoo history, or None if it is unusable."""
+    if data is None or data.empty or "Close" not in data.columns or len(data["Close"].dropna()) < 2:
+        return None
+
+    # ✅ Defensive checks
+    latest = data["Close"].dropna().iloc[-1]
+    previous = data["Close"].dropna().iloc[-2]
+    if np.isnan(latest) or np.isnan(previous):
+        return None
+
+    day_change = latest - previous
+    day_change_percent = (day_change / previous) * 100
+    trend = "Bullish" if day_change > 0 else "Bearish" if day_change < 0 else "Neutral"
+
+    print(f"[get_stock_price] ✅ Yahoo Finance data fetched successfully for {ticker}")
+    return {
+        "ticker": ticker,
+        "current_price": round(float(latest), 2),
+        "previous_close": round(float(previous), 2),
+        "day_change": round(float(day_change), 2),
+        "day_change_percent": round(float(day_change_percent), 2),
+        "trend": trend,
+        "currency": "INR",
+        "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "note": "Live data + analytics from Yahoo Finance",
+        "source": "Yahoo Finance"
+    }
+
+
+def _quote_from_nse(symbol: str, response) -> Dict[str, Any]:
+    """Price snapshot from an NSE quote response (requests or httpx)."""
+    symbol_enc = symbol.replace(".NS", "").upper()
+    if response.status_code != 200:
+        return {"error": f"NSE returned HTTP {response.status_code}", "ticker": symbol}
+
+    try:
+        data = response.json()
+    except ValueError:
+        return {"error": "NSE returned non-JSON data (likely blocked)", "ticker": symbol}
+
+    price_info = data.get("priceInfo", {})
+    if not price_info:
+        return {"error": f"NSE returned empty price data for {symbol}"}
+
+    last_price = price_info.get("lastPrice")
+    prev_close = price_info.get("previousClose")
+    if last_price is None or prev_close is None:
+        return {"error": f"NSE missing key fields for {symbol}"}
+
+    change = last_price - prev_close
+    change_percent = (change / prev_close) * 100
+    trend = "Bullish" if change > 0 else "Bearish" if change < 0 else "Neutral"
+
+    print(f"[get_nse_price] ✅ NSE live data fetched successfully for {symbol_enc}")
+    return {
+        "ticker": symbol_enc + ".NS",
+        "current_price": round(last_price, 2),
+        "previous_close": round(prev_close, 2),
+        "day_change": round(change, 2),
+        "day_change_percent": round(change_percent, 2),
+        "trend": trend,
+        "currency": "INR",
+        "note": "Live data from NSE India API",
+        "source": "NSE"
+    }
+
+
+def _quote_from_google(symbol: str, response) -> Dict[str, Any]:
+    """Price snapshot scraped from a Google Finance quote page."""
+    import re
+    from bs4 import BeautifulSoup
+
+    symbol_enc = symbol.replace(".NS", "").replace(".BO", "").upper()
+    if response.status_code != 200:
+        return {"error": f"Google returned HTTP {response.status_code}", "ticker": symbol}
+
+    # Look for the current price span (Google's HTML pattern)
+    soup = BeautifulSoup(response.text, "html.parser")
+    price_tag = soup.find("div", {"class": "YMlKec"})
+    if not price_tag:
+        return {"error": f"Google Finance price not found for {symbol}"}
+
+    current_price = float(re.sub(r"[^\d.]", "", price_tag.text))
+
+    print(f"[get_google_price] ✅ Google Finance data fetched successfully for {symbol_enc}")
+    return {
+        "ticker": symbol_enc + ".NS",
+        "current_price": current_price,
+        "previous_close": None,
+        "day_change": None,
+        "day_change_percent": None,
+        "trend": "N/A",
+        "currency": "INR",
+        "note": "Live data from Google Finance",
+        "source": "Google Finance"
+    }
+
+
+def _predicted_trend(predicted_change: float) -> str:
+    """Label a forecast move (in %) the way analytics reports it."""
+    if predicted_change > 1:
+        return "Bullish"
+    if predicted_change < -1:
+        return "Bearish"
+    return "Stable"
+
 
 class InvestmentNavigator:
     """
     Investment Navigator with live market and mutual fund data.
+
+    Every blocking method has an `*_async` counterpart built on the shared
+    pooled HTTP client, for use from async code such as the MCP server.
     """
 
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        market_data: MarketDataCache = None,
+        client: AsyncHttpClient = None,
+        nse: NseSession = None,
+        health: SourceHealth = None,
+        tickers: TickerIndex = None,
+        history: OhlcvStore = None,
+        indicators: IndicatorEngine = None,
+        forecasts: ForecastService = None,
+        charts: ChartRenderer = None,
+        schemes: SchemeIndex = None,
+        navs: NavCache = None,
+        portfolio: PortfolioStore = None
+    ):
+        # Shared TTL cache of price history (see market_data.py)
+        self.market_data = market_data or market_data_cache
+        # Shared pooled HTTP clients (see http_client.py)
+        self.client = client or http_client
+        self.nse = nse or nse_session
+        # Shared price-source health used to order hedged quotes
+        self.health = health or price_source_health
+        # Shared local name -> symbol index (see ticker_index.py)
+        self.tickers = tickers or ticker_index
+        # Shared on-disk daily bar store used by analytics (see history_store.py)
+        self.history = history or history_store
+        # Shared rolling indicator state (see indicators.py)
+        self.indicators = indicators or indicator_engine
+        # Shared cached ARIMA forecasts (see forecasting.py)
+        self.forecasts = forecasts or forecast_service
+        # Shared content-addressed chart cache (see charts.py)
+        self.charts = charts or chart_renderer
+        # Shared mutual fund scheme index and NAV histories (see mutual_funds.py)
+        self.schemes = schemes or scheme_index
+        self.navs = navs or nav_cache
+        # Shared SQLite portfolio transactions (see portfolio.py)
+        self.portfolio = portfolio or portfolio_store
 
     def resolve_ticker(self, name: str) -> str:
-        query = name.strip().lower().replace(" ", "")
-
-        # --- Local fallback map ---
-        fallback_map = {
-            "reliance": "RELIANCE.NS",
-            "tcs": "TCS.NS",
-            "tatamotors": "TATAMOTORS.NS",
-            "infosys": "INFY.NS",
-            "hdfcbank": "HDFCBANK.NS",
-            "icicibank": "ICICIBANK.NS",
-            "sbi": "SBIN.NS",
-            "hcl": "HCLTECH.NS",
-            "wipro": "WIPRO.NS",
-            "lt": "LT.NS",
-            "itc": "ITC.NS",
-            "tata steel": "TATASTEEL.NS",
-            "adani ports": "ADANIPORTS.NS",
-            "adani enterprises": "ADANIENT.NS",
-            "adani power": "ADANIPOWER.NS",
-            "adani total gas": "ATGL.NS",
-            "adani green": "ADANIGREEN.NS",
-            "zomato": "ZOMATO.NS",
-            "nykaa": "NYKAA.NS",
-            "hdfc life": "HDFCLIFE.NS",
-            "axis bank": "AXISBANK.NS",
-            "bajaj finance": "BAJFINANCE.NS",
-            "maruti": "MARUTI.NS",
-            "mahindra": "M&M.NS",
-            "nestle": "NESTLEIND.NS",
-            "hindustan unilever": "HINDUNILVR.NS",
-            "asian paints": "ASIANPAINT.NS",
-            "ultratech cement": "ULTRACEMCO.NS",
-            "titan": "TITAN.NS",
-            "coal india": "COALINDIA.NS",
-            "ongc": "ONGC.NS",
-            "indusind bank": "INDUSINDBK.NS",
-            "ntpc": "NTPC.NS",
-            "power grid": "POWERGRID.NS",
-            "jsw steel": "JSWSTEEL.NS",
-            "bharat petroleum": "BPCL.NS",
-            "hindalco": "HINDALCO.NS",
-            "cipla": "CIPLA.NS",
-            "sun pharma": "SUNPHARMA.NS",
-            "dr reddy": "DRREDDY.NS",
-            "tvs motor": "TVSMOTOR.NS",
-            "eicher motors": "EICHERMOT.NS",
-            "divis labs": "DIVISLAB.NS",
-            "tata power": "TATAPOWER.NS",
-            "apollo hospitals": "APOLLOHOSP.NS",
-            "kotak bank": "KOTAKBANK.NS"
-        }
+        """
+        Resolve a company name or symbol to a Yahoo ticker.
 
-        # --- Try live Yahoo search first ---
+        Symbols and exactly known names or aliases are answered by the
+        local ticker index without network access. Anything else goes to
+        the Yahoo search first, whose matches are added to the index for
+        next time; the index's fuzzy match is only used if the search
+        misses, since similar names often belong to different companies.
+        """
+        symbol = self.tickers.resolve(name)
+        if symbol:
+            return symbol
+        query = _normalize_query(name)
 
+        # --- Try live Yahoo search ---
         try:
-            url = f"https://query2.finance.yahoo.com/v1/finance/search?q={query}"
-            headers = {"User-Agent": "Mozilla/5.0"}  # ✅ Add this
-            response = requests.get(url, headers=headers, timeout=5)
-            data = response.json()
-
-            if "quotes" in data and data["quotes"]:
-                symbol = data["quotes"][0]["symbol"]
-                print(f"[resolve_ticker] ✅ Yahoo found {symbol} for '{name}'")
-                return symbol
-
+            response = requests.get(YAHOO_SEARCH_URL.format(query=query), headers=BROWSER_HEADERS, timeout=5)
+            match = _match_from_search(name, response.json())
+            if match:
+                return self._remember(name, match)
         except Exception as e:
             print(f"[resolve_ticker] ⚠️ Yahoo lookup failed: {e}")
 
         # --- Fallback handling ---
-        fallback_symbol = fallback_map.get(query)
-        if fallback_symbol:
-           print(f"[resolve_ticker] 🔁 Fallback used: {fallback_symbol}")
-           return fallback_symbol
+        return self._fallback_symbol(name, query)
 
-        guessed_symbol = query.upper() + ".NS"
-        print(f"[resolve_ticker] 🧩 Guessing ticker: {guessed_symbol}")
-        return guessed_symbol
+    async def resolve_ticker_async(self, name: str) -> str:
+        symbol = self.tickers.resolve(name)
+        if symbol:
+            return symbol
+        query = _normalize_query(name)
+        try:
+            data = await self.client.get_json(YAHOO_SEARCH_URL.format(query=query), timeout=5)
+            match = _match_from_search(name, data)
+            if match:
+                return self._remember(name, match)
+        except Exception as e:
+            print(f"[resolve_ticker] ⚠️ Yahoo lookup failed: {e}")
+        return self._fallback_symbol(name, query)
+
+    def _fallback_symbol(self, name: str, query: str) -> str:
+        """Fuzzy index match for a name the search did not find, else a guessed symbol."""
+        symbol = self.tickers.match(name)
+        if symbol:
+            print(f"[resolve_ticker] 🔁 Fallback used: {symbol}")
+            return symbol
+        return _guess_symbol(query)
+
+    def _remember(self, name: str, match: Dict[str, Any]) -> str:
+        """Add a Yahoo search match to the ticker index."""
+        symbol = match["symbol"]
+        self.tickers.add(symbol, match.get("longname") or match.get("shortname") or symbol, aliases=[name])
+        return symbol
 
     def get_stock_price(self, query: str) -> Dict[str, Any]:
         """
         Fetch live stock price by name or ticker.
         Example: 'Reliance' or 'TCS.NS' both work.
+
+        Yahoo Finance, NSE and Google Finance are raced under one deadline
+        (see price_sources.py): the healthiest source starts first, the next
+        one after a short hedge delay, and the first valid quote wins.
         """
+        # Auto-resolve ticker from name
+        ticker = self.resolve_ticker(query)
+        print(f"[get_stock_price] 🔍 Fetching {ticker} from {', '.join(self.health.order(PRICE_SOURCES))}...")
+        return hedged_call({
+            "yahoo": lambda: self._yahoo_quote(ticker),
+            "nse": lambda: self.get_nse_price(ticker),
+            "google": lambda: self.get_google_price(ticker)
+        }, self.health)
+
+    async def get_stock_price_async(self, query: str) -> Dict[str, Any]:
+        ticker = await self.resolve_ticker_async(query)
+        print(f"[get_stock_price] 🔍 Fetching {ticker} from {', '.join(self.health.order(PRICE_SOURCES))}...")
+        return await hedged_call_async({
+            # yfinance is blocking; keep it off the event loop
+            "yahoo": lambda: asyncio.to_thread(self._yahoo_quote, ticker),
+            "nse": lambda: self.get_nse_price_async(ticker),
+            "google": lambda: self.get_google_price_async(ticker)
+        }, self.health)
+
+    def _yahoo_quote(self, ticker: str) -> Dict[str, Any]:
+        """Quote from cached Yahoo history, or an error dict."""
         try:
-            # Auto-resolve ticker from name
-            ticker = self.resolve_ticker(query)
-            print(f"[get_stock_price] 🔍 Checking {ticker} via Yahoo Finance...")
-
-            stock = yf.Ticker(ticker)
-            data = stock.history(period="5d")
-
-            # ✅ Handle Yahoo failures and force NSE fallback
-            if data is None or data.empty or "Close" not in data.columns or len(data["Close"].dropna()) < 2:
-               print(f"[get_stock_price] ⚠️ Yahoo data unavailable for {ticker}, switching to NSE fallback...")
-               nse_result = self.get_nse_price(ticker)
-
-               # ✅ If NSE worked, return that
-               if "error" not in nse_result:
-                   return nse_result
-
-               # 🚨 If NSE also failed, use Google as final fallback
-               print(f"[get_stock_price] ⚠️ NSE fallback failed for {ticker}, switching to Google Finance...")
-               google_result = self.get_google_price(ticker)
-               return google_result
-
-            # ✅ Defensive checks
-            latest = data["Close"].dropna().iloc[-1]
-            previous = data["Close"].dropna().iloc[-2]
-
-            if np.isnan(latest) or np.isnan(previous):
-               print(f"[get_stock_price] ⚠️ Invalid Yahoo price data for {ticker}, switching to NSE fallback...")
-               nse_result = self.get_nse_price(ticker)
-               if "error" not in nse_result:
-                    return nse_result
-               print(f"[get_stock_price] ⚠️ NSE fallback failed for {ticker}, switching to Google Finance...")
-               return self.get_google_price(ticker)
-            
-            
-            # ✅ Normal Yahoo path
-            day_change = latest - previous
-            day_change_percent = (day_change / previous) * 100
-            trend = "Bullish" if day_change > 0 else "Bearish" if day_change < 0 else "Neutral"
-
-
-            print(f"[get_stock_price] ✅ Yahoo Finance data fetched successfully for {ticker}")
-            return {
-            "ticker": ticker,
-            "current_price": round(float(latest), 2),
-            "previous_close": round(float(previous), 2),
-            "day_change": round(float(day_change), 2),
-            "day_change_percent": round(float(day_change_percent), 2),
-            "trend": trend,
-            "currency": "INR",
-            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "note": "Live data + analytics from Yahoo Finance",
-            "source": "Yahoo Finance"
+            quote = _quote_from_history(ticker, self.market_data.get_history(ticker, "5d"))
+        except Exception as e:
+            return {"error": f"Yahoo Finance failed: {e}", "ticker": ticker}
+        if quote is None:
+            print(f"[get_stock_price] ⚠️ Yahoo data unavailable for {ticker}")
+            return {"error": f"Yahoo data unavailable for {ticker}", "ticker": ticker}
+        return quote
+
+    def get_price_source_health(self) -> Dict[str, Any]:
+        """
+        Recent latency and success rate per price source.
+
+        Returns:
+            dict: Contains:
+                - order: Order the next quote will try sources in
+                - sources: Per-source attempts, success_rate and avg_latency_ms
+        """
+        return {
+            "order": self.health.order(PRICE_SOURCES),
+            "sources": {source: self.health.stats(source) for source in PRICE_SOURCES}
         }
 
-        except Exception as e:
-            print(f"[get_stock_price] ⚠️ Yahoo failed entirely, using NSE fallback for {query}. Error: {e}")
-            nse_result = self.get_nse_price(ticker)
-            if "error" not in nse_result:
-                return nse_result
-            print(f"[get_stock_price] ⚠️ NSE fallback failed for {ticker}, switching to Google Finance...")
-            return self.get_google_price(ticker)
-        
+    def get_stock_prices(self, queries: List[str]) -> Dict[str, Any]:
+        """
+        Fetch live prices for a watchlist in one pass.
+
+        Tickers are resolved concurrently and their recent history is pulled
+        with a single batched Yahoo download (cache hits are skipped). Only
+        the symbols Yahoo misses fall back to hedged NSE/Google quotes.
+
+        Args:
+            queries (List[str]): Stock names or tickers, e.g. ["TCS", "INFY.NS"]
+
+        Returns:
+            dict: Contains:
+                - columns: Column names of each row
+                - rows: One row per query that returned a price
+                - errors: {query, ticker, error} for queries without a price
+                - last_updated: Timestamp of the batch
+        """
+        queries = list(dict.fromkeys(query.strip() for query in queries if query and query.strip()))
+        if not queries:
+            raise ValueError("At least one ticker is required.")
+        if len(queries) > MAX_BATCH_QUOTES:
+            raise ValueError(f"At most {MAX_BATCH_QUOTES} tickers can be quoted at once.")
+
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as pool:
+            tickers = list(pool.map(self.resolve_ticker, queries))
+            histories = self.market_data.get_histories(tickers, "5d")
+            quotes = {
+                ticker: _quote_from_history(ticker, histories.get(ticker.strip().upper()))
+                for ticker in tickers
+            }
+
+            misses = [ticker for ticker, quote in quotes.items() if quote is None]
+            if misses:
+                print(f"[get_stock_prices] ⚠️ Yahoo batch missed {', '.join(misses)}, using NSE/Google fallbacks...")
+                fallbacks = pool.map(lambda ticker: hedged_call({
+                    "nse": lambda: self.get_nse_price(ticker),
+                    "google": lambda: self.get_google_price(ticker)
+                }, self.health), misses)
+                quotes.update(zip(misses, fallbacks))
+
+        rows, errors = [], []
+        for query, ticker in zip(queries, tickers):
+            quote = quotes[ticker]
+            if "error" in quote:
+                errors.append({"query": query, "ticker": ticker, "error": quote["error"]})
+            else:
+                rows.append([query, ticker] + [quote.get(column) for column in QUOTE_TABLE_COLUMNS[2:]])
+        return {
+            "columns": QUOTE_TABLE_COLUMNS,
+            "rows": rows,
+            "errors": errors,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    async def get_stock_prices_async(self, queries: List[str]) -> Dict[str, Any]:
+        # The batch download is blocking; run the whole batch in a worker thread
+        return await asyncio.to_thread(self.get_stock_prices, queries)
+
     def get_nse_price(self, symbol: str):
         """
-        Fetch live stock price from NSE India API (robust version with cookie + header spoof).
+        Fetch live stock price from NSE India API.
+
+        Uses the shared NSE session, whose cookies are only refreshed from
+        the homepage when stale.
         """
         try:
-           symbol_enc = symbol.replace(".NS", "").upper()
-           url = f"https://www.nseindia.com/api/quote-equity?symbol={symbol_enc}"
-
-           headers = {
-               "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:118.0) Gecko/20100101 Firefox/118.0",
-               "Accept": "application/json, text/plain, */*",
-               "Accept-Language": "en-US,en;q=0.9",
-               "Referer": f"https://www.nseindia.com/get-quotes/equity?symbol={symbol_enc}",
-               "Connection": "keep-alive",
-               "Accept-Encoding": "gzip, deflate, br"
-            }
-            # ✅ Start a session and get initial cookies
-           session = requests.Session()
-           session.get("https://www.nseindia.com", headers=headers, timeout=10)
-
-            # ✅ Now make the actual quote request
-           response = session.get(url, headers=headers, timeout=10)
-
-           if response.status_code == 200:
-                try:
-                   data = response.json()
-                except ValueError:
-                   return {"error": "NSE returned non-JSON data (likely blocked)", "ticker": symbol}
-
-                price_info = data.get("priceInfo", {})
-                if not price_info:
-                   return {"error": f"NSE returned empty price data for {symbol}"}
-
-                last_price = price_info.get("lastPrice")
-                prev_close = price_info.get("previousClose")
-
-                if last_price is None or prev_close is None:
-                   return {"error": f"NSE missing key fields for {symbol}"}
-
-                change = last_price - prev_close
-                change_percent = (change / prev_close) * 100
-                trend = "Bullish" if change > 0 else "Bearish" if change < 0 else "Neutral"
-
-                print(f"[get_nse_price] ✅ NSE live data fetched successfully for {symbol_enc}")
-                return {
-                    "ticker": symbol_enc + ".NS",
-                    "current_price": round(last_price, 2),
-                    "previous_close": round(prev_close, 2),
-                    "day_change": round(change, 2),
-                    "day_change_percent": round(change_percent, 2),
-                    "trend": trend,
-                    "currency": "INR",
-                    "note": "Live data from NSE India API",
-                    "source": "NSE"
-                }
-
-           return {"error": f"NSE returned HTTP {response.status_code}", "ticker": symbol}
+            symbol_enc = symbol.replace(".NS", "").upper()
+            response = self.nse.get(
+                NSE_QUOTE_URL.format(symbol=symbol_enc),
+                referer=NSE_REFERER_URL.format(symbol=symbol_enc),
+                timeout=10
+            )
+            return _quote_from_nse(symbol, response)
+        except Exception as e:
+            return {"error": f"NSE fallback failed: {str(e)}", "ticker": symbol}
 
+    async def get_nse_price_async(self, symbol: str):
+        try:
+            symbol_enc = symbol.replace(".NS", "").upper()
+            response = await self.client.nse_get(
+                NSE_QUOTE_URL.format(symbol=symbol_enc),
+                referer=NSE_REFERER_URL.format(symbol=symbol_enc)
+            )
+            return _quote_from_nse(symbol, response)
         except Exception as e:
             return {"error": f"NSE fallback failed: {str(e)}", "ticker": symbol}
-    
+
     def get_google_price(self, symbol: str):
         """
         Fallback: Fetch live stock price from Google Finance (web-scraping method).
         Works for NSE, BSE, and global tickers.
         """
         try:
-            import re
-            from bs4 import BeautifulSoup
-
-            # Clean symbol name
             symbol_enc = symbol.replace(".NS", "").replace(".BO", "").upper()
-
-            # Build Google Finance URL
-            url = f"https://www.google.com/finance/quote/{symbol_enc}:NSE"
-
-            headers = {
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)",
-                "Accept-Language": "en-US,en;q=0.9",
-            }
-
-            response = requests.get(url, headers=headers, timeout=10)
-            if response.status_code != 200:
-                return {"error": f"Google returned HTTP {response.status_code}", "ticker": symbol}
-
-            # Parse HTML
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Look for the current price span (Google's HTML pattern)
-            price_tag = soup.find("div", {"class": "YMlKec"})
-            if not price_tag:
-                return {"error": f"Google Finance price not found for {symbol}"}
-
-            current_price = float(re.sub(r"[^\d.]", "", price_tag.text))
-
-            print(f"[get_google_price] ✅ Google Finance data fetched successfully for {symbol_enc}")
-
-            return {
-                "ticker": symbol_enc + ".NS",
-                "current_price": current_price,
-                "previous_close": None,
-                "day_change": None,
-                "day_change_percent": None,
-                "trend": "N/A",
-                "currency": "INR",
-                "note": "Live data from Google Finance",
-                "source": "Google Finance"
-            }
-
+            headers = {**BROWSER_HEADERS, "Accept-Language": "en-US,en;q=0.9"}
+            response = requests.get(GOOGLE_QUOTE_URL.format(symbol=symbol_enc), headers=headers, timeout=10)
+            return _quote_from_google(symbol, response)
         except Exception as e:
             return {"error": f"Google fallback failed: {e}", "ticker": symbol}
 
-    
+    async def get_google_price_async(self, symbol: str):
+        try:
+            symbol_enc = symbol.replace(".NS", "").replace(".BO", "").upper()
+            response = await self.client.get(
+                GOOGLE_QUOTE_URL.format(symbol=symbol_enc),
+                headers={"Accept-Language": "en-US,en;q=0.9"}
+            )
+            return _quote_from_google(symbol, response)
+        except Exception as e:
+            return {"error": f"Google fallback failed: {e}", "ticker": symbol}
 
     def get_stock_analytics(self, ticker: str):
         """
@@ -310,52 +485,44 @@ class InvestmentNavigator:
         import pandas as pd
 
         try:
-            stock = yf.Ticker(ticker)
-            hist = stock.history(period="6mo")
+            # Daily bars come from the local store, refreshed incrementally
+            hist = self.history.get_history(ticker, "6mo")
 
             if hist.empty or "Close" not in hist.columns:
                return {"error": "No data found for ticker", "ticker": ticker}
 
-            # --- Calculate core metrics ---
-            current_price = hist["Close"].iloc[-1]
-            prev_close = hist["Close"].iloc[-2]
+            # --- Core metrics from the rolling indicator state ---
+            # Only bars not yet seen by the engine are processed
+            one_year = self.history.get_history(ticker, "1y")
+            indicators = self.indicators.update(
+                ticker, one_year.index.values, one_year["Close"].to_numpy(),
+                completed_through=last_completed_session(ticker)
+            )
+            current_price = indicators["current_price"]
+            prev_close = indicators["previous_close"]
             day_change = current_price - prev_close
             day_change_percent = round((day_change / prev_close) * 100, 2)
 
-            # --- Moving Averages ---
-            sma_20 = round(hist["Close"].tail(20).mean(), 2)
-            sma_50 = round(hist["Close"].tail(50).mean(), 2)
-
-            # --- Volatility (annualized %)
-            daily_returns = hist["Close"].pct_change().dropna()
-            volatility = round(np.std(daily_returns) * np.sqrt(252) * 100, 2)
+            sma_20 = round(indicators["sma_20"], 2)
+            sma_50 = round(indicators["sma_50"], 2)
+            volatility = round(indicators["volatility_pct"], 2)
 
-            # --- RSI Calculation (14-day)
-            delta = hist["Close"].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=14).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=14).mean()
-            rs = gain / loss
-            rsi = round(100 - (100 / (1 + rs.iloc[-1])), 2)
+            def rounded(value):
+                return round(value, 2) if value is not None else None
 
-            # --- Returns ---
-            def safe_return(period):
-                if len(hist) > period:
-                    return round(((hist["Close"].iloc[-1] - hist["Close"].iloc[-period]) / hist["Close"].iloc[-period]) * 100, 2)
-                return None
+            rsi = rounded(indicators["rsi"])
 
-            one_week_return = safe_return(5)
-            one_month_return = safe_return(22)
-            three_month_return = safe_return(66)
+            one_week_return = rounded(indicators["one_week_return_pct"])
+            one_month_return = rounded(indicators["one_month_return_pct"])
+            three_month_return = rounded(indicators["three_month_return_pct"])
 
-            # --- 52-week High/Low ---
-            one_year = stock.history(period="1y")
-            high_52w = one_year["Close"].max()
-            low_52w = one_year["Close"].min()
+            high_52w = indicators["high_52w"]
+            low_52w = indicators["low_52w"]
 
             # --- Trend Summary ---
-            if rsi > 70:
+            if rsi is not None and rsi > 70:
                 trend_signal = "Overbought - Possible Bearish Reversal"
-            elif rsi < 30:
+            elif rsi is not None and rsi < 30:
                 trend_signal = "Oversold - Possible Bullish Reversal"
             elif current_price > sma_20 > sma_50:
                 trend_signal = "Strong Bullish Momentum"
@@ -396,28 +563,25 @@ class InvestmentNavigator:
                     result[key] = [float(v) if isinstance(v, (np.generic, np.float32, np.float64, np.int32, np.int64)) else v for v in value]
 
             # --- 7-Day Forecast using ARIMA ---
-            
-            try:
-                close_series = hist["Close"].dropna()
-                if len(close_series) > 30:  # need at least 1 month of data
-                    model = ARIMA(close_series, order=(2, 1, 2))
-                    fitted = model.fit()
-                    forecast = fitted.forecast(steps=7)
-                    forecast_list = [round(float(x), 2) for x in forecast]
-
+            # Served from the forecast cache; refits run in the background
+            close_series = hist["Close"].dropna()
+            if len(close_series) > MIN_FORECAST_BARS:
+                forecast = self.forecasts.get_forecast(
+                    ticker, close_series.to_numpy(), close_series.index[-1].date()
+                )
+                if forecast.get("forecast"):
+                    forecast_list = forecast["forecast"]
                     predicted_change = ((forecast_list[-1] - current_price) / current_price) * 100
-                    predicted_trend = (
-                        "Bullish" if predicted_change > 1
-                        else "Bearish" if predicted_change < -1
-                        else "Stable"
-                    )
 
                     result["forecast_next_7d"] = forecast_list
                     result["predicted_change_%"] = round(predicted_change, 2)
-                    result["predicted_trend"] = predicted_trend
+                    result["predicted_trend"] = _predicted_trend(predicted_change)
                     result["forecast_confidence"] = "Moderate"
-            except Exception as fe:
-                result["forecast_error"] = str(fe)
+                    result["forecast_as_of"] = forecast["as_of"]
+                    result["forecast_age_seconds"] = forecast["age_seconds"]
+                result["forecast_status"] = forecast["status"]
+                if "error" in forecast:
+                    result["forecast_error"] = forecast["error"]
 
             if "predicted_trend" in result:
                 result["insight_summary"] += f" Based on ARIMA forecasting, the stock is expected to show a {result['predicted_trend'].lower()} trend over the next 7 days."
@@ -432,63 +596,198 @@ class InvestmentNavigator:
                     for x in v
                     ]
 
-            try:
-                PLOTS_DIR.mkdir(parents=True, exist_ok=True)
-
-                plt.style.use("dark_background")  # 🌙 enable dark theme
-                fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(11, 8), sharex=True, gridspec_kw={'height_ratios': [3, 1]})
-                fig.suptitle(f"{ticker} — Price Trend, Forecast & RSI", fontsize=15, fontweight='bold', color='white')
-
-                # --- Price chart (Top)
-                ax1.plot(hist.index, hist["Close"], color='cyan', linewidth=2, label="Historical Price")
-                ax1.plot(hist.index[-20:], hist["Close"].tail(20), color='orange', linestyle='--', label="Recent 20-Day Trend")
-
-                if "forecast_next_7d" in result:
-                    forecast_range = range(len(hist), len(hist) + 7)
-                    ax1.plot(forecast_range, result["forecast_next_7d"], '--', color='lime', label="Forecast (7D)")
-
-                ax1.axhline(result["sma_20"], color='deepskyblue', linestyle='--', linewidth=1, label="SMA-20")
-                ax1.axhline(result["sma_50"], color='violet', linestyle='--', linewidth=1, label="SMA-50")
-
-                ax1.set_ylabel("Price (₹)", color="white", fontsize=10)
-                ax1.legend(loc="upper left", fontsize=9, facecolor="black", edgecolor="gray")
-                ax1.grid(True, linestyle='--', alpha=0.3)
-
-                # --- RSI chart (Bottom)
-                ax2.plot(hist.index, 100 - (100 / (1 + (gain / loss))), label="RSI (14D)", color="magenta", linewidth=1.5)
-                ax2.axhline(70, color='green', linestyle='--', linewidth=1, label="Overbought (70)")
-                ax2.axhline(30, color='red', linestyle='--', linewidth=1, label="Oversold (30)")
-
-                ax2.set_ylabel("RSI", color="white", fontsize=10)
-                ax2.set_xlabel("Date", color="white", fontsize=10)
-                ax2.legend(loc="upper left", fontsize=9, facecolor="black", edgecolor="gray")
-                ax2.grid(True, linestyle='--', alpha=0.3)
-
-                plt.xticks(rotation=45, color="white")
-                plt.yticks(color="white")
-                plt.tight_layout()
-
-                plot_path = str(PLOTS_DIR / f"{ticker}_forecast_rsi_dark.png")
-                # --- Add AI-generated caption at bottom ---
-                ai_caption = (
-                    f"AI Forecast: {result.get('predicted_trend', 'N/A')} trend expected over next 7 days "
-                    f"({result.get('predicted_change_%', 0)}% change). "
-                    f"Volatility: {result.get('volatility_%', 0)}% | RSI: {result.get('rsi', 0)}"
-                )
-                fig.text(0.5, 0.02, ai_caption, ha='center', fontsize=9, color='lightgray', style='italic')
+            return result  # 👈 stays at the very end
 
-                plt.savefig(plot_path, bbox_inches='tight', facecolor='black')
-                plt.close()
+        except Exception as e:
+            return {"error": str(e), "ticker": ticker}
 
-                result["forecast_chart_path"] = plot_path
-            except Exception as ce:
-                result["chart_error"] = str(ce)
+    async def get_stock_analytics_async(self, ticker: str):
+        """
+        Async wrapper for `get_stock_analytics`.
 
+        History fetches, indicators and ARIMA are blocking, so they run in a
+        worker thread instead of on the event loop.
+        """
+        return await asyncio.to_thread(self.get_stock_analytics, ticker)
 
-            return result  # 👈 stays at the very end
+    def get_stock_chart(self, ticker: str) -> Dict[str, Any]:
+        """
+        Price/forecast and RSI chart of a stock.
 
-        except Exception as e:
-            return {"error": str(e), "ticker": ticker}
+        The PNG is only re-rendered when the underlying bars or forecast
+        changed; otherwise the cached file is returned.
+
+        Args:
+            ticker (str): Yahoo ticker, e.g. "TCS.NS"
+
+        Returns:
+            dict: Contains:
+                - ticker and chart_status ("cached", "rendered" or "pending")
+                - chart_path, unless the render is still pending
+                - retry_after_seconds, while the render is pending
+                - forecast_confidence, when a forecast is available
+                - error, if analytics or the render failed
+        """
+        analytics = self.get_stock_analytics(ticker)
+        if "error" in analytics:
+            return analytics
+
+        hist = self.history.get_history(ticker, "6mo")
+        one_year = self.history.get_history(ticker, "1y")
+        chart = self.charts.get_chart(
+            ticker,
+            hist.index[-1].date().isoformat(),
+            dates=hist.index.values,
+            closes=hist["Close"].to_numpy(),
+            rsi=rsi_series(one_year["Close"].to_numpy())[-len(hist):],
+            forecast=analytics.get("forecast_next_7d"),
+            sma_20=analytics["sma_20"],
+            sma_50=analytics["sma_50"],
+            caption=(
+                f"AI Forecast: {analytics.get('predicted_trend', 'N/A')} trend expected over next 7 days "
+                f"({analytics.get('predicted_change_%', 0)}% change). "
+                f"Volatility: {analytics.get('volatility_%', 0)}% | RSI: {analytics.get('rsi', 0)}"
+            )
+        )
+        if chart["status"] == "error":
+            return {"error": chart["error"], "ticker": ticker}
+        if chart["status"] == "pending":
+            # The render keeps going in the background; the same request later gets the file
+            return {
+                "ticker": ticker,
+                "chart_status": "pending",
+                "retry_after_seconds": CHART_RETRY_AFTER,
+                "forecast_confidence": analytics.get("forecast_confidence")
+            }
+        return {
+            "ticker": ticker,
+            "chart_path": chart["chart_path"],
+            "chart_status": chart["status"],
+            "forecast_confidence": analytics.get("forecast_confidence")
+        }
+
+    def get_forecasts(
+        self,
+        queries: List[str],
+        max_workers: Optional[int] = None,
+        timeout: float = FIT_TIMEOUT
+    ) -> Dict[str, Any]:
+        """
+        7-day ARIMA forecasts for a watchlist or universe scan.
+
+        Histories are read from the local store concurrently; symbols whose
+        cached forecast is current are answered from the cache, and the
+        remaining fits are spread across a process pool.
+
+        Args:
+            queries (List[str]): Stock names or tickers
+            max_workers (int): Fits kept in flight at once (default: all pool processes)
+            timeout (float): Seconds allowed per fit
+
+        Returns:
+            dict: Contains:
+                - forecasts: Per-symbol forecast, predicted change and trend
+                - failures: {query, ticker, error} for symbols without a forecast
+                - last_updated: Timestamp of the batch
+        """
+        queries = list(dict.fromkeys(query.strip() for query in queries if query and query.strip()))
+        if not queries:
+            raise ValueError("At least one ticker is required.")
+        if len(queries) > MAX_BATCH_FORECASTS:
+            raise ValueError(f"At most {MAX_BATCH_FORECASTS} tickers can be forecast at once.")
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("workers must be at least 1.")
+        if timeout <= 0:
+            raise ValueError("timeout must be positive.")
+
+        def load(query: str):
+            ticker = self.resolve_ticker(query)
+            closes = self.history.get_history(ticker, "6mo")["Close"].dropna()
+            return ticker, closes
+
+        with ThreadPoolExecutor(max_workers=min(8, len(queries))) as pool:
+            loaded = list(pool.map(load, queries))
+
+        failures, series = [], {}
+        for query, (ticker, closes) in zip(queries, loaded):
+            if len(closes) <= MIN_FORECAST_BARS:
+                failures.append({"query": query, "ticker": ticker, "error": "Not enough history for a forecast"})
+            else:
+                series[ticker.strip().upper()] = (closes.to_numpy(), closes.index[-1].date())
+
+        fitted = self.forecasts.forecast_many(series, max_workers=max_workers, timeout=timeout) if series else {}
+
+        forecasts = []
+        for query, (ticker, closes) in zip(queries, loaded):
+            result = fitted.get(ticker.strip().upper())
+            if result is None:
+                continue
+            if result["status"] != "ready":
+                failures.append({"query": query, "ticker": ticker, "error": result.get("error", "Forecast failed")})
+                continue
+            current_price = float(closes.iloc[-1])
+            predicted_change = (result["forecast"][-1] - current_price) / current_price * 100
+            forecasts.append({
+                "query": query,
+                "ticker": ticker,
+                "current_price": round(current_price, 2),
+                "forecast_next_7d": result["forecast"],
+                "predicted_change_%": round(predicted_change, 2),
+                "predicted_trend": _predicted_trend(predicted_change),
+                "forecast_as_of": result["as_of"],
+                "forecast_age_seconds": result["age_seconds"]
+            })
+        return {
+            "forecasts": forecasts,
+            "failures": failures,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    async def get_forecasts_async(self, queries: List[str], **kwargs) -> Dict[str, Any]:
+        # Reads and process-pool waits are blocking; keep them off the event loop
+        return await asyncio.to_thread(self.get_forecasts, queries, **kwargs)
+
+    def resolve_scheme(self, scheme: str) -> str:
+        """
+        Resolve a mutual fund scheme name (or code) to its mfapi scheme code.
+
+        The local scheme index is searched first; mfapi's search endpoint is
+        only used when the index has no match (e.g. before its first load).
+        """
+        scheme = scheme.strip()
+        if not scheme:
+            raise ValueError("A scheme name or code is required.")
+        if scheme.isdigit():
+            return scheme
+        matches = self.schemes.search(scheme, limit=1)
+        if matches:
+            return matches[0]["scheme_code"]
+
+        search_response = requests.get(MF_SEARCH_URL.format(query=scheme), timeout=10).json()
+        if not search_response:
+            raise ValueError(f"No mutual fund found for '{scheme}'")
+        return str(search_response[0]["schemeCode"])
+
+    def search_mutual_funds(self, query: str, limit: int = 10) -> Dict[str, Any]:
+        """
+        Search the local scheme index by name.
+
+        Args:
+            query (str): Scheme name, e.g. "parag parikh flexi cap"
+            limit (int): Maximum number of results
+
+        Returns:
+            dict: query and matches ({scheme_code, scheme_name, score})
+        """
+        if not query.strip():
+            raise ValueError("A search query is required.")
+        return {"query": query, "matches": self.schemes.search(query, limit=limit)}
+
+    def _nav_history(self, scheme: str):
+        code = self.resolve_scheme(scheme)
+        meta, dates, navs = self.navs.get_history(code)
+        name = meta.get("scheme_name") or self.schemes.name_of(code) or code
+        return code, name, meta, dates, navs
 
     def get_mutual_fund_nav(self, scheme_name: str) -> Dict[str, Any]:
         """
@@ -496,32 +795,265 @@ class InvestmentNavigator:
         Example: Parag Parikh Flexi Cap Fund
         """
         try:
-            search_url = f"https://api.mfapi.in/mf/search?q={scheme_name}"
-            search_response = requests.get(search_url).json()
-            if not search_response:
-                return {"error": f"No mutual fund found for '{scheme_name}'"}
-
-            scheme_code = search_response[0]["schemeCode"]
-            nav_url = f"https://api.mfapi.in/mf/{scheme_code}"
-            nav_response = requests.get(nav_url).json()
-
-            latest_nav = nav_response["data"][0]
+            code, name, _, dates, navs = self._nav_history(scheme_name)
             return {
-                "scheme_name": nav_response["meta"]["scheme_name"],
-                "latest_nav": latest_nav["nav"],
-                "date": latest_nav["date"],
+                "scheme_code": code,
+                "scheme_name": name,
+                "latest_nav": float(navs[-1]),
+                "date": dates[-1].item().strftime("%d-%m-%Y"),
                 "note": "Live NAV from mfapi.in"
             }
         except Exception as e:
             return {"error": str(e)}
 
+    async def get_mutual_fund_nav_async(self, scheme_name: str) -> Dict[str, Any]:
+        # Index search and NAV cache are blocking (disk, occasional refresh)
+        return await asyncio.to_thread(self.get_mutual_fund_nav, scheme_name)
+
+    def get_mutual_fund_history(self, scheme: str, period: str = "1y") -> Dict[str, Any]:
+        """
+        NAV history of a mutual fund scheme over a trailing period.
+
+        Args:
+            scheme (str): Scheme name or mfapi scheme code
+            period (str): One of "1m", "3m", "6m", "1y", "3y", "5y", "max"
+
+        Returns:
+            dict: scheme_code, scheme_name, fund_house, period and parallel
+                `dates` (ISO) / `navs` lists, oldest first
+        """
+        code, name, meta, dates, navs = self._nav_history(scheme)
+        start = period_start(dates[-1].item(), period)
+        first = int(np.searchsorted(dates, np.datetime64(start, "D"))) if start else 0
+        return {
+            "scheme_code": code,
+            "scheme_name": name,
+            "fund_house": meta.get("fund_house"),
+            "period": period,
+            "dates": np.datetime_as_string(dates[first:]).tolist(),
+            "navs": navs[first:].tolist()
+        }
+
+    def get_mutual_fund_returns(self, scheme: str) -> Dict[str, Any]:
+        """
+        Trailing returns (1M to 5Y) and CAGR of a mutual fund scheme.
+
+        Args:
+            scheme (str): Scheme name or mfapi scheme code
+
+        Returns:
+            dict: scheme_code, scheme_name, latest_nav, as_of, returns
+                ({period: {return_pct, cagr_pct}}) and since_inception_cagr_pct
+        """
+        code, name, meta, dates, navs = self._nav_history(scheme)
+        return {
+            "scheme_code": code,
+            "scheme_name": name,
+            "category": meta.get("scheme_category"),
+            "latest_nav": float(navs[-1]),
+            "as_of": str(dates[-1]),
+            "history_start": str(dates[0]),
+            **nav_returns(dates, navs)
+        }
+
+    def add_portfolio_transaction(
+        self,
+        user_id: str,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        trade_date,
+        asset_type: str = "stock"
+    ) -> Dict[str, Any]:
+        """
+        Record a buy or sell in a user's portfolio.
+
+        Stock names are resolved to tickers and fund names to mfapi scheme
+        codes before storing, so valuation never needs to resolve them.
+
+        Args:
+            user_id (str): Portfolio owner
+            symbol (str): Stock name/ticker, or fund name/scheme code
+            side (str): "buy" or "sell"
+            quantity (float): Shares or units
+            price (float): Price per share or unit
+            trade_date (date): Trade date
+            asset_type (str): "stock" or "mutual_fund"
+
+        Returns:
+            dict: The stored transaction
+        """
+        if asset_type == "mutual_fund":
+            symbol = self.resolve_scheme(symbol)
+        elif asset_type == "stock":
+            symbol = self.resolve_ticker(symbol)
+        return self.portfolio.add_transaction(user_id, symbol, side, quantity, price, trade_date, asset_type)
+
+    def get_portfolio_transactions(self, user_id: str) -> Dict[str, Any]:
+        """A user's portfolio transactions, oldest first."""
+        return {"user_id": user_id, "transactions": self.portfolio.transactions(user_id)}
+
+    def delete_portfolio_transaction(self, user_id: str, transaction_id: int) -> Dict[str, Any]:
+        """Delete one of a user's portfolio transactions."""
+        if not self.portfolio.delete_transaction(user_id, transaction_id):
+            return {"error": f"Transaction {transaction_id} not found"}
+        return {"user_id": user_id, "deleted": transaction_id}
+
+    def _price_matrix(self, symbols: List[str], asset_types: List[str], since):
+        """Aligned (holdings × dates) closes: stocks from one batched download, funds from the NAV cache."""
+        days = (datetime.now().date() - since).days
+        period = next(name for name, limit in PORTFOLIO_PERIODS if limit is None or days <= limit)
+        stocks = [symbol for symbol, asset_type in zip(symbols, asset_types) if asset_type == "stock"]
+        frames = self.market_data.get_histories(stocks, period) if stocks else {}
+
+        series = []
+        for symbol, asset_type in zip(symbols, asset_types):
+            if asset_type == "stock":
+                bars = frame_to_bars(frames.get(symbol))
+                series.append((bars["date"].astype("datetime64[D]"), bars["close"]))
+                continue
+            try:
+                _, nav_dates, navs = self.navs.get_history(symbol)
+            except ValueError as e:
+                print(f"[portfolio] ⚠️ No NAV history for {symbol}: {e}")
+                nav_dates, navs = np.zeros(0, dtype="datetime64[D]"), np.zeros(0)
+            series.append((nav_dates, navs))
+
+        # Only prices from the first trade on are needed
+        start = np.datetime64(since, "D")
+        dates = np.unique(np.concatenate([np.zeros(0, dtype="datetime64[D]")] + [d[d >= start] for d, _ in series]))
+        closes = np.full((len(symbols), len(dates)), np.nan)
+        for row, (series_dates, values) in enumerate(series):
+            keep = series_dates >= start
+            closes[row, np.searchsorted(dates, series_dates[keep])] = values[keep]
+        return dates, closes
+
     def portfolio_summary(self, user_id: str) -> Dict[str, Any]:
         """
-        Dummy summary for now. Later link with MongoDB.
+        Value a user's portfolio.
+
+        Prices come from caches: stocks from one batched history download
+        (shared with the rest of the navigator), funds from the NAV cache.
+
+        Args:
+            user_id (str): Portfolio owner
+
+        Returns:
+            dict: Contains:
+                - total_value, total_invested, unrealized_pnl(_pct), realized_pnl
+                - xirr_pct, twr_pct, max_drawdown_pct, current_drawdown_pct
+                - allocation_pct: Weight of each asset type
+                - holdings: One row per holding, largest first
+                - missing_prices: Open holdings without a price
         """
+        transactions = self.portfolio.transactions(user_id)
+        if not transactions:
+            return {
+                "user_id": user_id,
+                "total_value": 0,
+                "holdings": [],
+                "note": "No transactions recorded yet"
+            }
+
+        keys = list(dict.fromkeys((row["symbol"], row["asset_type"]) for row in transactions))
+        position = {key: index for index, key in enumerate(keys)}
+        symbols = [symbol for symbol, _ in keys]
+        asset_types = [asset_type for _, asset_type in keys]
+
+        holding = np.array([position[(row["symbol"], row["asset_type"])] for row in transactions])
+        trade_dates = np.array([row["trade_date"] for row in transactions], dtype="datetime64[D]")
+        quantity = np.array([row["quantity"] if row["side"] == "buy" else -row["quantity"] for row in transactions])
+        price = np.array([row["price"] for row in transactions], dtype=float)
+
+        dates, closes = self._price_matrix(symbols, asset_types, trade_dates.min().item())
+        summary = value_portfolio(symbols, asset_types, holding, trade_dates, quantity, price, dates, closes)
         return {
             "user_id": user_id,
-            "total_value": 0,
-            "assets": {},
-            "note": "To be implemented: pull user's holdings and compute live value"
+            **summary,
+            "last_updated": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
+
+    async def portfolio_summary_async(self, user_id: str) -> Dict[str, Any]:
+        # SQLite reads and cached price lookups are blocking
+        return await asyncio.to_thread(self.portfolio_summary, user_id)
+
+    def project_sip(
+        self,
+        monthly_amount: float,
+        years: int,
+        ticker: Optional[str] = None,
+        scheme: Optional[str] = None,
+        annual_return_pct: Optional[float] = None,
+        annual_volatility_pct: Optional[float] = None,
+        goal: Optional[float] = None,
+        initial_amount: float = 0.0,
+        step_up_pct: float = 0.0,
+        paths: int = PROJECTION_PATHS,
+        seed: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Monte Carlo projection of a SIP, e.g. ₹10k/month for 15 years.
+
+        Return and volatility are estimated from the trailing price history
+        of a stock (`ticker`) or the NAV history of a fund (`scheme`), or
+        given explicitly; explicit values override the estimates.
+
+        Args:
+            monthly_amount (float): SIP amount per month
+            years (int): Investment horizon in years
+            ticker (str): Stock name or ticker to take return/volatility from
+            scheme (str): Fund name or mfapi scheme code to take them from
+            annual_return_pct (float): Expected annual return in percent
+            annual_volatility_pct (float): Annual volatility in percent
+            goal (float): Target corpus
+            initial_amount (float): Lump sum invested at the start
+            step_up_pct (float): Yearly SIP increase in percent
+            paths (int): Simulated paths
+            seed (int): Seed for reproducible results
+
+        Returns:
+            dict: The assumptions used (with their source) and the
+                projection: final corpus percentiles, yearly bands, median
+                XIRR and, with a goal, the probability of reaching it
+        """
+        if ticker and scheme:
+            raise ValueError("Pass either a ticker or a scheme, not both.")
+        basis: Dict[str, Any] = {"source": "manual"}
+        if ticker or scheme:
+            if ticker:
+                symbol = self.resolve_ticker(ticker)
+                bars = frame_to_bars(self.history.get_history(symbol, "max"))
+                dates, closes = bars["date"].astype("datetime64[D]"), bars["close"]
+                basis = {"source": "stock", "ticker": symbol}
+            else:
+                code, name, _, dates, closes = self._nav_history(scheme)
+                basis = {"source": "mutual_fund", "scheme_code": code, "scheme_name": name}
+            estimate = estimate_parameters(dates, closes)
+            basis.update(history_start=estimate["history_start"], history_end=estimate["history_end"])
+            if annual_return_pct is None:
+                annual_return_pct = estimate["annual_return"] * 100
+            if annual_volatility_pct is None:
+                annual_volatility_pct = estimate["annual_volatility"] * 100
+        if annual_return_pct is None or annual_volatility_pct is None:
+            raise ValueError("Pass a ticker or scheme, or both annual_return_pct and annual_volatility_pct.")
+
+        projection = simulate_sip(
+            monthly_amount, years, annual_return_pct / 100, annual_volatility_pct / 100,
+            initial_amount=initial_amount, step_up_pct=step_up_pct, goal=goal, paths=paths, seed=seed
+        )
+        return {
+            "monthly_amount": monthly_amount,
+            "initial_amount": initial_amount,
+            "step_up_pct": step_up_pct,
+            "years": years,
+            "paths": paths,
+            "annual_return_pct": round(annual_return_pct, 2),
+            "annual_volatility_pct": round(annual_volatility_pct, 2),
+            "basis": basis,
+            **projection
+        }
+
+    async def project_sip_async(self, monthly_amount: float, years: int, **kwargs) -> Dict[str, Any]:
+        # History reads and the simulation are blocking
+        return await asyncio.to_thread(self.project_sip, monthly_amount, years, **kwargs)
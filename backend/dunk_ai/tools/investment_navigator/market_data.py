@@ -0,0 +1,284 @@
+# tools/investment_navigator/market_data.py
+"""
+Market-data cache for the Investment Navigator.
+
+- Price history is cached per symbol with market-hours aware TTLs: short
+  while the symbol's exchange is open, until the next open once it closes.
+- Concurrent callers for the same symbol share one upstream fetch.
+- Shorter windows ("6mo", "5d", ...) are sliced from a cached "1y" frame
+  instead of being fetched separately.
+- Watchlists are fetched with one batched download for every cache miss.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from datetime import date, datetime, time as dt_time, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+# Exchange sessions by ticker suffix: (timezone, open, close)
+MARKET_HOURS = {
+    ".NS": ("Asia/Kolkata", dt_time(9, 15), dt_time(15, 30)),
+    ".BO": ("Asia/Kolkata", dt_time(9, 15), dt_time(15, 30)),
+    "": ("America/New_York", dt_time(9, 30), dt_time(16, 0)),
+}
+
+OPEN_MARKET_TTL = 60.0            # seconds, while the exchange is trading
+CLOSED_MARKET_MAX_TTL = 6 * 3600.0  # re-check closed markets at least this often
+MIN_TTL = 60.0
+
+BASE_PERIOD = "1y"
+# Windows that can be sliced from the base frame: trading days, or months
+DERIVED_PERIODS = {
+    "5d": {"days": 5},
+    "1mo": {"months": 1},
+    "3mo": {"months": 3},
+    "6mo": {"months": 6},
+}
+
+
+def _market_for(symbol: str) -> Tuple[ZoneInfo, dt_time, dt_time]:
+    """Return (timezone, open, close) for the exchange a symbol trades on."""
+    for suffix, (zone, open_time, close_time) in MARKET_HOURS.items():
+        if suffix and symbol.upper().endswith(suffix):
+            return ZoneInfo(zone), open_time, close_time
+    zone, open_time, close_time = MARKET_HOURS[""]
+    return ZoneInfo(zone), open_time, close_time
+
+
+def is_market_open(symbol: str, now: Optional[datetime] = None) -> bool:
+    """
+    Check whether the symbol's exchange is in its regular session.
+
+    Weekends are closed; exchange holidays are not modelled.
+    """
+    zone, open_time, close_time = _market_for(symbol)
+    local = (now or datetime.now(zone)).astimezone(zone)
+    return local.weekday() < 5 and open_time <= local.time() < close_time
+
+
+def market_ttl(symbol: str, now: Optional[datetime] = None) -> float:
+    """
+    Seconds a freshly fetched history for `symbol` stays valid.
+
+    Short while the market is open; otherwise until the next session opens,
+    capped at CLOSED_MARKET_MAX_TTL.
+    """
+    zone, open_time, _ = _market_for(symbol)
+    local = (now or datetime.now(zone)).astimezone(zone)
+    if is_market_open(symbol, local):
+        return OPEN_MARKET_TTL
+
+    next_open = datetime.combine(local.date(), open_time, tzinfo=zone)
+    if next_open <= local:
+        next_open += timedelta(days=1)
+    while next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+    seconds = (next_open - local).total_seconds()
+    return max(MIN_TTL, min(seconds, CLOSED_MARKET_MAX_TTL))
+
+
+def last_completed_session(symbol: str, now: Optional[datetime] = None) -> date:
+    """
+    Date of the most recent session of the symbol's exchange that has closed.
+
+    Weekends are skipped; exchange holidays are not modelled.
+    """
+    zone, _, close_time = _market_for(symbol)
+    local = (now or datetime.now(zone)).astimezone(zone)
+    session = local.date()
+    if local.weekday() >= 5 or local.time() < close_time:
+        session -= timedelta(days=1)
+    while session.weekday() >= 5:
+        session -= timedelta(days=1)
+    return session
+
+
+def _yfinance_history(symbol: str, period: str):
+    """Default upstream fetcher."""
+    import yfinance as yf
+
+    return yf.Ticker(symbol).history(period=period)
+
+
+def _yfinance_download(symbols: List[str], period: str) -> Dict[str, Any]:
+    """Default batch fetcher: one yf.download call split into per-symbol frames."""
+    import pandas as pd
+    import yfinance as yf
+
+    data = yf.download(
+        symbols, period=period, group_by="ticker", auto_adjust=False, threads=True, progress=False
+    )
+    frames = {}
+    for symbol in symbols:
+        if isinstance(data.columns, pd.MultiIndex):
+            if symbol not in data.columns.get_level_values(0):
+                continue
+            frame = data[symbol]
+        else:
+            frame = data
+        frames[symbol] = frame.dropna(how="all")
+    return frames
+
+
+class MarketDataCache:
+    """
+    Thread-safe TTL cache of price history with in-flight request coalescing.
+
+    Returned frames are shared between callers and must be treated as
+    read-only.
+    """
+
+    def __init__(
+        self,
+        fetcher: Callable[[str, str], Any] = _yfinance_history,
+        batch_fetcher: Callable[[List[str], str], Dict[str, Any]] = _yfinance_download,
+        ttl: Callable[[str], float] = market_ttl,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._fetcher = fetcher
+        self._batch_fetcher = batch_fetcher
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, str], Tuple[Any, float]] = {}
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self.stats = {"hits": 0, "misses": 0, "coalesced": 0}
+
+    def get_history(self, symbol: str, period: str = BASE_PERIOD):
+        """
+        Return price history for `symbol` over `period`.
+
+        Periods in DERIVED_PERIODS are served from the cached base frame;
+        "6mo" always fetches the base frame so analytics share one request.
+        Other periods are cached under their own key.
+        """
+        symbol = symbol.strip().upper()
+        if period in DERIVED_PERIODS:
+            base = self._peek(symbol, BASE_PERIOD)
+            if base is None and period == "5d":
+                # A quote alone should not pull a full year of history
+                return self._get(symbol, period)
+            if base is None:
+                base = self._get(symbol, BASE_PERIOD)
+            return self._slice(base, period)
+        return self._get(symbol, period)
+
+    def get_histories(self, symbols: Sequence[str], period: str = "5d") -> Dict[str, Any]:
+        """
+        Return price history for many symbols, keyed by normalized symbol.
+
+        Fresh cache entries (including slices of a cached base frame) are
+        reused; every miss is fetched in one batched download and cached.
+        Symbols the batch could not fetch map to None.
+        """
+        frames: Dict[str, Any] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbol.strip().upper() for symbol in symbols):
+            frame = self._cached(symbol, period)
+            if frame is None:
+                missing.append(symbol)
+            else:
+                frames[symbol] = frame
+
+        if missing:
+            with self._lock:
+                self.stats["misses"] += len(missing)
+            try:
+                fetched = self._batch_fetcher(missing, period)
+            except Exception:
+                fetched = {}
+            expires_at = {symbol: self._clock() + self._ttl(symbol) for symbol in missing}
+            with self._lock:
+                for symbol in missing:
+                    frame = fetched.get(symbol)
+                    if frame is not None and not getattr(frame, "empty", False):
+                        self._entries[(symbol, period)] = (frame, expires_at[symbol])
+                        frames[symbol] = frame
+                    else:
+                        frames[symbol] = None
+        return frames
+
+    def _cached(self, symbol: str, period: str):
+        """Fresh cached frame for `period`, sliced from the base frame if possible."""
+        if period in DERIVED_PERIODS:
+            base = self._peek(symbol, BASE_PERIOD)
+            if base is not None:
+                return self._slice(base, period)
+        return self._peek(symbol, period)
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop cached entries for one symbol, or everything."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                symbol = symbol.strip().upper()
+                for key in [key for key in self._entries if key[0] == symbol]:
+                    del self._entries[key]
+
+    def _peek(self, symbol: str, period: str):
+        """Return a fresh cached frame without fetching, or None."""
+        with self._lock:
+            entry = self._entries.get((symbol, period))
+            if entry is not None and entry[1] > self._clock():
+                self.stats["hits"] += 1
+                return entry[0]
+        return None
+
+    def _get(self, symbol: str, period: str):
+        key = (symbol, period)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > self._clock():
+                self.stats["hits"] += 1
+                return entry[0]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+                self.stats["misses"] += 1
+            else:
+                self.stats["coalesced"] += 1
+
+        if not owner:
+            return future.result()
+
+        try:
+            frame = self._fetcher(symbol, period)
+        except BaseException as exc:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(exc)
+            raise
+
+        with self._lock:
+            # Empty frames (unknown symbol, upstream hiccup) are not cached
+            if frame is not None and not getattr(frame, "empty", False):
+                self._entries[key] = (frame, self._clock() + self._ttl(symbol))
+            del self._in_flight[key]
+        future.set_result(frame)
+        return frame
+
+    @staticmethod
+    def _slice(frame, period: str):
+        """Cut the trailing `period` window out of a longer history frame."""
+        import pandas as pd
+
+        if frame is None or frame.empty:
+            return frame
+        window = DERIVED_PERIODS[period]
+        if "days" in window:
+            # Day periods count trading sessions, i.e. rows
+            return frame.tail(window["days"])
+
+        index = frame.index
+        now = pd.Timestamp.now(tz=index.tz) if getattr(index, "tz", None) is not None else pd.Timestamp.now()
+        cutoff = (now - pd.DateOffset(**window)).normalize()
+        return frame.loc[index >= cutoff]
+
+
+# Shared by every navigator in the process so routes and services reuse fetches
+market_data_cache = MarketDataCache()
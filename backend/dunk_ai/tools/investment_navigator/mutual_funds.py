@@ -0,0 +1,471 @@
+# tools/investment_navigator/mutual_funds.py
+"""
+Mutual fund scheme index and NAV history cache for the Investment Navigator.
+
+- The full mfapi.in scheme list is kept locally and refreshed once a day
+  (in the background once an index exists); names are searched with
+  IDF-weighted word matching that tolerates prefixes and misspellings
+- NAV history is cached per scheme as parallel date/NAV arrays on disk;
+  refreshes only download the rows after the last cached date
+- Trailing returns, CAGR and SIP XIRR are computed from the cached arrays
+"""
+
+import bisect
+import json
+import math
+import os
+import re
+import threading
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+from dunk_ai.tools.investment_navigator.returns import DAYS_PER_YEAR, cagr, xirr_many
+
+DATA_DIR = Path(__file__).resolve().parents[4] / "assets" / "data"
+SCHEME_INDEX_PATH = DATA_DIR / "mf_schemes.json"
+NAV_DIR = DATA_DIR / "nav"
+
+MF_SCHEMES_URL = "https://api.mfapi.in/mf"
+MF_NAV_URL = "https://api.mfapi.in/mf/{code}"
+MF_TIMEOUT = 10           # seconds per mfapi request
+
+INDEX_REFRESH = 24 * 3600  # seconds between scheme-list refreshes
+NAV_TTL = 3 * 3600         # seconds between NAV refreshes of one scheme
+MIN_SEARCH_SCORE = 0.6     # share of the query's weight a match must cover
+FUZZY_THRESHOLD = 0.6      # trigram Dice similarity for a misspelled word
+
+# Trailing windows for returns; CAGR is reported for windows of a year or more
+RETURN_PERIODS = {"1M": (0, 1), "3M": (0, 3), "6M": (0, 6), "1Y": (1, 0), "3Y": (3, 0), "5Y": (5, 0)}
+HISTORY_PERIODS = {"1m": (0, 1), "3m": (0, 3), "6m": (0, 6), "1y": (1, 0), "3y": (3, 0), "5y": (5, 0), "max": None}
+
+
+def _words(text: str) -> List[str]:
+    return re.findall(r"[a-z0-9]+", text.lower().replace("&", " and "))
+
+
+def _trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def _mfapi_schemes() -> List[Dict[str, Any]]:
+    """Default scheme-list fetcher: [{"schemeCode", "schemeName"}, ...]."""
+    import requests
+
+    response = requests.get(MF_SCHEMES_URL, timeout=MF_TIMEOUT * 3)
+    response.raise_for_status()
+    return response.json()
+
+
+def _mfapi_navs(code: str, start: Optional[date]) -> Dict[str, Any]:
+    """Default NAV fetcher: mfapi.in history from `start` (or all of it)."""
+    import requests
+
+    params = {"startDate": start.isoformat()} if start is not None else None
+    response = requests.get(MF_NAV_URL.format(code=code), params=params, timeout=MF_TIMEOUT)
+    response.raise_for_status()
+    return response.json()
+
+
+class SchemeIndex:
+    """
+    Thread-safe local index of mutual fund schemes with fuzzy name search.
+
+    The list is loaded from `store_path` on first use; a stale list is
+    refreshed in a background thread, so searches never wait on the
+    network once an index exists.
+    """
+
+    def __init__(
+        self,
+        store_path: Optional[Path] = SCHEME_INDEX_PATH,
+        fetcher: Callable[[], List[Dict[str, Any]]] = _mfapi_schemes,
+        refresh_interval: float = INDEX_REFRESH,
+        clock: Callable[[], float] = time.time
+    ):
+        self._store_path = Path(store_path) if store_path else None
+        self._fetcher = fetcher
+        self._refresh_interval = refresh_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._loaded = False
+        self._fetched_at = 0.0
+        self._codes: List[str] = []
+        self._names: List[str] = []
+        self._by_code: Dict[str, int] = {}
+        self._postings: Dict[str, np.ndarray] = {}
+        self._growth = self._direct = self._name_lengths = np.zeros(0, dtype=int)
+        self._vocabulary: List[str] = []
+        self._by_trigram: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        self._ensure_fresh()
+        return len(self._codes)
+
+    def name_of(self, code: str) -> Optional[str]:
+        """Scheme name of a scheme code, if indexed."""
+        self._ensure_fresh()
+        index = self._by_code.get(str(code))
+        return self._names[index] if index is not None else None
+
+    def search(self, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """
+        Find schemes by name.
+
+        Every query word is matched exactly, as a prefix or, failing that,
+        by trigram similarity; matches are weighted by how rare the word is.
+        Ties favour growth and direct-plan variants, then shorter names.
+
+        Args:
+            query (str): Scheme name, e.g. "parag parikh flexi cap"
+            limit (int): Maximum number of results
+
+        Returns:
+            List[dict]: {scheme_code, scheme_name, score}, best match first
+        """
+        self._ensure_fresh()
+        words = _words(query)
+        if not words:
+            return []
+
+        with self._lock:
+            total = len(self._codes)
+            matches = [self._match_word(word) for word in words]
+            weights = [self._idf(word, total) for word in words]
+            usable = [index for index, found in enumerate(matches) if found]
+            if not usable:
+                return []
+            # Candidates come from the postings of the rarest matched word
+            rarest = min(usable, key=lambda index: sum(len(self._postings[w]) for w in matches[index]))
+            candidates = np.unique(np.concatenate([self._postings[w] for w in matches[rarest]]))
+
+            covered = np.zeros(len(candidates))
+            for found, weight in zip(matches, weights):
+                best = np.zeros(len(candidates))
+                for word, similarity in found.items():
+                    hit = np.isin(candidates, self._postings[word], assume_unique=True)
+                    np.maximum(best, hit * similarity, out=best)
+                covered += weight * best
+            scores = np.round(covered / sum(weights), 3)
+
+            keep = scores >= MIN_SEARCH_SCORE
+            candidates, scores = candidates[keep], scores[keep]
+            # Best score first, then growth, direct plan and shorter names
+            order = np.lexsort((
+                self._name_lengths[candidates],
+                -self._direct[candidates],
+                -self._growth[candidates],
+                -scores
+            ))[:limit]
+            return [
+                {"scheme_code": self._codes[scheme], "scheme_name": self._names[scheme], "score": float(scores[rank])}
+                for rank, scheme in zip(order, candidates[order])
+            ]
+
+    def _idf(self, word: str, total: int) -> float:
+        postings = self._postings.get(word)
+        return math.log(1 + total / (len(postings) if postings is not None else 1))
+
+    def _match_word(self, word: str) -> Dict[str, float]:
+        """Vocabulary words matching `word`, with a similarity in (0, 1]."""
+        if word in self._postings:
+            return {word: 1.0}
+        found = {}
+        if len(word) >= 3:
+            start = bisect.bisect_left(self._vocabulary, word)
+            for candidate in self._vocabulary[start:start + 50]:
+                if not candidate.startswith(word):
+                    break
+                found[candidate] = 0.9
+        if found or len(word) < 4:
+            return found
+        grams = _trigrams(word)
+        overlap: Dict[str, int] = {}
+        for trigram in grams:
+            for candidate in self._by_trigram.get(trigram, ()):
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+        for candidate, shared in overlap.items():
+            similarity = 2 * shared / (len(grams) + len(_trigrams(candidate)))
+            if similarity >= FUZZY_THRESHOLD:
+                found[candidate] = similarity * 0.9
+        return found
+
+    def _ensure_fresh(self) -> None:
+        with self._lock:
+            if not self._loaded:
+                self._loaded = True
+                self._load()
+            stale = self._clock() - self._fetched_at >= self._refresh_interval
+            if not stale or self._refreshing:
+                return
+            self._refreshing = True
+            background = bool(self._codes)
+        if background:
+            threading.Thread(target=self._refresh, name="mf-index-refresh", daemon=True).start()
+        else:
+            self._refresh()
+
+    def _refresh(self) -> None:
+        try:
+            schemes = self._fetcher()
+            rows = [(str(item["schemeCode"]), str(item["schemeName"])) for item in schemes if item.get("schemeName")]
+        except Exception as e:
+            print(f"[mutual_funds] ⚠️ Scheme list refresh failed, keeping the current index: {e}")
+            with self._lock:
+                self._refreshing = False
+                # Retry after an interval rather than on every search
+                self._fetched_at = self._clock()
+            return
+        with self._lock:
+            self._build(rows, self._clock())
+            self._refreshing = False
+        self._save(rows)
+
+    def _build(self, rows: List[Tuple[str, str]], fetched_at: float) -> None:
+        self._codes = [code for code, _ in rows]
+        self._names = [name for _, name in rows]
+        self._by_code = {code: index for index, code in enumerate(self._codes)}
+        postings: Dict[str, List[int]] = {}
+        growth, direct = [], []
+        for index, name in enumerate(self._names):
+            words = set(_words(name))
+            growth.append("growth" in words)
+            direct.append("direct" in words)
+            for word in words:
+                postings.setdefault(word, []).append(index)
+        self._postings = {word: np.array(indexes, dtype=np.int32) for word, indexes in postings.items()}
+        self._growth = np.array(growth, dtype=int)
+        self._direct = np.array(direct, dtype=int)
+        self._name_lengths = np.array([len(name) for name in self._names], dtype=int)
+        self._vocabulary = sorted(self._postings)
+        self._by_trigram = {}
+        for word in self._vocabulary:
+            for trigram in _trigrams(word):
+                self._by_trigram.setdefault(trigram, set()).add(word)
+        self._fetched_at = fetched_at
+
+    def _load(self) -> None:
+        if self._store_path is None or not self._store_path.exists():
+            return
+        try:
+            stored = json.loads(self._store_path.read_text(encoding="utf-8"))
+            self._build([tuple(row) for row in stored["schemes"]], stored.get("fetched_at", 0.0))
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"[mutual_funds] ⚠️ Ignoring unreadable scheme index {self._store_path}: {e}")
+
+    def _save(self, rows: List[Tuple[str, str]]) -> None:
+        if self._store_path is None:
+            return
+        try:
+            self._store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._store_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps({"fetched_at": self._fetched_at, "schemes": rows}), encoding="utf-8")
+            os.replace(tmp_path, self._store_path)
+        except OSError as e:
+            print(f"[mutual_funds] ⚠️ Could not persist scheme index: {e}")
+
+
+def _parse_navs(rows: List[Dict[str, Any]]) -> Tuple[np.ndarray, np.ndarray]:
+    """mfapi rows ({"date": "dd-mm-yyyy", "nav": "12.3"}, newest first) -> ascending arrays."""
+    dates, navs = [], []
+    for row in rows:
+        try:
+            nav = float(row["nav"])
+            day = datetime.strptime(row["date"], "%d-%m-%Y").date()
+        except (KeyError, TypeError, ValueError):
+            continue
+        if nav > 0:
+            dates.append(day)
+            navs.append(nav)
+    order = np.argsort(np.array(dates, dtype="datetime64[D]"), kind="stable")
+    return np.array(dates, dtype="datetime64[D]")[order], np.array(navs, dtype=float)[order]
+
+
+class NavCache:
+    """
+    Per-scheme NAV history cache with incremental refresh.
+
+    Histories are stored as parallel `dates` (datetime64[D]) and `navs`
+    arrays, oldest first. Returned arrays must not be modified.
+    """
+
+    def __init__(
+        self,
+        root: Path = NAV_DIR,
+        fetcher: Callable[[str, Optional[date]], Dict[str, Any]] = _mfapi_navs,
+        ttl: float = NAV_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._root = Path(root)
+        self._fetcher = fetcher
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._scheme_locks: Dict[str, threading.Lock] = {}
+        # code -> (meta, dates, navs, next refresh time)
+        self._loaded: Dict[str, Tuple[Dict[str, Any], np.ndarray, np.ndarray, float]] = {}
+        self.stats = {"fetches": 0, "rows_fetched": 0}
+
+    def get_history(self, code: str) -> Tuple[Dict[str, Any], np.ndarray, np.ndarray]:
+        """
+        Return the NAV history of a scheme, refreshing it if due.
+
+        Args:
+            code (str): mfapi scheme code
+
+        Returns:
+            tuple: (meta, dates, navs); meta holds the scheme name and fund
+                details reported by mfapi
+
+        Raises:
+            ValueError: If nothing is cached and the history cannot be fetched
+        """
+        code = str(code).strip()
+        with self._lock:
+            scheme_lock = self._scheme_locks.setdefault(code, threading.Lock())
+
+        with scheme_lock:
+            entry = self._loaded.get(code)
+            if entry is None:
+                meta, dates, navs = self._load(code)
+            else:
+                meta, dates, navs, next_refresh = entry
+                if self._clock() < next_refresh:
+                    return meta, dates, navs
+
+            last = dates[-1].astype(date) if len(dates) else None
+            start = last + timedelta(days=1) if last is not None else None
+            try:
+                response = self._fetcher(code, start)
+                new_dates, new_navs = _parse_navs(response.get("data") or [])
+                meta = response.get("meta") or meta
+            except Exception as e:
+                if not len(dates):
+                    raise ValueError(f"NAV history for scheme {code} is unavailable: {e}") from e
+                print(f"[mutual_funds] ⚠️ NAV refresh failed for {code}, serving cached history: {e}")
+                new_dates = None
+
+            if new_dates is not None:
+                self.stats["fetches"] += 1
+                # The upstream may ignore the start date and send everything
+                newer = new_dates > dates[-1] if len(dates) else np.ones(len(new_dates), dtype=bool)
+                self.stats["rows_fetched"] += int(newer.sum())
+                if newer.any():
+                    dates = np.concatenate([dates, new_dates[newer]])
+                    navs = np.concatenate([navs, new_navs[newer]])
+                    self._save(code, meta, dates, navs)
+                if not len(dates):
+                    raise ValueError(f"No NAV history found for scheme {code}")
+            self._loaded[code] = (meta, dates, navs, self._clock() + self._ttl)
+            return meta, dates, navs
+
+    def path_for(self, code: str) -> Path:
+        return self._root / (re.sub(r"[^0-9A-Za-z]", "_", code) + ".npz")
+
+    def _load(self, code: str) -> Tuple[Dict[str, Any], np.ndarray, np.ndarray]:
+        path = self.path_for(code)
+        if path.exists():
+            try:
+                with np.load(path) as stored:
+                    meta = json.loads(str(stored["meta"]))
+                    return meta, stored["dates"].astype("datetime64[D]"), stored["navs"].astype(float)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"[mutual_funds] ⚠️ Ignoring unreadable NAV file {path}: {e}")
+        return {}, np.zeros(0, dtype="datetime64[D]"), np.zeros(0)
+
+    def _save(self, code: str, meta: Dict[str, Any], dates: np.ndarray, navs: np.ndarray) -> None:
+        path = self.path_for(code)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as handle:
+                np.savez(handle, dates=dates.astype(np.int64), navs=navs, meta=np.array(json.dumps(meta)))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[mutual_funds] ⚠️ Could not persist NAV history for {code}: {e}")
+
+
+def _months_before(day: date, years: int, months: int) -> date:
+    """Same calendar day `years`/`months` earlier, clamped to the month's end."""
+    month_index = day.year * 12 + day.month - 1 - years * 12 - months
+    year, month = divmod(month_index, 12)
+    month += 1
+    next_month = date(year + month // 12, month % 12 + 1, 1)
+    return date(year, month, min(day.day, (next_month - timedelta(days=1)).day))
+
+
+def period_start(last: date, period: str) -> Optional[date]:
+    """First date of a trailing HISTORY_PERIODS window ending at `last` (None for "max")."""
+    if period not in HISTORY_PERIODS:
+        raise ValueError(f"period must be one of: {', '.join(HISTORY_PERIODS)}")
+    window = HISTORY_PERIODS[period]
+    return _months_before(last, *window) if window else None
+
+
+def nav_returns(dates: np.ndarray, navs: np.ndarray) -> Dict[str, Any]:
+    """
+    Trailing returns of a NAV series.
+
+    The base NAV of each window is the last NAV on or before the window's
+    start date; windows longer than the history are None. For windows of a
+    year or more, the XIRR of a monthly SIP over the window is reported too
+    (installments buy at the first NAV on or after their date); all windows'
+    SIPs are solved in one batch.
+
+    Args:
+        dates (np.ndarray): NAV dates (datetime64[D]), oldest first
+        navs (np.ndarray): NAVs
+
+    Returns:
+        dict: Contains:
+            - returns: {period: {"return_pct", "cagr_pct" and "sip_xirr_pct"
+              (1Y and longer)}}
+            - since_inception_cagr_pct: CAGR over the whole history
+    """
+    if not len(dates):
+        raise ValueError("NAV history is empty.")
+    last_date, last_nav = dates[-1].astype(date), float(navs[-1])
+
+    def pct(rate: float) -> Optional[float]:
+        return round(float(rate) * 100, 2) if np.isfinite(rate) else None
+
+    def cagr_pct(index: int) -> Optional[float]:
+        return pct(cagr(float(navs[index]), last_nav, (dates[-1] - dates[index]).astype(int) / DAYS_PER_YEAR))
+
+    returns: Dict[str, Any] = {}
+    sips = {}
+    for period, (years, months) in RETURN_PERIODS.items():
+        start = np.datetime64(_months_before(last_date, years, months), "D")
+        index = int(np.searchsorted(dates, start, side="right")) - 1
+        if index < 0:
+            returns[period] = None
+            continue
+        base_nav = float(navs[index])
+        result = {"return_pct": round((last_nav / base_nav - 1) * 100, 2)}
+        if years:
+            result["cagr_pct"] = cagr_pct(index)
+            installments = np.array(
+                [_months_before(last_date, 0, month) for month in range(years * 12, 0, -1)], dtype="datetime64[D]"
+            )
+            bought = np.minimum(np.searchsorted(dates, installments), len(dates) - 1)
+            units = (1 / navs[bought]).sum()
+            sips[period] = (np.append(dates[bought], dates[-1]), np.append(-np.ones(len(bought)), units * last_nav))
+        returns[period] = result
+
+    for period, rate in zip(sips, xirr_many(list(sips.values()))):
+        returns[period]["sip_xirr_pct"] = pct(rate)
+
+    return {
+        "returns": returns,
+        "since_inception_cagr_pct": cagr_pct(0)
+    }
+
+
+# Shared by every navigator in the process
+scheme_index = SchemeIndex()
+nav_cache = NavCache()
@@ -0,0 +1,341 @@
+# tools/investment_navigator/portfolio.py
+"""
+Portfolio engine for the Investment Navigator.
+
+- Transactions (buys and sells of stocks and mutual fund units) are stored
+  per user in a local SQLite database under `DUNK_DATA_DIR` (default
+  `data/`), never under the publicly served `assets/`
+- Open lots are matched first-in first-out, giving cost basis and realized
+  P&L per holding
+- Valuation works on an aligned (holdings × days) price matrix: market
+  value, unrealized P&L, weights, time-weighted return and drawdown, and
+  XIRR for every holding at once (see returns.py)
+"""
+
+import os
+import sqlite3
+import threading
+from collections import deque
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from dunk_ai.tools.investment_navigator.indicators import forward_fill
+from dunk_ai.tools.investment_navigator.returns import DAYS_PER_YEAR, period_returns, xirr
+
+# Private user data: kept outside `assets/`, which the API serves as static files
+PRIVATE_DATA_DIR = Path(os.environ.get("DUNK_DATA_DIR", Path(__file__).resolve().parents[4] / "data"))
+PORTFOLIO_DB = PRIVATE_DATA_DIR / "portfolio.db"
+ASSET_TYPES = ("stock", "mutual_fund")
+SIDES = ("buy", "sell")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_id TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    asset_type TEXT NOT NULL,
+    side TEXT NOT NULL,
+    quantity REAL NOT NULL,
+    price REAL NOT NULL,
+    trade_date TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS transactions_by_user ON transactions (user_id, trade_date, id);
+"""
+
+
+class PortfolioStore:
+    """Thread-safe SQLite store of portfolio transactions."""
+
+    def __init__(self, path: Path = PORTFOLIO_DB):
+        self._path = Path(path)
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._connection = sqlite3.connect(self._path, check_same_thread=False)
+            self._connection.row_factory = sqlite3.Row
+            self._connection.executescript(_SCHEMA)
+        return self._connection
+
+    def add_transaction(
+        self,
+        user_id: str,
+        symbol: str,
+        side: str,
+        quantity: float,
+        price: float,
+        trade_date: date,
+        asset_type: str = "stock"
+    ) -> Dict[str, Any]:
+        """
+        Record a buy or sell.
+
+        Args:
+            user_id (str): Portfolio owner
+            symbol (str): Yahoo ticker ("TCS.NS") or mfapi scheme code
+            side (str): "buy" or "sell"
+            quantity (float): Shares or units, positive
+            price (float): Price per share or unit
+            trade_date (date): Trade date
+            asset_type (str): "stock" or "mutual_fund"
+
+        Returns:
+            dict: The stored transaction
+
+        Raises:
+            ValueError: For invalid input, or a sell that would leave the
+                holding negative on its trade date or any later date
+        """
+        if side not in SIDES:
+            raise ValueError(f"side must be one of: {', '.join(SIDES)}")
+        if asset_type not in ASSET_TYPES:
+            raise ValueError(f"asset_type must be one of: {', '.join(ASSET_TYPES)}")
+        if quantity <= 0 or price <= 0:
+            raise ValueError("Quantity and price must be positive.")
+        if trade_date > date.today():
+            raise ValueError("Trade date cannot be in the future.")
+        symbol = symbol.strip().upper()
+
+        with self._lock:
+            connection = self._connect()
+            if side == "sell":
+                # Later sells may depend on the quantity this one takes away
+                trades = self._holding_trades(connection, user_id, symbol, asset_type)
+                trades.append((trade_date.isoformat(), -quantity))
+                shortfall = _first_shortfall(sorted(trades, key=lambda trade: trade[0]))
+                if shortfall is not None:
+                    raise ValueError(
+                        f"Cannot sell {quantity} of {symbol} on {trade_date}; "
+                        f"the holding would be {shortfall[1]:g} on {shortfall[0]}."
+                    )
+            with connection:
+                cursor = connection.execute(
+                    "INSERT INTO transactions (user_id, symbol, asset_type, side, quantity, price, trade_date) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (user_id, symbol, asset_type, side, quantity, price, trade_date.isoformat())
+                )
+            row = connection.execute("SELECT * FROM transactions WHERE id = ?", (cursor.lastrowid,)).fetchone()
+        return dict(row)
+
+    def transactions(self, user_id: str) -> List[Dict[str, Any]]:
+        """A user's transactions, oldest first."""
+        with self._lock:
+            rows = self._connect().execute(
+                "SELECT * FROM transactions WHERE user_id = ? ORDER BY trade_date, id", (user_id,)
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def delete_transaction(self, user_id: str, transaction_id: int) -> bool:
+        """
+        Delete one of a user's transactions.
+
+        Args:
+            user_id (str): Portfolio owner
+            transaction_id (int): Transaction to delete
+
+        Returns:
+            bool: Whether the transaction existed
+
+        Raises:
+            ValueError: If removing a buy would leave a later sell uncovered
+        """
+        with self._lock:
+            connection = self._connect()
+            row = connection.execute(
+                "SELECT * FROM transactions WHERE user_id = ? AND id = ?", (user_id, transaction_id)
+            ).fetchone()
+            if row is not None and row["side"] == "buy":
+                trades = self._holding_trades(connection, user_id, row["symbol"], row["asset_type"], transaction_id)
+                shortfall = _first_shortfall(trades)
+                if shortfall is not None:
+                    raise ValueError(
+                        f"Cannot delete this buy of {row['symbol']}; "
+                        f"the holding would be {shortfall[1]:g} on {shortfall[0]}."
+                    )
+            with connection:
+                cursor = connection.execute(
+                    "DELETE FROM transactions WHERE user_id = ? AND id = ?", (user_id, transaction_id)
+                )
+        return cursor.rowcount > 0
+
+    @staticmethod
+    def _holding_trades(
+        connection: sqlite3.Connection,
+        user_id: str,
+        symbol: str,
+        asset_type: str,
+        exclude_id: Optional[int] = None
+    ) -> List[tuple]:
+        """(trade_date, signed quantity) of one holding, in the order valuation matches lots."""
+        rows = connection.execute(
+            "SELECT trade_date, CASE side WHEN 'buy' THEN quantity ELSE -quantity END FROM transactions "
+            "WHERE user_id = ? AND symbol = ? AND asset_type = ? AND id IS NOT ? ORDER BY trade_date, id",
+            (user_id, symbol, asset_type, exclude_id)
+        ).fetchall()
+        return [tuple(row) for row in rows]
+
+
+def _first_shortfall(trades: Sequence[tuple]) -> Optional[tuple]:
+    """First (trade_date, position) where the running position of ordered trades goes negative."""
+    position = 0.0
+    for trade_date, quantity in trades:
+        position += quantity
+        if position < -1e-9:
+            return trade_date, position
+    return None
+
+
+def match_lots(holding: np.ndarray, quantity: np.ndarray, price: np.ndarray, holdings: int) -> Dict[str, np.ndarray]:
+    """
+    First-in first-out lot matching.
+
+    Args:
+        holding (np.ndarray): Holding index of each transaction, in trade order
+        quantity (np.ndarray): Signed quantities (buys positive, sells negative)
+        price (np.ndarray): Trade prices
+        holdings (int): Number of holdings
+
+    Returns:
+        dict: Per-holding arrays: open_quantity, cost_basis (of the open
+            lots) and realized_pnl
+
+    Raises:
+        ValueError: If a sell exceeds the open quantity
+    """
+    lots = [deque() for _ in range(holdings)]
+    realized = np.zeros(holdings)
+    for index, amount, cost in zip(holding.tolist(), quantity.tolist(), price.tolist()):
+        if amount > 0:
+            lots[index].append([amount, cost])
+            continue
+        remaining = -amount
+        while remaining > 1e-9:
+            if not lots[index]:
+                raise ValueError("A sell exceeds the quantity held.")
+            lot = lots[index][0]
+            used = min(lot[0], remaining)
+            realized[index] += used * (cost - lot[1])
+            lot[0] -= used
+            remaining -= used
+            if lot[0] <= 1e-9:
+                lots[index].popleft()
+
+    open_quantity = np.array([sum(lot[0] for lot in queue) for queue in lots])
+    cost_basis = np.array([sum(lot[0] * lot[1] for lot in queue) for queue in lots])
+    return {"open_quantity": open_quantity, "cost_basis": cost_basis, "realized_pnl": realized}
+
+
+def value_portfolio(
+    symbols: Sequence[str],
+    asset_types: Sequence[str],
+    holding: np.ndarray,
+    trade_dates: np.ndarray,
+    quantity: np.ndarray,
+    price: np.ndarray,
+    dates: np.ndarray,
+    closes: np.ndarray
+) -> Dict[str, Any]:
+    """
+    Value a portfolio from its transactions and an aligned price matrix.
+
+    Args:
+        symbols (Sequence[str]): Symbol of each holding
+        asset_types (Sequence[str]): Asset type of each holding
+        holding (np.ndarray): Holding index of each transaction, in trade order
+        trade_dates (np.ndarray): Transaction dates (datetime64[D])
+        quantity (np.ndarray): Signed quantities (buys positive, sells negative)
+        price (np.ndarray): Trade prices
+        dates (np.ndarray): Price dates (datetime64[D]), ascending
+        closes (np.ndarray): (holdings, dates) closing prices; NaN where missing
+
+    Returns:
+        dict: Portfolio totals (value, invested, P&L, XIRR, drawdown),
+            time-weighted return, allocation by asset type and one row
+            per holding
+    """
+    count = len(symbols)
+    lots = match_lots(holding, quantity, price, count)
+    closes = forward_fill(np.atleast_2d(np.asarray(closes, dtype=float)).reshape(count, len(dates)))
+    last_price = closes[:, -1] if len(dates) else np.full(count, np.nan)
+    priced = ~np.isnan(last_price)
+
+    market_value = np.where(priced, lots["open_quantity"] * np.nan_to_num(last_price), 0.0)
+    cost_basis = lots["cost_basis"]
+    unrealized = np.where(priced, market_value - cost_basis, 0.0)
+    total_value = market_value.sum()
+    weights = market_value / total_value if total_value > 0 else np.zeros(count)
+
+    # --- XIRR: trade flows plus the current value as a final inflow
+    as_of = dates[-1] if len(dates) else trade_dates.max()
+    years = np.append((trade_dates - as_of).astype(float) / DAYS_PER_YEAR, 0.0)
+    flows = np.zeros((count, len(quantity) + 1))
+    flows[holding, np.arange(len(quantity))] = -quantity * price
+    flows[:, -1] = market_value
+    rates = xirr(np.vstack([flows, flows[priced].sum(axis=0)]), years)
+
+    # --- Time-weighted return and drawdown over the daily value series
+    day = np.clip(np.searchsorted(dates, trade_dates), 0, max(len(dates) - 1, 0))
+    performance = {"twr_pct": None, "max_drawdown_pct": None, "current_drawdown_pct": None}
+    if len(dates) > 1:
+        changes = np.zeros((count, len(dates)))
+        np.add.at(changes, (holding, day), quantity)
+        positions = np.cumsum(changes, axis=1)
+        values = np.nansum(positions * closes, axis=0)
+        invested = np.zeros(len(dates))
+        np.add.at(invested, day, quantity * price)
+        growth = np.cumprod(1 + period_returns(values, invested))
+        underwater = growth / np.maximum.accumulate(growth) - 1
+        performance = {
+            "twr_pct": round(float(growth[-1] - 1) * 100, 2),
+            "max_drawdown_pct": round(float(underwater.min()) * 100, 2),
+            "current_drawdown_pct": round(float(underwater[-1]) * 100, 2)
+        }
+
+    def pct(value: float) -> Optional[float]:
+        return round(float(value) * 100, 2) if np.isfinite(value) else None
+
+    rows = []
+    for index in np.argsort(-market_value, kind="stable"):
+        open_quantity = lots["open_quantity"][index]
+        rows.append({
+            "symbol": symbols[index],
+            "asset_type": asset_types[index],
+            "quantity": round(float(open_quantity), 4),
+            "avg_cost": round(float(cost_basis[index] / open_quantity), 4) if open_quantity > 0 else None,
+            "last_price": round(float(last_price[index]), 4) if priced[index] else None,
+            "market_value": round(float(market_value[index]), 2),
+            "cost_basis": round(float(cost_basis[index]), 2),
+            "unrealized_pnl": round(float(unrealized[index]), 2),
+            "unrealized_pnl_pct": pct(unrealized[index] / cost_basis[index]) if cost_basis[index] > 0 else None,
+            "realized_pnl": round(float(lots["realized_pnl"][index]), 2),
+            "weight_pct": round(float(weights[index]) * 100, 2),
+            "xirr_pct": pct(rates[index])
+        })
+
+    invested_total = cost_basis[priced].sum()
+    return {
+        "as_of": str(as_of),
+        "total_value": round(float(total_value), 2),
+        "total_invested": round(float(invested_total), 2),
+        "unrealized_pnl": round(float(unrealized.sum()), 2),
+        "unrealized_pnl_pct": pct(unrealized.sum() / invested_total) if invested_total > 0 else None,
+        "realized_pnl": round(float(lots["realized_pnl"].sum()), 2),
+        "xirr_pct": pct(rates[-1]),
+        **performance,
+        "allocation_pct": {
+            asset_type: round(float(weights[np.asarray(asset_types) == asset_type].sum()) * 100, 2)
+            for asset_type in ASSET_TYPES
+        },
+        "holdings": rows,
+        "missing_prices": [symbols[index] for index in np.flatnonzero(~priced & (lots["open_quantity"] > 0))]
+    }
+
+
+# Shared by every navigator in the process
+portfolio_store = PortfolioStore()
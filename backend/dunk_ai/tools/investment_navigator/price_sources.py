@@ -0,0 +1,227 @@
+# tools/investment_navigator/price_sources.py
+"""
+Hedged multi-source fetching for the Investment Navigator.
+
+- The preferred source starts first; the next one starts after a short hedge
+  delay (or at once if a source fails), and the first valid result wins
+- Everything runs under one overall deadline instead of stacked timeouts
+- Per-source latency and success rate are tracked over a sliding window and
+  used to reorder sources, so a source that keeps failing stops going first
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+HEDGE_DELAY = 0.75       # seconds before the next source is launched
+QUOTE_DEADLINE = 12.0    # seconds for the whole race
+HEALTH_WINDOW = 20       # recent attempts kept per source
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _thread_pool() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="price-source")
+        return _executor
+
+
+class SourceHealth:
+    """Thread-safe sliding window of (success, latency) samples per source."""
+
+    def __init__(self, window: int = HEALTH_WINDOW):
+        self._window = window
+        self._lock = threading.Lock()
+        self._samples: Dict[str, deque] = {}
+
+    def record(self, source: str, ok: bool, latency: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(source, deque(maxlen=self._window))
+            samples.append((ok, latency))
+
+    def stats(self, source: str) -> Dict[str, Any]:
+        """Attempts, success rate and mean latency over the window."""
+        with self._lock:
+            samples = list(self._samples.get(source, ()))
+        if not samples:
+            return {"attempts": 0, "success_rate": None, "avg_latency_ms": None}
+        successes = sum(ok for ok, _ in samples)
+        return {
+            "attempts": len(samples),
+            "success_rate": round(successes / len(samples), 3),
+            "avg_latency_ms": round(1000 * sum(latency for _, latency in samples) / len(samples), 1)
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            sources = list(self._samples)
+        return {source: self.stats(source) for source in sources}
+
+    def order(self, sources: Sequence[str]) -> List[str]:
+        """
+        Rank sources by smoothed success rate, then by mean latency.
+
+        Success rates are Laplace-smoothed and bucketed to one decimal so
+        untried sources rank in the middle and similarly reliable sources
+        compete on speed. Ties keep the given order.
+        """
+        def key(source: str):
+            with self._lock:
+                samples = list(self._samples.get(source, ()))
+            successes = sum(ok for ok, _ in samples)
+            smoothed = (successes + 1) / (len(samples) + 2)
+            latency = sum(latency for _, latency in samples) / len(samples) if samples else 0.0
+            return -round(smoothed, 1), latency
+
+        return sorted(sources, key=key)
+
+
+def _is_valid(result: Any) -> bool:
+    return isinstance(result, dict) and "error" not in result
+
+
+def _failure(errors: List[str], deadline_hit: bool) -> Dict[str, Any]:
+    if deadline_hit:
+        errors = errors + ["deadline exceeded"]
+    return {"error": "All price sources failed: " + "; ".join(errors)}
+
+
+def hedged_call(
+    sources: Dict[str, Callable[[], Dict[str, Any]]],
+    health: SourceHealth,
+    hedge_delay: float = HEDGE_DELAY,
+    deadline: float = QUOTE_DEADLINE,
+    clock: Callable[[], float] = time.monotonic
+) -> Dict[str, Any]:
+    """
+    Race blocking source callables on a thread pool and return the first valid result.
+
+    A result is valid when it is a dict without an "error" key. Losing calls
+    are left to finish in the background; their outcome still feeds `health`.
+
+    Args:
+        sources (Dict[str, Callable]): Source name -> zero-argument fetcher
+        health (SourceHealth): Tracker used for ordering and updated with every outcome
+        hedge_delay (float): Seconds to wait before launching the next source
+        deadline (float): Seconds before giving up on all sources
+        clock (Callable): Monotonic clock
+
+    Returns:
+        dict: The winning result with a "source_latency_ms" field, or an
+            {"error": ...} dict
+    """
+    queue = health.order(list(sources))
+    pending = {}
+    errors: List[str] = []
+    started = clock()
+
+    def run(name: str):
+        began = clock()
+        try:
+            result = sources[name]()
+        except Exception as e:
+            result = {"error": str(e)}
+        health.record(name, _is_valid(result), clock() - began)
+        return result, clock() - began
+
+    def launch():
+        name = queue.pop(0)
+        pending[_thread_pool().submit(run, name)] = name
+
+    launch()
+    while pending:
+        remaining = deadline - (clock() - started)
+        if remaining <= 0:
+            break
+        done, _ = wait(pending, timeout=min(hedge_delay, remaining) if queue else remaining,
+                       return_when=FIRST_COMPLETED)
+        if not done:
+            if queue:
+                launch()
+            continue
+        for future in done:
+            name = pending.pop(future)
+            result, latency = future.result()
+            if _is_valid(result):
+                return {**result, "source_latency_ms": round(1000 * latency, 1)}
+            errors.append(f"{name}: {result.get('error') if isinstance(result, dict) else result}")
+        if queue:
+            launch()
+    return _failure(errors, bool(pending))
+
+
+async def hedged_call_async(
+    sources: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]],
+    health: SourceHealth,
+    hedge_delay: float = HEDGE_DELAY,
+    deadline: float = QUOTE_DEADLINE,
+    clock: Callable[[], float] = time.monotonic
+) -> Dict[str, Any]:
+    """
+    Async counterpart of `hedged_call`; losing tasks are cancelled.
+
+    Args:
+        sources (Dict[str, Callable]): Source name -> coroutine function
+        health (SourceHealth): Tracker used for ordering and updated with every outcome
+        hedge_delay (float): Seconds to wait before launching the next source
+        deadline (float): Seconds before giving up on all sources
+        clock (Callable): Monotonic clock
+
+    Returns:
+        dict: The winning result with a "source_latency_ms" field, or an
+            {"error": ...} dict
+    """
+    queue = health.order(list(sources))
+    pending = {}
+    errors: List[str] = []
+    started = clock()
+
+    async def run(name: str):
+        began = clock()
+        try:
+            result = await sources[name]()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            result = {"error": str(e)}
+        health.record(name, _is_valid(result), clock() - began)
+        return result, clock() - began
+
+    def launch():
+        name = queue.pop(0)
+        pending[asyncio.ensure_future(run(name))] = name
+
+    launch()
+    try:
+        while pending:
+            remaining = deadline - (clock() - started)
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(pending, timeout=min(hedge_delay, remaining) if queue else remaining,
+                                         return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                if queue:
+                    launch()
+                continue
+            for task in done:
+                name = pending.pop(task)
+                result, latency = task.result()
+                if _is_valid(result):
+                    return {**result, "source_latency_ms": round(1000 * latency, 1)}
+                errors.append(f"{name}: {result.get('error') if isinstance(result, dict) else result}")
+            if queue:
+                launch()
+        return _failure(errors, bool(pending))
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+# Shared by every navigator so routes and the MCP server learn from each other
+price_source_health = SourceHealth()
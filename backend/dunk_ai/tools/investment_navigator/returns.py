@@ -0,0 +1,219 @@
+# tools/investment_navigator/returns.py
+"""
+Return calculations shared by the portfolio and mutual fund views.
+
+- XIRR (money-weighted return) of many cash-flow sets at once: Newton
+  iterations over the whole flow matrix, with a vectorized bisection
+  fallback for the sets Newton does not converge on
+- Ragged cash-flow sets (one per portfolio or SIP) are packed into a
+  zero-padded matrix, so thousands of them are solved in one call
+- Time-weighted return and CAGR
+"""
+
+from datetime import date
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+DAYS_PER_YEAR = 365.25
+
+XIRR_GUESS = 0.1
+XIRR_ITERATIONS = 50
+XIRR_TOLERANCE = 1e-9
+XIRR_MIN_RATE = -0.9999
+XIRR_MAX_RATE = 1e6
+BISECT_ITERATIONS = 200
+
+
+def cagr(start_value, end_value, years):
+    """
+    Compound annual growth rate; NaN where it is undefined.
+
+    Args:
+        start_value: Starting value(s)
+        end_value: Ending value(s)
+        years: Holding period(s) in years
+
+    Returns:
+        Annualized rate(s) (0.12 = 12%), shaped like the broadcast inputs
+    """
+    start_value, end_value, years = np.broadcast_arrays(
+        np.asarray(start_value, dtype=float), np.asarray(end_value, dtype=float), np.asarray(years, dtype=float)
+    )
+    valid = (start_value > 0) & (end_value >= 0) & (years > 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = (end_value / start_value) ** (1 / years) - 1
+    return np.where(valid, rate, np.nan)[()]
+
+
+def npv(rate: np.ndarray, cashflows: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Value at time 0 of each row of `cashflows`, discounted at that row's rate."""
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        return (cashflows * (1 + rate[:, None]) ** -years).sum(axis=1)
+
+
+def _bisect(cashflows: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """Bracketed XIRR for rows Newton could not solve; NaN where no sign change is found."""
+    low = np.full(len(cashflows), XIRR_MIN_RATE)
+    high = np.full(len(cashflows), 1.0)
+    low_value = npv(low, cashflows, years)
+    high_value = npv(high, cashflows, years)
+    # Widen the upper bound until it brackets a root
+    while True:
+        open_ = np.sign(low_value) == np.sign(high_value)
+        if not open_.any() or high[open_].min() >= XIRR_MAX_RATE:
+            break
+        high = np.where(open_, np.minimum(high * 10, XIRR_MAX_RATE), high)
+        high_value = np.where(open_, npv(high, cashflows, years), high_value)
+    bracketed = (np.sign(low_value) != np.sign(high_value)) & np.isfinite(low_value) & np.isfinite(high_value)
+
+    for _ in range(BISECT_ITERATIONS):
+        middle = (low + high) / 2
+        value = npv(middle, cashflows, years)
+        lower_half = np.sign(value) == np.sign(low_value)
+        low = np.where(lower_half, middle, low)
+        low_value = np.where(lower_half, value, low_value)
+        high = np.where(lower_half, high, middle)
+        if np.max(high - low, initial=0.0) < XIRR_TOLERANCE:
+            break
+    return np.where(bracketed, (low + high) / 2, np.nan)
+
+
+def xirr(cashflows: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """
+    XIRR of many cash-flow sets at once.
+
+    Solves sum(cf / (1 + r) ** t) = 0 for every row with Newton iterations
+    run on the whole matrix; rows that do not converge are retried by
+    bisection. Rows without both an outflow and an inflow, or without a
+    root, are NaN.
+
+    Args:
+        cashflows (np.ndarray): (sets, flows) amounts; outflows negative,
+            zero-padded
+        years (np.ndarray): (flows,) or (sets, flows) flow times in years
+
+    Returns:
+        np.ndarray: Annualized rate per set (0.12 = 12%)
+    """
+    cashflows = np.atleast_2d(np.asarray(cashflows, dtype=float))
+    years = np.broadcast_to(np.asarray(years, dtype=float), cashflows.shape)
+    solvable = (cashflows > 0).any(axis=1) & (cashflows < 0).any(axis=1)
+    rate = np.full(len(cashflows), XIRR_GUESS)
+    converged = ~solvable
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(XIRR_ITERATIONS):
+            active = ~converged
+            flows, times, current = cashflows[active], years[active], rate[active]
+            discount = (1 + current[:, None]) ** -times
+            value = (flows * discount).sum(axis=1)
+            slope = (-times * flows * discount / (1 + current[:, None])).sum(axis=1)
+            step = value / slope
+            updated = np.clip(current - step, XIRR_MIN_RATE, XIRR_MAX_RATE)
+            rate[active] = updated
+            converged[active] = np.isfinite(step) & (np.abs(step) < XIRR_TOLERANCE)
+            if converged.all():
+                break
+
+    retry = solvable & ~(converged & np.isfinite(rate))
+    if retry.any():
+        rate[retry] = _bisect(cashflows[retry], years[retry])
+    return np.where(solvable, rate, np.nan)
+
+
+def pack_cashflows(
+    flow_sets: Sequence[Tuple[Sequence, Sequence[float]]],
+    as_of: Optional[Sequence] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pack ragged cash-flow sets into zero-padded (sets, flows) matrices.
+
+    Args:
+        flow_sets (Sequence[tuple]): (dates, amounts) per set
+        as_of (Sequence): Valuation date per set (default: its last flow date)
+
+    Returns:
+        tuple: (cashflows, years), with years measured back from `as_of`
+    """
+    lengths = np.array([len(amounts) for _, amounts in flow_sets], dtype=int)
+    starts = np.cumsum(lengths) - lengths
+    row = np.repeat(np.arange(len(flow_sets)), lengths)
+    column = np.arange(lengths.sum()) - starts[row]
+
+    days = np.concatenate([np.zeros(0, dtype=np.int64)] + [
+        np.asarray(flow_dates, dtype="datetime64[D]").astype(np.int64) for flow_dates, _ in flow_sets
+    ])
+    amounts = np.concatenate([np.zeros(0)] + [np.asarray(values, dtype=float) for _, values in flow_sets])
+    if as_of is None:
+        # Sets are contiguous, so each non-empty set's last date is one reduceat segment
+        ends = np.zeros(len(flow_sets), dtype=np.int64)
+        filled = lengths > 0
+        if filled.any():
+            ends[filled] = np.maximum.reduceat(days, starts[filled])
+    else:
+        ends = np.asarray(as_of, dtype="datetime64[D]").astype(np.int64)
+
+    cashflows = np.zeros((len(flow_sets), int(lengths.max(initial=0))))
+    years = np.zeros_like(cashflows)
+    cashflows[row, column] = amounts
+    years[row, column] = (days - ends[row]) / DAYS_PER_YEAR
+    return cashflows, years
+
+
+def xirr_many(
+    flow_sets: Sequence[Tuple[Sequence, Sequence[float]]],
+    as_of: Optional[Sequence] = None
+) -> np.ndarray:
+    """
+    XIRR of many dated cash-flow sets (portfolios, SIPs) in one solve.
+
+    Args:
+        flow_sets (Sequence[tuple]): (dates, amounts) per set; investments
+            negative, redemptions and the current value positive
+        as_of (Sequence): Valuation date per set (default: its last flow date)
+
+    Returns:
+        np.ndarray: Annualized rate per set (0.12 = 12%); NaN if unsolvable
+    """
+    if not len(flow_sets):
+        return np.zeros(0)
+    return xirr(*pack_cashflows(flow_sets, as_of))
+
+
+def xirr_dated(dates: Sequence, amounts: Sequence[float], as_of: Optional[date] = None) -> Optional[float]:
+    """XIRR of a single dated cash-flow set; None if unsolvable."""
+    rate = xirr_many([(dates, amounts)], None if as_of is None else [as_of])[0]
+    return float(rate) if np.isfinite(rate) else None
+
+
+def period_returns(values: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """
+    Per-period returns with external cash flows removed.
+
+    Args:
+        values (np.ndarray): (..., periods) values at each period's end
+        flows (np.ndarray): (..., periods) net money added during each period
+
+    Returns:
+        np.ndarray: (values - flows) / previous value - 1; 0 while nothing
+            was held
+    """
+    values = np.asarray(values, dtype=float)
+    previous = np.concatenate([np.zeros(values.shape[:-1] + (1,)), values[..., :-1]], axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(previous > 0, (values - flows) / previous - 1, 0.0)
+
+
+def time_weighted_return(values: np.ndarray, flows: np.ndarray) -> np.ndarray:
+    """
+    Time-weighted return: the chained growth of `period_returns`.
+
+    Args:
+        values (np.ndarray): (..., periods) values at each period's end
+        flows (np.ndarray): (..., periods) net money added during each period
+
+    Returns:
+        np.ndarray: Total return over all periods (0.12 = 12%)
+    """
+    return (np.prod(1 + period_returns(values, flows), axis=-1) - 1)[()]
@@ -0,0 +1,76 @@
+"""
+Loan Clarity Tool – Payment Date Index
+
+This module generates payment calendars as NumPy arrays:
+- True monthly, quarterly and annual calendar stepping
+- End-of-month clamping anchored on the start day (Jan 31 -> Feb 29 -> Mar 31)
+- Calendar year buckets as integer arrays for vectorized grouping
+"""
+
+from datetime import date, datetime
+from typing import Union
+
+import numpy as np
+
+from .logic import get_periods_per_year
+
+
+def payment_months(
+    start_date: Union[date, datetime],
+    periods: Union[int, np.ndarray],
+    repayment_frequency: str
+) -> np.ndarray:
+    """
+    Calendar month of each payment, as months since January 1970.
+
+    Args:
+        start_date (date | datetime): Date of the first payment
+        periods (int | np.ndarray): Number of payments, or the zero-based
+            period indices
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+
+    Returns:
+        np.ndarray: Integer month index per payment
+    """
+    if np.isscalar(periods):
+        periods = np.arange(periods)
+    first_month = (start_date.year - 1970) * 12 + start_date.month - 1
+    return first_month + np.asarray(periods) * (12 // get_periods_per_year(repayment_frequency))
+
+
+def generate_payment_dates(
+    start_date: Union[date, datetime],
+    periods: Union[int, np.ndarray],
+    repayment_frequency: str
+) -> np.ndarray:
+    """
+    Generate calendar-accurate payment dates in one vectorized step.
+
+    Args:
+        start_date (date | datetime): Date of the first payment
+        periods (int | np.ndarray): Number of payments, or the zero-based
+            period indices to generate dates for
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+
+    Returns:
+        np.ndarray: `datetime64[D]` payment dates
+    """
+    months = payment_months(start_date, periods, repayment_frequency).astype("datetime64[M]")
+
+    # Clamp the anchor day to the length of each target month
+    month_start = months.astype("datetime64[D]")
+    month_length = ((months + 1).astype("datetime64[D]") - month_start).astype(int)
+    return month_start + (np.minimum(start_date.day, month_length) - 1)
+
+
+def payment_years(payment_dates: np.ndarray) -> np.ndarray:
+    """
+    Map payment dates to calendar years.
+
+    Args:
+        payment_dates (np.ndarray): `datetime64` payment dates
+
+    Returns:
+        np.ndarray: Integer calendar year per payment
+    """
+    return payment_dates.astype("datetime64[Y]").astype(int) + 1970
@@ -0,0 +1,231 @@
+"""
+Loan Clarity Tool – Prepayment Scenario Simulator
+
+This module simulates a reducing balance loan under a plan of events:
+- Lump-sum prepayments (one-off or recurring, e.g. a yearly bonus)
+- EMI changes (a new EMI or a percentage step-up, optionally recurring)
+- Rate changes (keeping the EMI, or re-amortizing over the remaining tenure)
+- Payment holidays (interest accrues and is capitalized)
+
+The balance path is advanced segment by segment in closed form between
+events, so the cost depends on the number of events, not on the tenure.
+"""
+
+import heapq
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from .logic import get_loan_terms
+from .validations import validate_scenario_events
+
+
+MAX_SCENARIO_YEARS = 50
+EMI_ROUNDING = 0.005  # EMIs are rounded to the paisa
+
+
+def _balance_after(balance: float, rate: float, payment: float, periods: int) -> float:
+    """Outstanding balance after `periods` equal payments at a constant periodic rate."""
+    if rate == 0:
+        return balance - payment * periods
+    growth = (1 + rate) ** periods
+    return balance * growth - payment * (growth - 1) / rate
+
+
+def _payoff_periods(balance: float, rate: float, payment: float) -> Optional[int]:
+    """Number of payments that clear `balance`, or None if the payment never does."""
+    if payment <= 0:
+        return None
+    if rate == 0:
+        periods = balance / payment
+    elif payment <= balance * rate:
+        return None
+    else:
+        periods = math.log(payment / (payment - balance * rate)) / math.log1p(rate)
+
+    # A residual no larger than the accumulated EMI rounding is folded
+    # into the last payment instead of adding a payment
+    whole = math.floor(periods)
+    if whole >= 1:
+        residual = _balance_after(balance, rate, payment, whole)
+        if residual <= EMI_ROUNDING - _balance_after(0.0, rate, EMI_ROUNDING, whole):
+            return whole
+    return math.ceil(periods)
+
+
+def _advance(
+    balance: float,
+    rate: float,
+    payment: float,
+    length: Optional[int]
+) -> Tuple[int, int, float, float]:
+    """
+    Advance the balance through one segment of constant rate and payment.
+
+    Returns:
+        tuple: (periods elapsed, payments made, closing balance, amount paid);
+            a zero closing balance means the loan was repaid in the segment
+    """
+    payoff = _payoff_periods(balance, rate, payment)
+    if payoff is not None and (length is None or payoff <= length):
+        # Final payment only covers what is left
+        final_payment = _balance_after(balance, rate, payment, payoff - 1) * (1 + rate)
+        return payoff, payoff, 0.0, payment * (payoff - 1) + final_payment
+
+    if length is None:
+        raise ValueError("EMI does not cover the interest; the loan would never be repaid.")
+    closing = _balance_after(balance, rate, payment, length)
+    return length, length if payment > 0 else 0, closing, payment * length
+
+
+def _amortizing_emi(balance: float, rate: float, payments: int) -> float:
+    """EMI that repays `balance` over `payments` periods."""
+    if rate == 0:
+        return round(balance / payments, 2)
+    growth = (1 + rate) ** payments
+    return round(balance * rate * growth / (growth - 1), 2)
+
+
+def simulate_loan_scenario(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str,
+    events: List[Dict[str, Any]]
+) -> Dict[str, Any]:
+    """
+    Simulate a reducing balance loan under a plan of prepayment events.
+
+    Each event applies once `period` payment periods have elapsed (0 is
+    before the first payment). Events at the same period apply in list order.
+
+    Event types:
+        - {"type": "lump_sum", "period": 12, "amount": 100000}
+        - {"type": "emi_change", "period": 12, "emi": 25000} or
+          {"type": "emi_change", "period": 12, "percent": 5}
+        - {"type": "rate_change", "period": 24, "annual_rate": 9.5,
+          "recompute_emi": False}
+        - {"type": "holiday", "period": 6, "periods": 3}
+
+    Lump sums and EMI changes recur when given `every` (periods between
+    occurrences), bounded by an optional `count` or `until` period.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+        events (List[Dict]): Scenario events as described above
+
+    Returns:
+        dict: Contains:
+            - original_emi / original_total_interest / original_number_of_payments:
+              The loan without any events
+            - total_interest: Interest paid under the scenario
+            - total_emi_paid: Sum of regular payments
+            - total_prepaid: Sum of lump-sum prepayments
+            - number_of_payments: Regular payments made
+            - tenure_periods / tenure_years: Time until the loan is repaid
+            - final_emi: EMI in force at the end
+            - interest_saved: Reduction in total interest
+            - tenure_reduction_periods / tenure_reduction_years: Reduction in tenure
+            - segments: Per-segment rate, EMI, balances, interest and principal
+    """
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency)
+    validate_scenario_events(events)
+
+    periods_per_year = terms.periods_per_year
+    max_periods = MAX_SCENARIO_YEARS * periods_per_year
+
+    queue = [(event["period"], index, 0) for index, event in enumerate(events)]
+    heapq.heapify(queue)
+
+    balance = terms.principal
+    rate = terms.periodic_rate
+    current_rate = terms.annual_rate
+    emi = terms.emi
+    period = 0
+    payments_made = 0
+    holiday_end = 0
+    total_interest = total_emi_paid = total_prepaid = 0.0
+    segments = []
+
+    while balance > 0:
+        # Apply every event due at this period
+        while queue and queue[0][0] <= period:
+            _, index, occurrence = heapq.heappop(queue)
+            event = events[index]
+            kind = event["type"]
+
+            if kind == "lump_sum":
+                prepaid = min(event["amount"], balance)
+                balance -= prepaid
+                total_prepaid += prepaid
+            elif kind == "emi_change":
+                emi = event["emi"] if "emi" in event else round(emi * (1 + event["percent"] / 100.0), 2)
+            elif kind == "rate_change":
+                current_rate = event["annual_rate"]
+                rate = current_rate / 100.0 / periods_per_year
+                if event.get("recompute_emi"):
+                    remaining = max(terms.number_of_payments - payments_made, 1)
+                    emi = _amortizing_emi(balance, rate, remaining)
+            else:  # holiday
+                holiday_end = max(holiday_end, period + event["periods"])
+
+            every = event.get("every")
+            next_period = period + every if every else None
+            if next_period is not None \
+                    and (event.get("count") is None or occurrence + 1 < event["count"]) \
+                    and (event.get("until") is None or next_period <= event["until"]):
+                heapq.heappush(queue, (next_period, index, occurrence + 1))
+
+        if balance <= 0:
+            break
+        if period >= max_periods:
+            raise ValueError(f"Scenario does not repay the loan within {MAX_SCENARIO_YEARS} years.")
+
+        # Run to the next event, the end of a holiday, or payoff
+        breaks = [queue[0][0]] if queue else []
+        if holiday_end > period:
+            breaks.append(holiday_end)
+        length = min(breaks) - period if breaks else None
+        payment = 0.0 if period < holiday_end else emi
+
+        elapsed, paid_count, closing, paid = _advance(balance, rate, payment, length)
+        interest = paid - (balance - closing)
+        segments.append({
+            "start_period": period + 1,
+            "end_period": period + elapsed,
+            "annual_rate": current_rate,
+            "emi": payment,
+            "opening_balance": round(balance, 2),
+            "closing_balance": round(closing, 2),
+            "interest_paid": round(interest, 2),
+            "principal_paid": round(balance - closing, 2)
+        })
+
+        period += elapsed
+        payments_made += paid_count
+        total_interest += interest
+        total_emi_paid += paid
+        balance = closing
+
+    # Baseline on the same rounded EMI, so an empty plan saves exactly nothing
+    original_periods, _, _, original_paid = _advance(terms.principal, terms.periodic_rate, terms.emi, None)
+    original_interest = original_paid - terms.principal
+
+    return {
+        "original_emi": terms.emi,
+        "original_total_interest": round(original_interest, 2),
+        "original_number_of_payments": original_periods,
+        "total_interest": round(total_interest, 2),
+        "total_emi_paid": round(total_emi_paid, 2),
+        "total_prepaid": round(total_prepaid, 2),
+        "number_of_payments": payments_made,
+        "tenure_periods": period,
+        "tenure_years": round(period / periods_per_year, 2),
+        "final_emi": emi,
+        "interest_saved": round(original_interest - total_interest, 2),
+        "tenure_reduction_periods": original_periods - period,
+        "tenure_reduction_years": round((original_periods - period) / periods_per_year, 2),
+        "segments": segments
+    }
@@ -0,0 +1,209 @@
+"""
+Loan Clarity Tool – Sensitivity Grid
+
+This module evaluates loans over a cartesian grid of
+rate × tenure × principal in one broadcast:
+- EMI, total interest and total payment per grid cell
+- APR per cell (IRR of the net disbursement) when charges apply
+- Optional process-pool fan-out over rate blocks for very large grids
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from .effective_rate import solve_periodic_irr_batch
+from .logic import get_periods_per_year
+from .validations import (
+    validate_interest_method,
+    validate_interest_rate,
+    validate_principal,
+    validate_repayment_frequency,
+    validate_tenure
+)
+
+
+SENSITIVITY_AXES = ("annual_rate", "tenure_years", "principal")
+SENSITIVITY_MAX_CELLS = 20_000_000
+SENSITIVITY_PARALLEL_CELLS = 2_000_000
+# Limits for grids requested over the REST API and MCP, whose JSON responses
+# grow by ~40 bytes per cell
+SENSITIVITY_REQUEST_MAX_CELLS = 50_000
+SENSITIVITY_REQUEST_MAX_AXIS = 500
+
+
+def _grid_block(
+    annual_rate: np.ndarray,
+    tenure_years: np.ndarray,
+    principal: np.ndarray,
+    periods_per_year: int,
+    interest_method: str,
+    processing_fee_percent: float,
+    other_charges: float
+) -> Dict[str, np.ndarray]:
+    """Evaluate one block of rates against every tenure and principal."""
+    rate = annual_rate[:, None, None]
+    tenure = tenure_years[None, :, None]
+    amount = principal[None, None, :]
+
+    number_of_payments = (tenure * periods_per_year).astype(int)
+    periodic_rate = (rate / 100.0) / periods_per_year
+
+    if interest_method == "flat":
+        total_interest = amount * rate * tenure / 100.0
+        emi = (amount + total_interest) / number_of_payments
+    else:
+        growth = (1 + periodic_rate) ** number_of_payments
+        with np.errstate(divide="ignore", invalid="ignore"):
+            emi = np.where(
+                periodic_rate > 0,
+                amount * periodic_rate * growth / (growth - 1),
+                amount / number_of_payments
+            )
+    total_payment = emi * number_of_payments
+    total_interest = total_payment - amount
+    emi = np.round(emi, 2)
+
+    shape = emi.shape
+    if interest_method == "reducing" and processing_fee_percent == 0 and other_charges == 0:
+        # Without charges the IRR of a reducing loan is its nominal rate
+        apr = np.broadcast_to(rate, shape)
+    else:
+        net_disbursement = amount * (1 - processing_fee_percent / 100.0) - other_charges
+        periodic_irr = solve_periodic_irr_batch(
+            np.broadcast_to(net_disbursement, shape).ravel(),
+            emi.ravel(),
+            np.broadcast_to(number_of_payments, shape).ravel(),
+            np.broadcast_to(periodic_rate, shape).ravel()
+        ).reshape(shape)
+        apr = np.where(np.isnan(periodic_irr), rate, periodic_irr * periods_per_year * 100)
+
+    return {
+        "emi": emi,
+        "total_interest": np.round(total_interest, 2),
+        "total_payment": np.round(total_payment, 2),
+        "apr": np.round(apr, 4)
+    }
+
+
+def loan_sensitivity_grid(
+    annual_rates: Sequence[float],
+    tenure_years: Sequence[float],
+    principals: Sequence[float],
+    repayment_frequency: str = "monthly",
+    interest_method: str = "reducing",
+    processing_fee_percent: float = 0.0,
+    other_charges: float = 0.0,
+    parallel: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+    max_cells: int = SENSITIVITY_MAX_CELLS
+) -> Dict[str, Any]:
+    """
+    Evaluate EMI, interest and APR over a rate × tenure × principal grid.
+
+    Every output array has shape (len(annual_rates), len(tenure_years),
+    len(principals)).
+
+    Args:
+        annual_rates (Sequence[float]): Annual interest rates (%)
+        tenure_years (Sequence[float]): Loan tenures in years
+        principals (Sequence[float]): Loan amounts
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+        interest_method (str): "reducing" or "flat"
+        processing_fee_percent (float): Processing fee as % of principal
+        other_charges (float): Other upfront charges per loan
+        parallel (bool): Fan out over a process pool; by default only for
+            grids of at least SENSITIVITY_PARALLEL_CELLS cells
+        max_workers (int): Process pool size (default: CPU count)
+        max_cells (int): Largest grid accepted (default: SENSITIVITY_MAX_CELLS)
+
+    Returns:
+        dict: Contains:
+            - axes: Axis names in array order
+            - annual_rate / tenure_years / principal: Axis values
+            - emi: EMI per cell
+            - total_interest: Total interest per cell
+            - total_payment: Total payment per cell
+            - apr: APR (%) per cell, including charges
+    """
+    validate_repayment_frequency(repayment_frequency)
+    validate_interest_method(interest_method)
+    annual_rates = np.atleast_1d(np.asarray(annual_rates, dtype=float))
+    tenure_years = np.atleast_1d(np.asarray(tenure_years, dtype=float))
+    principals = np.atleast_1d(np.asarray(principals, dtype=float))
+
+    for name, values in (("annual_rates", annual_rates), ("tenure_years", tenure_years), ("principals", principals)):
+        if values.ndim != 1 or len(values) == 0:
+            raise ValueError(f"{name} must be a non-empty list of numbers.")
+    for rate in annual_rates.tolist():
+        validate_interest_rate(rate)
+    for tenure in tenure_years.tolist():
+        validate_tenure(tenure)
+    for principal in principals.tolist():
+        validate_principal(principal)
+    if not 0 <= processing_fee_percent < 100:
+        raise ValueError("Processing fee percent must be between 0 and 100.")
+    if other_charges < 0:
+        raise ValueError("Other charges cannot be negative.")
+
+    periods_per_year = get_periods_per_year(repayment_frequency)
+    if (tenure_years * periods_per_year < 1).any():
+        raise ValueError("Number of payments must be greater than 0.")
+
+    cells = len(annual_rates) * len(tenure_years) * len(principals)
+    if cells > max_cells:
+        raise ValueError(f"Sensitivity grid is too large ({cells} cells, limit {max_cells}).")
+    if parallel is None:
+        parallel = cells >= SENSITIVITY_PARALLEL_CELLS
+
+    args = (periods_per_year, interest_method, processing_fee_percent, other_charges)
+    workers = min(max_workers or os.cpu_count() or 1, len(annual_rates))
+    if parallel and workers > 1:
+        blocks = np.array_split(annual_rates, workers)
+        # Spawn rather than fork: the API process runs thread pools, and
+        # forking while their threads hold locks can kill the workers
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = [
+                pool.submit(_grid_block, block, tenure_years, principals, *args)
+                for block in blocks
+            ]
+            parts = [future.result() for future in futures]
+        grid = {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+    else:
+        grid = _grid_block(annual_rates, tenure_years, principals, *args)
+
+    return {
+        "axes": list(SENSITIVITY_AXES),
+        "annual_rate": annual_rates,
+        "tenure_years": tenure_years,
+        "principal": principals,
+        **grid
+    }
+
+
+def sensitivity_grid_to_lists(grid: Dict[str, Any], squeeze: bool = False) -> Dict[str, Any]:
+    """
+    Convert a sensitivity grid to JSON-ready nested lists.
+
+    Args:
+        grid (Dict[str, Any]): Result of `loan_sensitivity_grid`
+        squeeze (bool): Drop axes with a single value, e.g. return a 2D
+            rate × tenure table when only one principal is given
+
+    Returns:
+        dict: Same keys, with arrays as (nested) lists
+    """
+    axes = list(grid["axes"])
+    keep = tuple(index for index, axis in enumerate(axes) if not squeeze or len(grid[axis]) > 1)
+    dropped = tuple(index for index in range(len(axes)) if index not in keep)
+
+    payload = {"axes": [axes[index] for index in keep]}
+    for axis in axes:
+        values = grid[axis].tolist()
+        payload[axis] = values[0] if squeeze and len(values) == 1 else values
+    for key in ("emi", "total_interest", "total_payment", "apr"):
+        payload[key] = np.squeeze(grid[key], axis=dropped).tolist() if dropped else grid[key].tolist()
+    return payload
@@ -5,6 +5,11 @@ This file contains input validation utilities to ensure
 safe and correct values before calculations.
 """
 
+from numbers import Real
+
+import numpy as np
+
+
 def validate_principal(principal: float):
     """
     Validate principal amount.
@@ -198,4 +203,110 @@ def validate_loan_type(loan_type: str):
     valid_types = ["home_loan", "personal_loan", "vehicle_loan", "education_loan"]
     if loan_type not in valid_types:
         raise ValueError(f"Invalid loan type. Must be one of: {valid_types}")
-    return loan_type
\ No newline at end of file
+    return loan_type
+
+
+def _first_invalid(mask: np.ndarray, message: str):
+    """Raise ValueError naming the first row flagged by `mask`."""
+    if mask.any():
+        row = int(np.flatnonzero(mask)[0])
+        raise ValueError(f"Row {row}: {message}")
+
+
+def validate_loan_columns(principal, annual_rate, tenure_years, repayment_frequency):
+    """
+    Validate loan inputs column-wise for batch calculations.
+
+    Applies the same limits as the scalar validators to whole arrays.
+
+    Args:
+        principal (np.ndarray): Loan principal amounts
+        annual_rate (np.ndarray): Annual interest rate percentages
+        tenure_years (np.ndarray): Loan tenures in years
+        repayment_frequency (np.ndarray): Repayment frequency strings
+
+    Returns:
+        tuple: Validated (principal, annual_rate, tenure_years, repayment_frequency)
+
+    Raises:
+        ValueError: If columns differ in length or any row is invalid
+    """
+    lengths = {len(principal), len(annual_rate), len(tenure_years), len(repayment_frequency)}
+    if len(lengths) != 1:
+        raise ValueError("All loan columns must have the same length.")
+
+    _first_invalid(~(principal > 0), "Principal must be greater than 0.")
+    _first_invalid(principal > 100000000000, "Principal amount is too large.")
+    _first_invalid(~(annual_rate >= 0), "Interest rate cannot be negative.")
+    _first_invalid(annual_rate > 100, "Interest rate seems unreasonably high.")
+    _first_invalid(~(tenure_years > 0), "Loan tenure must be greater than 0.")
+    _first_invalid(tenure_years > 50, "Loan tenure cannot exceed 50 years.")
+
+    valid_frequencies = ["monthly", "quarterly", "annually"]
+    _first_invalid(
+        ~np.isin(repayment_frequency, valid_frequencies),
+        f"Invalid repayment frequency. Must be one of: {valid_frequencies}"
+    )
+    return principal, annual_rate, tenure_years, repayment_frequency
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, Real) and not isinstance(value, bool)
+
+
+def validate_scenario_events(events):
+    """
+    Validate a prepayment scenario event list.
+
+    Args:
+        events (List[Dict]): Scenario events for `simulate_loan_scenario`
+
+    Returns:
+        List[Dict]: Validated events
+
+    Raises:
+        ValueError: If any event is malformed, naming its position
+    """
+    valid_types = ["lump_sum", "emi_change", "rate_change", "holiday"]
+    for index, event in enumerate(events):
+        kind = event.get("type")
+        if kind not in valid_types:
+            raise ValueError(f"Event {index}: Invalid event type. Must be one of: {valid_types}")
+        period = event.get("period")
+        if not isinstance(period, int) or period < 0:
+            raise ValueError(f"Event {index}: period must be a non-negative integer.")
+
+        if kind == "lump_sum" and not (_is_number(event.get("amount")) and event["amount"] > 0):
+            raise ValueError(f"Event {index}: Lump sum amount must be a number greater than 0.")
+        if kind == "emi_change":
+            if ("emi" in event) == ("percent" in event):
+                raise ValueError(f"Event {index}: EMI change needs exactly one of emi or percent.")
+            if "emi" in event and not (_is_number(event["emi"]) and event["emi"] > 0):
+                raise ValueError(f"Event {index}: EMI must be a number greater than 0.")
+            if "percent" in event and not (_is_number(event["percent"]) and event["percent"] > -100):
+                raise ValueError(f"Event {index}: EMI change percent must be greater than -100.")
+        if kind == "rate_change":
+            if "annual_rate" not in event:
+                raise ValueError(f"Event {index}: Rate change needs annual_rate.")
+            try:
+                validate_interest_rate(event["annual_rate"])
+            except ValueError as exc:
+                raise ValueError(f"Event {index}: {exc}") from None
+        if kind == "holiday":
+            periods = event.get("periods")
+            if not isinstance(periods, int) or periods < 1:
+                raise ValueError(f"Event {index}: Holiday periods must be a positive integer.")
+
+        every = event.get("every")
+        if every is not None:
+            if kind not in ("lump_sum", "emi_change"):
+                raise ValueError(f"Event {index}: Only lump sums and EMI changes can recur.")
+            if not isinstance(every, int) or every < 1:
+                raise ValueError(f"Event {index}: every must be a positive integer.")
+        count = event.get("count")
+        if count is not None and (not isinstance(count, int) or count < 1):
+            raise ValueError(f"Event {index}: count must be a positive integer.")
+        until = event.get("until")
+        if until is not None and (not isinstance(until, int) or until < 0):
+            raise ValueError(f"Event {index}: until must be a non-negative integer.")
+    return events
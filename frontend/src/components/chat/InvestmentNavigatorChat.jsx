@@ -128,10 +128,17 @@ const InvestmentNavigatorChat = ({ sidebarOpen, setSidebarOpen, user }) => {
     }
 
     if (lowerInput.includes('chart') || lowerInput.includes('plot') || lowerInput.includes('forecast')) {
-      const data = await fetchJson(
-        `${API_BASE_URL}/api/investment/plot/${encodeURIComponent(ticker)}`
-      );
-      let chartPath = data.chart_path || '';
+      const plotUrl = `${API_BASE_URL}/api/investment/plot/${encodeURIComponent(ticker)}`;
+      let data = await fetchJson(plotUrl);
+      // A chart still rendering comes back as 202 without chart_path; ask again after the hint
+      for (let attempt = 0; attempt < 3 && data.chart_status === 'pending'; attempt += 1) {
+        await new Promise((resolve) => setTimeout(resolve, (data.retry_after_seconds || 5) * 1000));
+        data = await fetchJson(plotUrl);
+      }
+      if (!data.chart_path) {
+        return `The forecast chart for ${ticker} is still being drawn. Please ask again in a few seconds.`;
+      }
+      let chartPath = data.chart_path;
       const assetsIndex = chartPath.indexOf('/assets/');
       if (assetsIndex >= 0) {
         chartPath = chartPath.slice(assetsIndex);
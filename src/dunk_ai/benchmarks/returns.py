@@ -0,0 +1,115 @@
+# benchmarks/returns.py
+"""
+XIRR throughput benchmark for the returns module.
+
+Synthetic monthly-SIP portfolios with irregular top-ups and redemptions
+are solved in one `xirr_many` batch and, for comparison, one portfolio at
+a time; the cost per portfolio is reported for both.
+
+Usage:
+    python -m dunk_ai.benchmarks.returns [--portfolios N] [--months M] [--runs R]
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+from dunk_ai.tools.investment_navigator.returns import xirr_many
+
+SEED = 7
+
+
+def synthetic_portfolios(count: int, months: int, seed: int = SEED) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """
+    Build dated cash-flow sets resembling SIP portfolios.
+
+    Each portfolio invests monthly for a random part of `months`, adds a
+    few random top-ups and withdrawals, and ends with its current value
+    (grown at a random annual rate between -15% and 30%).
+
+    Args:
+        count (int): Number of portfolios
+        months (int): Longest SIP, in months
+        seed (int): Generator seed
+
+    Returns:
+        list: (dates, amounts) per portfolio, as accepted by `xirr_many`
+    """
+    rng = np.random.default_rng(seed)
+    today = np.datetime64("2025-01-01", "D")
+    portfolios = []
+    for _ in range(count):
+        length = int(rng.integers(12, months + 1))
+        days = np.sort(np.concatenate([
+            np.arange(length) * 30 + rng.integers(0, 3, length),
+            rng.integers(0, length * 30, 4)
+        ]))[::-1]
+        amounts = -rng.choice([5_000.0, 10_000.0, 25_000.0]) * np.ones(len(days))
+        amounts[rng.random(len(days)) < 0.05] *= -0.5   # occasional redemptions
+        growth = (1 + rng.uniform(-0.15, 0.30)) ** (days / 365.25)
+        current_value = -(amounts * growth).sum()
+        portfolios.append((np.append(today - days, today), np.append(amounts, max(current_value, 1.0))))
+    return portfolios
+
+
+def _median_ms(solve, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        solve()
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def measure_xirr(portfolios: Sequence[Tuple[np.ndarray, np.ndarray]], runs: int = 5) -> Dict[str, Any]:
+    """
+    Time batched and one-at-a-time XIRR over the same portfolios.
+
+    Args:
+        portfolios (Sequence[tuple]): (dates, amounts) per portfolio
+        runs (int): Timed repetitions; the median is reported
+
+    Returns:
+        dict: Contains:
+            - batch_ms / batch_us_per_portfolio: One `xirr_many` call
+            - single_ms / single_us_per_portfolio: One call per portfolio
+            - solved: Portfolios with a finite XIRR
+    """
+    if runs < 1:
+        raise ValueError("runs must be at least 1.")
+    rates = xirr_many(portfolios)
+    batch_ms = _median_ms(lambda: xirr_many(portfolios), runs)
+    single_ms = _median_ms(lambda: [xirr_many([portfolio]) for portfolio in portfolios], runs)
+    count = max(len(portfolios), 1)
+    return {
+        "batch_ms": round(batch_ms, 2),
+        "batch_us_per_portfolio": round(batch_ms * 1000 / count, 2),
+        "single_ms": round(single_ms, 2),
+        "single_us_per_portfolio": round(single_ms * 1000 / count, 2),
+        "solved": int(np.isfinite(rates).sum()),
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report XIRR cost per portfolio.")
+    parser.add_argument("--portfolios", type=int, default=5000, help="cash-flow sets per batch")
+    parser.add_argument("--months", type=int, default=120, help="longest SIP in months")
+    parser.add_argument("--runs", type=int, default=5, help="timed repetitions")
+    args = parser.parse_args(argv)
+
+    portfolios = synthetic_portfolios(args.portfolios, args.months)
+    result = measure_xirr(portfolios, args.runs)
+    flows = sum(len(amounts) for _, amounts in portfolios)
+    print(f"{args.portfolios} portfolios, {flows} cash flows, {result['solved']} solved")
+    print(f"{'mode':<12} {'total ms':>10} {'µs/portfolio':>14}")
+    print(f"{'batch':<12} {result['batch_ms']:>10} {result['batch_us_per_portfolio']:>14}")
+    print(f"{'one-by-one':<12} {result['single_ms']:>10} {result['single_us_per_portfolio']:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+# benchmarks/startup.py
+"""
+Cold-start import benchmark for the DUNK.ai entry points.
+
+Each module is imported in a fresh interpreter, so nothing is shared
+between runs, and the median wall time is reported along with any heavy
+optional dependency that the import pulled in. Targets that this tree
+does not ship (the MCP server only exists under `src/`) are reported as
+unavailable.
+
+The loan-only target is checked against the loan router, which is what a
+loan-only API worker imports; the bare loan_clarity package is shown as
+the library import time.
+
+Usage:
+    python -m dunk_ai.benchmarks.startup [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Directory containing the `dunk_ai` package
+PACKAGE_ROOT = Path(__file__).resolve().parents[2]
+
+TARGETS = {
+    "fastapi (framework baseline)": "fastapi",
+    "loan_clarity tools": "dunk_ai.tools.loan_clarity",
+    "loan_clarity router": "dunk_ai.api.routes.loan_clarity",
+    "api": "dunk_ai.api.main",
+    "mcp_server": "dunk_ai.server.mcp_server",
+}
+LOAN_ONLY_MODULE = "dunk_ai.api.routes.loan_clarity"
+LOAN_LIBRARY_MODULE = "dunk_ai.tools.loan_clarity"
+LOAN_ONLY_TARGET_MS = 300.0
+
+# Dependencies that should only load when their subsystem is first used
+HEAVY_MODULES = (
+    "pandas", "matplotlib", "statsmodels", "yfinance", "sklearn", "joblib",
+    "langchain_core", "langchain_ollama", "httpx", "requests", "bs4",
+)
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+error, missing = None, False
+try:
+    __import__(sys.argv[1])
+except Exception as exc:
+    error = f"{type(exc).__name__}: {exc}"
+    # The target itself (or its package) is absent, not broken
+    name = getattr(exc, "name", None) or ""
+    missing = isinstance(exc, ModuleNotFoundError) and (sys.argv[1] + ".").startswith(name + ".")
+elapsed = (time.perf_counter() - start) * 1000
+heavy = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+print(json.dumps({"ms": elapsed, "error": error, "missing": missing, "heavy": heavy}))
+"""
+
+
+def measure_import(module: str, runs: int = 5) -> Dict[str, Any]:
+    """
+    Time a cold import of `module` in fresh interpreters.
+
+    Args:
+        module (str): Dotted module name
+        runs (int): Number of interpreters to start
+
+    Returns:
+        dict: Contains:
+            - median_ms / min_ms: Import wall time in milliseconds
+            - heavy: Heavy optional dependencies loaded by the import
+            - error: Import error of the last run, if any
+            - missing: Whether `module` is not available in this tree
+    """
+    if runs < 1:
+        raise ValueError("runs must be at least 1.")
+    env = {**os.environ, "PYTHONPATH": str(PACKAGE_ROOT)}
+    samples: List[Dict[str, Any]] = []
+    for _ in range(runs):
+        completed = subprocess.run(
+            [sys.executable, "-c", _PROBE, module, json.dumps(HEAVY_MODULES)],
+            capture_output=True, text=True, check=True,
+            env=env, cwd=PACKAGE_ROOT
+        )
+        samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+    times = [sample["ms"] for sample in samples]
+    return {
+        "median_ms": round(statistics.median(times), 1),
+        "min_ms": round(min(times), 1),
+        "heavy": samples[-1]["heavy"],
+        "error": samples[-1]["error"],
+        "missing": samples[-1]["missing"],
+    }
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Report cold-start import times.")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per module")
+    args = parser.parse_args(argv)
+
+    print(f"{'target':<30} {'median ms':>10} {'min ms':>8}  heavy dependencies")
+    results = {}
+    for label, module in TARGETS.items():
+        result = results[module] = measure_import(module, args.runs)
+        if result["missing"]:
+            print(f"{label:<30} {'unavailable':>10} {'-':>8}  not in this tree ({PACKAGE_ROOT})")
+            continue
+        detail = f"import failed: {result['error']}" if result["error"] else (", ".join(result["heavy"]) or "-")
+        print(f"{label:<30} {result['median_ms']:>10} {result['min_ms']:>8}  {detail}")
+
+    loan_only = results[LOAN_ONLY_MODULE]["median_ms"]
+    within = loan_only <= LOAN_ONLY_TARGET_MS
+    print(f"\nLoan-only worker cold start (loan router): {loan_only} ms "
+          f"({'within' if within else 'over'} the {LOAN_ONLY_TARGET_MS:.0f} ms target)")
+    print(f"Loan library import ({LOAN_LIBRARY_MODULE}): {results[LOAN_LIBRARY_MODULE]['median_ms']} ms")
+    return 0 if within else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
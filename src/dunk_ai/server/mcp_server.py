@@ -18,23 +18,30 @@ Available Tools:
 11. investment_get_stock_price - Live stock snapshot
 12. investment_get_stock_analytics - Technical analytics + forecast
 13. investment_get_mutual_fund_nav - Mutual fund NAV lookup
-14. investment_portfolio_summary - Placeholder holdings summary
+14. investment_portfolio_summary - Portfolio valuation, P&L, XIRR and drawdown
 15. investment_ai_insight - LLM-generated market insight
 16. expense_generate_plan - Personalized budgeting allocations
+17. loan_clarity_batch - Batch EMI calculation for many loans
+18. loan_clarity_scenario - Prepayment scenario simulator
+19. loan_clarity_sensitivity - EMI/interest/APR grid over rate × tenure × principal
+20. investment_get_stock_prices - Batched live prices for a watchlist
+21. investment_project_sip - Monte Carlo SIP/goal projection
 """
 
 import asyncio
 from datetime import datetime
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
 
 from mcp.server.fastmcp import FastMCP
 
 from dunk_ai.services.expense_manager import ExpensePlanner
 from dunk_ai.services.investment_ai import InvestmentAI
-from dunk_ai.tools.investment_navigator.investment import InvestmentNavigator
 from dunk_ai.tools.loan_clarity import (
     flat_rate,
     reducing_balance,
+    flat_rate_batch,
+    reducing_balance_batch,
     generate_amortization_schedule,
     calculate_prepayment_impact,
     calculate_early_settlement,
@@ -45,15 +52,28 @@ from dunk_ai.tools.loan_clarity import (
     calculate_loan_eligibility,
     calculate_effective_rate,
     calculate_affordability,
+    simulate_loan_scenario,
+    loan_sensitivity_grid,
+    sensitivity_grid_to_lists,
+    BATCH_REQUEST_MAX_ROWS,
+    SENSITIVITY_REQUEST_MAX_CELLS,
 )
 
 # Initialize MCP server
 mcp = FastMCP("dunk-mcp-server")
-navigator = InvestmentNavigator()
+# Both load their models on first use
 expense_planner = ExpensePlanner()
 investment_ai = InvestmentAI()
 
 
+@lru_cache(maxsize=None)
+def _navigator():
+    # The market-data stack is imported by the first investment tool call
+    from dunk_ai.tools.investment_navigator.investment import InvestmentNavigator
+
+    return InvestmentNavigator()
+
+
 # 1. Basic Loan Clarity Tool
 @mcp.tool()
 async def loan_clarity(
@@ -398,7 +418,7 @@ async def investment_get_stock_price(query: str) -> Dict[str, Any]:
     """
     Get the latest stock price snapshot using Investment Navigator.
     """
-    return navigator.get_stock_price(query)
+    return await _navigator().get_stock_price_async(query)
 
 
 # 12. Investment Navigator – Analytics
@@ -407,7 +427,7 @@ async def investment_get_stock_analytics(ticker: str) -> Dict[str, Any]:
     """
     Fetch full stock analytics (RSI, volatility, forecast, etc.).
     """
-    return navigator.get_stock_analytics(ticker)
+    return await _navigator().get_stock_analytics_async(ticker)
 
 
 # 13. Investment Navigator – Mutual Fund NAV
@@ -416,16 +436,16 @@ async def investment_get_mutual_fund_nav(scheme_name: str) -> Dict[str, Any]:
     """
     Fetch the latest NAV for a given mutual fund scheme.
     """
-    return navigator.get_mutual_fund_nav(scheme_name)
+    return await _navigator().get_mutual_fund_nav_async(scheme_name)
 
 
 # 14. Investment Navigator – Portfolio Summary
 @mcp.tool()
 async def investment_portfolio_summary(user_id: str) -> Dict[str, Any]:
     """
-    Return a placeholder portfolio summary for future DB integration.
+    Value a user's portfolio: P&L, allocation weights, XIRR and drawdown.
     """
-    return navigator.portfolio_summary(user_id)
+    return await _navigator().portfolio_summary_async(user_id)
 
 
 # 15. Investment AI Insight
@@ -468,5 +488,159 @@ async def expense_generate_plan(
     return result.to_dict()
 
 
+# 17. Batch EMI Calculator
+@mcp.tool()
+async def loan_clarity_batch(
+    principal: List[float],
+    annual_rate: List[float],
+    tenure_years: List[float],
+    repayment_frequency: str = "monthly",
+    interest_method: str = "reducing"
+) -> dict:
+    """
+    Calculate EMI, interest and totals for many loans in one call
+    (at most 50,000 loans).
+
+    Args:
+        principal (List[float]): Loan amounts
+        annual_rate (List[float]): Annual interest rates (%)
+        tenure_years (List[float]): Loan tenures in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually" (default: "monthly")
+        interest_method (str): "reducing" or "flat" (default: "reducing")
+
+    Returns:
+        dict: Lists of emi, total_interest, total_payment and number_of_payments
+    """
+    batch = flat_rate_batch if interest_method == "flat" else reducing_balance_batch
+    result = await asyncio.to_thread(
+        batch, principal, annual_rate, tenure_years, repayment_frequency, max_rows=BATCH_REQUEST_MAX_ROWS
+    )
+    return {key: values.tolist() for key, values in result.items()}
+
+
+# 18. Prepayment Scenario Simulator
+@mcp.tool()
+async def loan_clarity_scenario(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str = "monthly",
+    events: List[Dict[str, Any]] = None
+) -> dict:
+    """
+    Simulate a reducing balance loan under a plan of prepayments and changes.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually" (default: "monthly")
+        events (List[Dict]): Events applied after `period` payment periods, e.g.
+            {"type": "lump_sum", "period": 12, "amount": 100000, "every": 12},
+            {"type": "emi_change", "period": 12, "percent": 5, "every": 12},
+            {"type": "rate_change", "period": 24, "annual_rate": 9.5},
+            {"type": "holiday", "period": 6, "periods": 3}
+
+    Returns:
+        dict: Interest saved, tenure reduction and the per-segment balance path
+    """
+    return simulate_loan_scenario(
+        principal, annual_rate, tenure_years, repayment_frequency, events or []
+    )
+
+
+# 19. Sensitivity Grid
+@mcp.tool()
+async def loan_clarity_sensitivity(
+    annual_rates: List[float],
+    tenure_years: List[float],
+    principals: List[float],
+    repayment_frequency: str = "monthly",
+    interest_method: str = "reducing",
+    processing_fee_percent: float = 0.0,
+    other_charges: float = 0.0
+) -> dict:
+    """
+    Evaluate EMI, total interest and APR over every rate × tenure × principal combination
+    (at most 50,000 combinations).
+
+    Args:
+        annual_rates (List[float]): Annual interest rates (%) to try
+        tenure_years (List[float]): Loan tenures in years to try
+        principals (List[float]): Loan amounts to try
+        repayment_frequency (str): "monthly", "quarterly", or "annually" (default: "monthly")
+        interest_method (str): "reducing" or "flat" (default: "reducing")
+        processing_fee_percent (float): Processing fee as % of principal (default: 0)
+        other_charges (float): Other upfront charges (default: 0)
+
+    Returns:
+        dict: Axis values and nested emi/total_interest/total_payment/apr tables;
+            axes with a single value are dropped
+    """
+    # Large grids take a while to evaluate; keep the event loop free
+    grid = await asyncio.to_thread(
+        loan_sensitivity_grid,
+        annual_rates, tenure_years, principals, repayment_frequency,
+        interest_method, processing_fee_percent, other_charges,
+        parallel=False, max_cells=SENSITIVITY_REQUEST_MAX_CELLS
+    )
+    return sensitivity_grid_to_lists(grid, squeeze=True)
+
+
+# 20. Investment Navigator – Watchlist Prices
+@mcp.tool()
+async def investment_get_stock_prices(tickers: List[str]) -> Dict[str, Any]:
+    """
+    Get latest prices for several stocks with one batched download.
+
+    Args:
+        tickers (List[str]): Stock names or tickers, e.g. ["TCS", "Reliance", "INFY.NS"]
+
+    Returns:
+        dict: columns, rows (one per priced ticker), errors and last_updated
+    """
+    return await _navigator().get_stock_prices_async(tickers)
+
+
+# 21. Investment Navigator – SIP Projection
+@mcp.tool()
+async def investment_project_sip(
+    monthly_amount: float,
+    years: int,
+    ticker: Optional[str] = None,
+    scheme: Optional[str] = None,
+    annual_return_pct: Optional[float] = None,
+    annual_volatility_pct: Optional[float] = None,
+    goal: Optional[float] = None,
+    initial_amount: float = 0.0,
+    step_up_pct: float = 0.0,
+    seed: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Project a SIP with a Monte Carlo simulation (10,000 paths).
+
+    Args:
+        monthly_amount (float): SIP amount per month, e.g. 10000
+        years (int): Investment horizon in years, e.g. 15
+        ticker (str): Stock whose history gives return and volatility, e.g. "NIFTYBEES"
+        scheme (str): Or a mutual fund name/scheme code to take them from
+        annual_return_pct (float): Expected annual return in percent (overrides history)
+        annual_volatility_pct (float): Annual volatility in percent (overrides history)
+        goal (float): Target corpus, e.g. 5000000
+        initial_amount (float): Lump sum invested at the start (default: 0)
+        step_up_pct (float): Yearly SIP increase in percent (default: 0)
+        seed (int): Seed for reproducible results
+
+    Returns:
+        dict: Assumptions, final corpus percentiles, yearly bands, median XIRR
+            and the probability of reaching the goal
+    """
+    return await _navigator().project_sip_async(
+        monthly_amount, years, ticker=ticker, scheme=scheme,
+        annual_return_pct=annual_return_pct, annual_volatility_pct=annual_volatility_pct,
+        goal=goal, initial_amount=initial_amount, step_up_pct=step_up_pct, seed=seed
+    )
+
+
 if __name__ == "__main__":
     asyncio.run(mcp.run())
\ No newline at end of file
@@ -1,14 +1,35 @@
 # backend/ai_engine/investment_ai.py
 
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_ollama import OllamaLLM
+import threading
 
-from dunk_ai.tools.investment_navigator.investment import InvestmentNavigator
 
 class InvestmentAI:
     def __init__(self, model_name: str = "deepseek-r1:7b"):
-        self.model = OllamaLLM(model=model_name)
-        self.navigator = InvestmentNavigator()
+        # LangChain, the Ollama client and the navigator load on first use
+        self.model_name = model_name
+        self._model = None
+        self._navigator = None
+        self._lock = threading.Lock()
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    from langchain_ollama import OllamaLLM
+
+                    self._model = OllamaLLM(model=self.model_name)
+        return self._model
+
+    @property
+    def navigator(self):
+        if self._navigator is None:
+            with self._lock:
+                if self._navigator is None:
+                    from dunk_ai.tools.investment_navigator.investment import InvestmentNavigator
+
+                    self._navigator = InvestmentNavigator()
+        return self._navigator
 
     def generate_ai_insight(self, ticker: str):
         try:
@@ -17,6 +38,7 @@ class InvestmentAI:
 
             if "error" in analytics:
                 return {"error": analytics["error"]}
+            from langchain_core.prompts import ChatPromptTemplate
 
             # Create prompt template for the LLM
             prompt = ChatPromptTemplate.from_template("""
@@ -0,0 +1,212 @@
+# tools/investment_navigator/charts.py
+"""
+Forecast chart rendering for the Investment Navigator.
+
+- Charts are drawn only when a client asks for one (`/plot/{ticker}`), never
+  as part of analytics
+- Figures use Matplotlib's object-oriented Agg API, with no pyplot state or
+  global style, so renders are safe on worker threads
+- PNGs are content-addressed by symbol, data date and a digest of the
+  plotted values; an unchanged chart is served from disk
+- Renders run on a background executor; concurrent requests for the same
+  chart share one render
+"""
+
+import hashlib
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+PLOTS_DIR = Path(__file__).resolve().parents[4] / "assets" / "plots"
+CHART_WORKERS = 1
+CHART_WAIT = 20.0         # seconds a request waits for a render
+CHART_RETRY_AFTER = 5     # seconds a client should wait before asking again for a pending chart
+
+# Dark theme, applied per artist instead of via the global rcParams
+BACKGROUND = "black"
+FOREGROUND = "white"
+GRID = {"linestyle": "--", "alpha": 0.3, "color": "gray"}
+LEGEND = {"loc": "upper left", "fontsize": 9, "facecolor": "black", "edgecolor": "gray", "labelcolor": "white"}
+
+
+def _safe_symbol(symbol: str) -> str:
+    return re.sub(r"[^A-Za-z0-9.&\-]", "_", symbol.strip().upper())
+
+
+def chart_key(symbol: str, data_date: str, payload: Dict[str, Any]) -> str:
+    """File name of a chart: symbol, date of its last bar and a digest of the plotted values."""
+    digest = hashlib.sha1()
+    for name in sorted(payload):
+        value = payload[name]
+        digest.update(name.encode())
+        if isinstance(value, np.ndarray):
+            digest.update(np.ascontiguousarray(value).tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return f"{_safe_symbol(symbol)}_{data_date}_{digest.hexdigest()[:12]}.png"
+
+
+def _style_axes(ax) -> None:
+    ax.set_facecolor(BACKGROUND)
+    ax.tick_params(colors=FOREGROUND)
+    for spine in ax.spines.values():
+        spine.set_color(FOREGROUND)
+    ax.grid(True, **GRID)
+
+
+def render_forecast_chart(
+    path: Path,
+    symbol: str,
+    dates: np.ndarray,
+    closes: np.ndarray,
+    rsi: np.ndarray,
+    forecast: Optional[Sequence[float]] = None,
+    sma_20: Optional[float] = None,
+    sma_50: Optional[float] = None,
+    caption: str = ""
+) -> Path:
+    """
+    Draw the price/forecast and RSI panels of a symbol and save them as PNG.
+
+    Args:
+        path (Path): Output file
+        symbol (str): Ticker, used in the title
+        dates (np.ndarray): Bar dates (datetime64), oldest first
+        closes (np.ndarray): Closing prices
+        rsi (np.ndarray): RSI per bar
+        forecast (Sequence[float]): Forecast closes for the next business days
+        sma_20 (float): 20-day SMA, drawn as a reference line
+        sma_50 (float): 50-day SMA, drawn as a reference line
+        caption (str): Footer text
+
+    Returns:
+        Path: `path`
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    fig = Figure(figsize=(11, 8), facecolor=BACKGROUND)
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(2, 1, sharex=True, gridspec_kw={"height_ratios": [3, 1]})
+    fig.suptitle(f"{symbol} — Price Trend, Forecast & RSI", fontsize=15, fontweight="bold", color=FOREGROUND)
+
+    # --- Price chart (Top)
+    ax1.plot(dates, closes, color="cyan", linewidth=2, label="Historical Price")
+    ax1.plot(dates[-20:], closes[-20:], color="orange", linestyle="--", label="Recent 20-Day Trend")
+    if forecast:
+        forecast_dates = np.busday_offset(dates[-1], np.arange(1, len(forecast) + 1), roll="forward")
+        ax1.plot(forecast_dates, forecast, "--", color="lime", label=f"Forecast ({len(forecast)}D)")
+    if sma_20 is not None:
+        ax1.axhline(sma_20, color="deepskyblue", linestyle="--", linewidth=1, label="SMA-20")
+    if sma_50 is not None:
+        ax1.axhline(sma_50, color="violet", linestyle="--", linewidth=1, label="SMA-50")
+    ax1.set_ylabel("Price (₹)", color=FOREGROUND, fontsize=10)
+    _style_axes(ax1)
+    ax1.legend(**LEGEND)
+
+    # --- RSI chart (Bottom)
+    ax2.plot(dates, rsi, label="RSI (14D)", color="magenta", linewidth=1.5)
+    ax2.axhline(70, color="green", linestyle="--", linewidth=1, label="Overbought (70)")
+    ax2.axhline(30, color="red", linestyle="--", linewidth=1, label="Oversold (30)")
+    ax2.set_ylabel("RSI", color=FOREGROUND, fontsize=10)
+    ax2.set_xlabel("Date", color=FOREGROUND, fontsize=10)
+    _style_axes(ax2)
+    ax2.legend(**LEGEND)
+    for label in ax2.get_xticklabels():
+        label.set_rotation(45)
+
+    fig.tight_layout(rect=(0, 0.04, 1, 1) if caption else None)
+    if caption:
+        fig.text(0.5, 0.02, caption, ha="center", fontsize=9, color="lightgray", style="italic")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp.png")
+    fig.savefig(tmp_path, bbox_inches="tight", facecolor=BACKGROUND)
+    tmp_path.replace(path)
+    return path
+
+
+class ChartRenderer:
+    """
+    Content-addressed chart cache backed by a background render executor.
+
+    Only the newest chart of each symbol is kept on disk.
+    """
+
+    def __init__(self, root: Path = PLOTS_DIR, max_workers: int = CHART_WORKERS, wait: float = CHART_WAIT):
+        self._root = Path(root)
+        self._max_workers = max_workers
+        self._wait = wait
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight: Dict[Path, Future] = {}
+        self.stats = {"renders": 0, "hits": 0}
+
+    def get_chart(self, symbol: str, data_date: str, **plot_args) -> Dict[str, Any]:
+        """
+        Return the chart of a symbol, rendering it only if its inputs changed.
+
+        Args:
+            symbol (str): Ticker
+            data_date (str): Date of the last bar, e.g. "2025-01-10"
+            **plot_args: Values for `render_forecast_chart` (dates, closes,
+                rsi, forecast, sma_20, sma_50, caption)
+
+        Returns:
+            dict: Contains:
+                - status: "cached", "rendered", "pending" (still rendering
+                  after the wait) or "error"
+                - chart_path: PNG path, when available
+                - error: Reason, when status is "error"
+        """
+        path = self._root / chart_key(symbol, data_date, plot_args)
+        with self._lock:
+            if path.exists():
+                self.stats["hits"] += 1
+                return {"status": "cached", "chart_path": str(path)}
+            future = self._in_flight.get(path)
+            if future is None:
+                future = self._pool().submit(self._render, symbol, path, plot_args)
+                self._in_flight[path] = future
+
+        try:
+            future.result(timeout=self._wait)
+        except FutureTimeout:
+            return {"status": "pending"}
+        except Exception as e:
+            return {"status": "error", "error": str(e)}
+        return {"status": "rendered", "chart_path": str(path)}
+
+    def _render(self, symbol: str, path: Path, plot_args: Dict[str, Any]) -> Path:
+        try:
+            render_forecast_chart(path, symbol, **plot_args)
+            with self._lock:
+                self.stats["renders"] += 1
+            # Older charts of this symbol are superseded
+            own_chart = re.compile(re.escape(_safe_symbol(symbol)) + r"_\d{4}-\d{2}-\d{2}_[0-9a-f]{12}\.png")
+            for stale in path.parent.glob("*.png"):
+                if stale != path and own_chart.fullmatch(stale.name):
+                    stale.unlink(missing_ok=True)
+            return path
+        except Exception as e:
+            print(f"[charts] ⚠️ Chart render failed for {symbol}: {e}")
+            raise
+        finally:
+            with self._lock:
+                self._in_flight.pop(path, None)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="chart")
+        return self._executor
+
+
+# Shared by every navigator in the process
+chart_renderer = ChartRenderer()
@@ -0,0 +1,325 @@
+# tools/investment_navigator/forecasting.py
+"""
+ARIMA forecast service for the Investment Navigator.
+
+- Fitted parameters and forecasts are cached per symbol and trading day
+- A new day's fit is warm-started from the previous day's parameters
+- Fits run on a background worker pool; requests get the cached forecast
+  immediately together with its age, and only a symbol's very first
+  request waits (briefly) for a fit
+- Watchlist scans fan the fits out over one fixed-size process pool,
+  outside the GIL, with a per-fit timeout; concurrent scans share the
+  pool's slots instead of resizing it
+"""
+
+import multiprocessing
+import os
+import signal
+import threading
+import time
+import warnings
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+FORECAST_ORDER = (2, 1, 2)
+FORECAST_STEPS = 7
+MIN_FORECAST_BARS = 30    # need at least 1 month of data
+COLD_START_WAIT = 10.0    # seconds a symbol's first request waits for its fit
+FORECAST_WORKERS = 2
+FIT_TIMEOUT = 30.0        # seconds per fit in batch scans
+FIT_PROCESSES = os.cpu_count() or 1
+
+
+def fit_forecast(
+    closes: Sequence[float],
+    start_params: Optional[Sequence[float]] = None,
+    order: Tuple[int, int, int] = FORECAST_ORDER,
+    steps: int = FORECAST_STEPS
+) -> Dict[str, Any]:
+    """
+    Fit an ARIMA model to a close series and forecast ahead.
+
+    A failed warm start falls back to a cold fit. Module-level and
+    argument-only, so it can also run in a process pool.
+
+    Args:
+        closes (Sequence[float]): Closing prices, oldest first
+        start_params (Sequence[float]): Parameters to warm-start from
+        order (tuple): ARIMA (p, d, q) order
+        steps (int): Forecast horizon in bars
+
+    Returns:
+        dict: Contains:
+            - forecast: Forecast closes for the next `steps` bars
+            - params: Fitted parameters (for the next warm start)
+            - warm_start: Whether the warm start was used
+    """
+    from statsmodels.tsa.arima.model import ARIMA
+
+    series = np.asarray(closes, dtype=float)
+    series = series[~np.isnan(series)]
+    if len(series) <= MIN_FORECAST_BARS:
+        raise ValueError(f"At least {MIN_FORECAST_BARS + 1} closes are needed for a forecast.")
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        model = ARIMA(series, order=order)
+        fitted, warm = None, False
+        if start_params is not None:
+            try:
+                fitted, warm = model.fit(start_params=np.asarray(start_params, dtype=float)), True
+            except Exception:
+                fitted = None
+        if fitted is None:
+            fitted = model.fit()
+        forecast = fitted.forecast(steps=steps)
+
+    return {
+        "forecast": [round(float(value), 2) for value in forecast],
+        "params": [float(value) for value in fitted.params],
+        "warm_start": warm
+    }
+
+
+def _init_fit_worker() -> None:
+    """Import statsmodels once per worker, outside any fit's timeout."""
+    warnings.simplefilter("ignore")
+    from statsmodels.tsa.arima.model import ARIMA  # noqa: F401
+
+
+def _alarm(signum, frame):
+    raise TimeoutError("ARIMA fit timed out")
+
+
+def _fit_with_timeout(closes: np.ndarray, start_params, timeout: Optional[float]) -> Dict[str, Any]:
+    """Process-pool entry point: `fit_forecast` interrupted after `timeout` seconds where SIGALRM exists."""
+    use_alarm = timeout and hasattr(signal, "setitimer")
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        return fit_forecast(closes, start_params=start_params)
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+
+
+class ForecastService:
+    """
+    Per-symbol forecast cache refreshed by background fits.
+
+    Entries are keyed by the date of the last bar they were fitted on; a
+    request with newer bars returns the previous forecast marked stale and
+    schedules a warm-started refit.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = FORECAST_WORKERS,
+        cold_start_wait: float = COLD_START_WAIT,
+        fitter: Callable[..., Dict[str, Any]] = fit_forecast,
+        clock: Callable[[], float] = time.time,
+        processes: int = FIT_PROCESSES
+    ):
+        self._max_workers = max_workers
+        self._cold_start_wait = cold_start_wait
+        self._fitter = fitter
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._process_count = processes
+        # One slot per pool process, so a submitted fit starts right away
+        self._process_slots = threading.BoundedSemaphore(processes)
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._in_flight: Dict[str, Future] = {}
+        self.stats = {"fits": 0, "warm_starts": 0, "failures": 0}
+
+    def get_forecast(self, symbol: str, closes: Sequence[float], as_of: date) -> Dict[str, Any]:
+        """
+        Return the cached forecast for `symbol`, scheduling a refit if stale.
+
+        Args:
+            symbol (str): Ticker
+            closes (Sequence[float]): Closing prices up to `as_of`, oldest first
+            as_of (date): Date of the last bar in `closes`
+
+        Returns:
+            dict: Contains:
+                - status: "ready", "stale" (older day, refit scheduled),
+                  "pending" (first fit still running) or "error"
+                - forecast: Forecast closes, when available
+                - as_of: Date of the last bar the forecast was fitted on
+                - age_seconds: Seconds since that fit
+                - error: Reason, when status is "error"
+        """
+        symbol = symbol.strip().upper()
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and entry["as_of"] >= as_of:
+                return self._view(entry, "ready")
+            future = self._in_flight.get(symbol)
+            if future is None:
+                start_params = entry["params"] if entry is not None else None
+                future = self._pool().submit(self._refit, symbol, np.array(closes, dtype=float), as_of, start_params)
+                self._in_flight[symbol] = future
+
+        if entry is not None:
+            return self._view(entry, "stale")
+        try:
+            error = future.result(timeout=self._cold_start_wait)
+        except Exception:
+            return {"status": "pending"}
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is None:
+            return {"status": "error", "error": error or "Forecast failed"}
+        return self._view(entry, "ready")
+
+    def forecast_many(
+        self,
+        series: Dict[str, Tuple[Sequence[float], date]],
+        max_workers: Optional[int] = None,
+        timeout: float = FIT_TIMEOUT
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Forecast many symbols, fitting the stale ones across a process pool.
+
+        Symbols with a forecast for their latest bar are served from the
+        cache; the rest are warm-started from cached parameters where
+        available, and their results are cached.
+
+        Args:
+            series (Dict[str, tuple]): Symbol -> (closes, date of last bar)
+            max_workers (int): Fits this call keeps in flight (default and
+                cap: the pool's process count)
+            timeout (float): Seconds allowed per fit
+
+        Returns:
+            dict: Symbol -> forecast view as in `get_forecast` ("ready"), or
+                {"status": "error", "error": ...}
+        """
+        results: Dict[str, Dict[str, Any]] = {}
+        jobs = {}
+        with self._lock:
+            for symbol, (closes, as_of) in series.items():
+                entry = self._entries.get(symbol)
+                if entry is not None and entry["as_of"] >= as_of:
+                    results[symbol] = self._view(entry, "ready")
+                else:
+                    start_params = entry["params"] if entry is not None else None
+                    jobs[symbol] = (np.asarray(closes, dtype=float), as_of, start_params)
+        if not jobs:
+            return results
+
+        # Per-call concurrency is the number of fits this scan keeps in flight
+        workers = max(1, min(max_workers or self._process_count, self._process_count, len(jobs)))
+        queue = list(jobs)
+        running: Dict[Future, Tuple[str, float]] = {}
+        while queue or running:
+            # Wait for a free slot only when this scan has nothing in flight
+            while queue and len(running) < workers and self._process_slots.acquire(blocking=not running):
+                symbol = queue.pop(0)
+                closes, _, start_params = jobs[symbol]
+                try:
+                    future = self._process_pool().submit(_fit_with_timeout, closes, start_params, timeout)
+                except Exception:
+                    self._process_slots.release()
+                    raise
+                # The slot frees when the worker does, even for a fit this scan gave up on
+                future.add_done_callback(lambda _: self._process_slots.release())
+                # Safety net for platforms without SIGALRM
+                running[future] = (symbol, time.monotonic() + timeout + 5)
+
+            next_deadline = min(deadline for _, deadline in running.values())
+            done, _ = wait(running, timeout=max(0.0, next_deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            for future in done:
+                symbol, _ = running.pop(future)
+                _, as_of, _ = jobs[symbol]
+                try:
+                    fitted = future.result()
+                except BrokenProcessPool:
+                    self._reset_process_pool()
+                    results[symbol] = {"status": "error", "error": "Forecast worker crashed"}
+                    continue
+                except Exception as e:
+                    with self._lock:
+                        self.stats["failures"] += 1
+                    results[symbol] = {"status": "error", "error": str(e) or type(e).__name__}
+                    continue
+                results[symbol] = self._store(symbol, as_of, fitted)
+            now = time.monotonic()
+            for future, (symbol, deadline) in list(running.items()):
+                if deadline <= now:
+                    future.cancel()
+                    del running[future]
+                    results[symbol] = {"status": "error", "error": "ARIMA fit timed out"}
+        return results
+
+    def _store(self, symbol: str, as_of: date, fitted: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            self.stats["fits"] += 1
+            self.stats["warm_starts"] += int(fitted.get("warm_start", False))
+            current = self._entries.get(symbol)
+            if current is None or current["as_of"] <= as_of:
+                current = self._entries[symbol] = {
+                    "as_of": as_of,
+                    "forecast": fitted["forecast"],
+                    "params": fitted["params"],
+                    "fitted_at": self._clock()
+                }
+            return self._view(current, "ready")
+
+    def _refit(self, symbol: str, closes: np.ndarray, as_of: date, start_params) -> Optional[str]:
+        try:
+            fitted = self._fitter(closes, start_params=start_params)
+        except Exception as e:
+            with self._lock:
+                self.stats["failures"] += 1
+                self._in_flight.pop(symbol, None)
+            print(f"[forecast] ⚠️ ARIMA fit failed for {symbol}: {e}")
+            return str(e)
+
+        self._store(symbol, as_of, fitted)
+        with self._lock:
+            self._in_flight.pop(symbol, None)
+        return None
+
+    def _view(self, entry: Dict[str, Any], status: str) -> Dict[str, Any]:
+        return {
+            "status": status,
+            "forecast": list(entry["forecast"]),
+            "as_of": entry["as_of"].isoformat(),
+            "age_seconds": round(self._clock() - entry["fitted_at"], 1)
+        }
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="forecast")
+        return self._executor
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        """Long-lived fixed-size process pool, so workers import statsmodels only once."""
+        with self._lock:
+            if self._processes is None:
+                # Spawn rather than fork: the API process runs thread pools
+                self._processes = ProcessPoolExecutor(
+                    max_workers=self._process_count,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=_init_fit_worker
+                )
+            return self._processes
+
+    def _reset_process_pool(self) -> None:
+        with self._lock:
+            if self._processes is not None:
+                self._processes.shutdown(wait=False, cancel_futures=True)
+            self._processes = None
+
+
+# Shared by every navigator in the process
+forecast_service = ForecastService()
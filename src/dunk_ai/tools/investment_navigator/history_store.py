@@ -0,0 +1,234 @@
+# tools/investment_navigator/history_store.py
+"""
+On-disk OHLCV store for the Investment Navigator.
+
+- Daily bars are kept per symbol in a NumPy .npy file under `DUNK_DATA_DIR`
+  and memory-mapped on load, so restarts start warm
+- A refresh only downloads the bars from the last stored date on, i.e.
+  the last stored bar plus about one new bar per trading day
+- Bars are split-adjusted upstream, so a split or bonus issue re-bases the
+  whole history; if the re-downloaded last bar disagrees with the stored
+  one, the file is dropped and the full window downloaded again
+- Bars of the session still trading are served but not persisted
+- When the upstream is unreachable, stored bars are served as they are
+"""
+
+import os
+import re
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import numpy as np
+
+from dunk_ai.tools.investment_navigator.market_data import is_market_open, last_completed_session, market_ttl
+from dunk_ai.tools.investment_navigator.portfolio import PRIVATE_DATA_DIR
+
+STORE_DIR = PRIVATE_DATA_DIR / "ohlcv"
+BACKFILL_PERIOD = "2y"
+REBASE_TOLERANCE = 0.01   # relative close difference treated as a split/bonus adjustment
+
+OHLCV_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+BAR_DTYPE = np.dtype([("date", "<i8")] + [(column.lower(), "<f8") for column in OHLCV_COLUMNS])
+
+# Trailing windows served by `get_history`
+PERIODS = {
+    "5d": {"days": 5},
+    "1mo": {"months": 1},
+    "3mo": {"months": 3},
+    "6mo": {"months": 6},
+    "1y": {"years": 1},
+    "2y": {"years": 2},
+    "max": None,
+}
+
+
+def _yfinance_bars(symbol: str, start: Optional[date], period: str):
+    """Default upstream fetcher: bars from `start`, or the trailing `period`."""
+    import yfinance as yf
+
+    if start is not None:
+        return yf.Ticker(symbol).history(start=start.isoformat(), auto_adjust=False)
+    return yf.Ticker(symbol).history(period=period, auto_adjust=False)
+
+
+def frame_to_bars(frame) -> np.ndarray:
+    """Convert a daily OHLCV DataFrame to a BAR_DTYPE record array."""
+    if frame is None or frame.empty:
+        return np.zeros(0, dtype=BAR_DTYPE)
+    index = frame.index
+    if getattr(index, "tz", None) is not None:
+        index = index.tz_localize(None)
+    bars = np.zeros(len(frame), dtype=BAR_DTYPE)
+    bars["date"] = index.normalize().values.astype("datetime64[D]").astype(np.int64)
+    for column in OHLCV_COLUMNS:
+        values = frame[column].to_numpy(dtype=float) if column in frame.columns else np.full(len(frame), np.nan)
+        bars[column.lower()] = values
+    return bars[~np.isnan(bars["close"])]
+
+
+def bars_to_frame(bars: np.ndarray):
+    """Convert a BAR_DTYPE record array to a DataFrame indexed by date."""
+    import pandas as pd
+
+    index = pd.DatetimeIndex(bars["date"].astype("datetime64[D]"), name="Date")
+    return pd.DataFrame({column: np.asarray(bars[column.lower()]) for column in OHLCV_COLUMNS}, index=index)
+
+
+def _merge(stored: np.ndarray, new: np.ndarray) -> np.ndarray:
+    """Append bars, letting newer downloads replace stored bars of the same date."""
+    if len(new) == 0:
+        return stored
+    keep = stored[stored["date"] < new["date"].min()]
+    return np.concatenate([keep, new])
+
+
+def _rebased(stored: np.ndarray, new: np.ndarray) -> bool:
+    """Whether downloaded closes disagree with stored closes of the same dates."""
+    _, stored_at, new_at = np.intersect1d(stored["date"], new["date"], return_indices=True)
+    return not np.allclose(new["close"][new_at], stored["close"][stored_at], rtol=REBASE_TOLERANCE, atol=0)
+
+
+class OhlcvStore:
+    """
+    Thread-safe per-symbol daily bar store with incremental refresh.
+
+    Returned frames are copies and may be modified by callers.
+    """
+
+    def __init__(
+        self,
+        root: Path = STORE_DIR,
+        fetcher: Callable[[str, Optional[date], str], Any] = _yfinance_bars,
+        ttl: Callable[[str], float] = market_ttl,
+        clock: Callable[[], float] = time.monotonic,
+        now: Optional[Callable[[], datetime]] = None
+    ):
+        self._root = Path(root)
+        self._fetcher = fetcher
+        self._ttl = ttl
+        self._clock = clock
+        self._now = now
+        self._lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        # symbol -> (completed bars, live bars of the current session, next refresh time)
+        self._loaded: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        self.stats = {"fetches": 0, "bars_fetched": 0}
+
+    def path_for(self, symbol: str) -> Path:
+        return self._root / (re.sub(r"[^A-Za-z0-9.&\-]", "_", symbol) + ".npy")
+
+    def get_history(self, symbol: str, period: str = "1y"):
+        """
+        Return daily bars for `symbol` over a trailing `period`.
+
+        Stored bars are refreshed first if a session has closed since the
+        last stored date (or, while the market trades, at most once per
+        market TTL).
+
+        Args:
+            symbol (str): Yahoo ticker, e.g. "TCS.NS"
+            period (str): One of PERIODS ("5d", "1mo", ..., "2y", "max")
+
+        Returns:
+            pd.DataFrame: Open/High/Low/Close/Volume indexed by date; empty
+                if nothing is stored and the upstream is unreachable
+        """
+        if period not in PERIODS:
+            raise ValueError(f"period must be one of: {', '.join(PERIODS)}")
+        symbol = symbol.strip().upper()
+        bars = self._refresh(symbol)
+        return self._slice(bars_to_frame(bars), period)
+
+    def _refresh(self, symbol: str) -> np.ndarray:
+        with self._lock:
+            symbol_lock = self._symbol_locks.setdefault(symbol, threading.Lock())
+
+        with symbol_lock:
+            entry = self._loaded.get(symbol)
+            if entry is None:
+                stored, live = self._load(symbol), np.zeros(0, dtype=BAR_DTYPE)
+            else:
+                stored, live, next_refresh = entry
+                if self._clock() < next_refresh:
+                    return np.concatenate([stored, live])
+
+            now = self._now() if self._now else None
+            completed = last_completed_session(symbol, now)
+            last_stored = stored["date"][-1].astype("datetime64[D]").astype(date) if len(stored) else None
+            if last_stored is not None and last_stored >= completed and not is_market_open(symbol, now):
+                # Up to date and no session in progress: nothing to download
+                self._loaded[symbol] = (stored, np.zeros(0, dtype=BAR_DTYPE), self._clock() + self._ttl(symbol))
+                return stored
+
+            try:
+                # Re-download the last stored bar too, to notice a re-based history
+                fetched = frame_to_bars(self._fetcher(symbol, last_stored, BACKFILL_PERIOD))
+                if last_stored is not None and _rebased(stored, fetched):
+                    print(f"[history_store] ⚠️ {symbol} history was re-based upstream, downloading it again")
+                    first_stored = stored["date"][0].astype("datetime64[D]").astype(date)
+                    stored = np.zeros(0, dtype=BAR_DTYPE)
+                    self._discard(symbol)
+                    fetched = frame_to_bars(self._fetcher(symbol, first_stored, BACKFILL_PERIOD))
+            except Exception as e:
+                print(f"[history_store] ⚠️ Refresh failed for {symbol}, serving stored bars: {e}")
+                fetched = None
+
+            if fetched is not None:
+                self.stats["fetches"] += 1
+                self.stats["bars_fetched"] += len(fetched)
+                cutoff = np.datetime64(completed, "D").astype(np.int64)
+                done, live = fetched[fetched["date"] <= cutoff], fetched[fetched["date"] > cutoff]
+                if len(done):
+                    stored = _merge(stored, done)
+                    self._save(symbol, stored)
+            self._loaded[symbol] = (stored, live, self._clock() + self._ttl(symbol))
+            return np.concatenate([stored, live])
+
+    def _load(self, symbol: str) -> np.ndarray:
+        path = self.path_for(symbol)
+        if not path.exists():
+            return np.zeros(0, dtype=BAR_DTYPE)
+        try:
+            bars = np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            print(f"[history_store] ⚠️ Ignoring unreadable store file {path}: {e}")
+            return np.zeros(0, dtype=BAR_DTYPE)
+        return bars if bars.dtype == BAR_DTYPE else np.zeros(0, dtype=BAR_DTYPE)
+
+    def _discard(self, symbol: str) -> None:
+        try:
+            self.path_for(symbol).unlink(missing_ok=True)
+        except OSError as e:
+            print(f"[history_store] ⚠️ Could not remove stale bars for {symbol}: {e}")
+
+    def _save(self, symbol: str, bars: np.ndarray) -> None:
+        path = self.path_for(symbol)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "wb") as handle:
+                np.save(handle, np.ascontiguousarray(bars))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"[history_store] ⚠️ Could not persist bars for {symbol}: {e}")
+
+    @staticmethod
+    def _slice(frame, period: str):
+        import pandas as pd
+
+        window = PERIODS[period]
+        if frame.empty or window is None:
+            return frame
+        if "days" in window:
+            return frame.tail(window["days"])
+        # Anchored on the last bar, so a store that cannot refresh still
+        # serves full windows
+        cutoff = frame.index[-1] - pd.DateOffset(**window)
+        return frame.loc[frame.index > cutoff]
+
+
+# Shared by every navigator in the process
+history_store = OhlcvStore()
@@ -0,0 +1,171 @@
+# tools/investment_navigator/http_client.py
+"""
+Shared HTTP layer for Investment Navigator data sources.
+
+- One pooled, keep-alive httpx.AsyncClient per event loop
+- Per-host concurrency limits so one slow source cannot starve the rest
+- A persistent NSE cookie jar, primed from the homepage only when stale
+- A matching persistent requests.Session for the synchronous NSE path
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+BROWSER_HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+
+NSE_HOME_URL = "https://www.nseindia.com"
+NSE_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:118.0) Gecko/20100101 Firefox/118.0",
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Connection": "keep-alive",
+    "Accept-Encoding": "gzip, deflate, br",
+}
+NSE_COOKIE_TTL = 300.0  # seconds before the homepage cookies are re-primed
+
+HOST_CONCURRENCY = {
+    "www.nseindia.com": 2,
+    "www.google.com": 2,
+}
+DEFAULT_HOST_CONCURRENCY = 8
+
+POOL_LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30.0)
+DEFAULT_TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+
+
+class _LoopState:
+    """Client, host semaphores and NSE cookie state bound to one event loop."""
+
+    def __init__(self, client: httpx.AsyncClient):
+        self.client = client
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.nse_lock = asyncio.Lock()
+        self.nse_primed_at: Optional[float] = None
+
+
+class AsyncHttpClient:
+    """
+    Pooled async HTTP client shared by the navigator's async methods.
+
+    httpx clients and asyncio primitives are bound to the loop they are
+    created on, so state is kept per running loop and dropped with it.
+    """
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        host_concurrency: Optional[Dict[str, int]] = None,
+        timeout: httpx.Timeout = DEFAULT_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._transport = transport
+        self._host_concurrency = {**HOST_CONCURRENCY, **(host_concurrency or {})}
+        self._timeout = timeout
+        self._clock = clock
+        self._states: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopState]" = \
+            weakref.WeakKeyDictionary()
+
+    def _state(self) -> _LoopState:
+        loop = asyncio.get_running_loop()
+        state = self._states.get(loop)
+        if state is None or state.client.is_closed:
+            client = httpx.AsyncClient(
+                transport=self._transport,
+                limits=POOL_LIMITS,
+                timeout=self._timeout,
+                headers=BROWSER_HEADERS,
+                follow_redirects=True
+            )
+            state = self._states[loop] = _LoopState(client)
+        return state
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        """GET through the pooled client, within the host's concurrency limit."""
+        state = self._state()
+        host = urlsplit(url).hostname or ""
+        semaphore = state.semaphores.get(host)
+        if semaphore is None:
+            limit = self._host_concurrency.get(host, DEFAULT_HOST_CONCURRENCY)
+            semaphore = state.semaphores[host] = asyncio.Semaphore(limit)
+        async with semaphore:
+            return await state.client.get(url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs: Any) -> Any:
+        """GET and decode JSON, raising for HTTP errors."""
+        response = await self.get(url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def nse_get(self, url: str, referer: Optional[str] = None) -> httpx.Response:
+        """
+        GET an NSE API URL with session cookies.
+
+        The homepage is only fetched when the cookies are older than
+        NSE_COOKIE_TTL or NSE rejects them (401/403), in which case the
+        request is retried once with fresh cookies.
+        """
+        state = self._state()
+        headers = {**NSE_HEADERS, "Referer": referer or NSE_HOME_URL}
+        await self._prime_nse(state, force=False)
+        response = await self.get(url, headers=headers)
+        if response.status_code in (401, 403):
+            await self._prime_nse(state, force=True)
+            response = await self.get(url, headers=headers)
+        return response
+
+    async def _prime_nse(self, state: _LoopState, force: bool) -> None:
+        async with state.nse_lock:
+            fresh = state.nse_primed_at is not None and \
+                self._clock() - state.nse_primed_at < NSE_COOKIE_TTL
+            if fresh and not force:
+                return
+            await self.get(NSE_HOME_URL, headers=NSE_HEADERS)
+            state.nse_primed_at = self._clock()
+
+    async def aclose(self) -> None:
+        """Close the client bound to the running loop."""
+        loop = asyncio.get_running_loop()
+        state = self._states.pop(loop, None)
+        if state is not None:
+            await state.client.aclose()
+
+
+class NseSession:
+    """Persistent, thread-safe requests.Session for synchronous NSE calls."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        self._session.headers.update(NSE_HEADERS)
+        self._primed_at: Optional[float] = None
+
+    def get(self, url: str, referer: Optional[str] = None, timeout: float = 10) -> requests.Response:
+        """GET an NSE API URL, re-priming cookies only when stale or rejected."""
+        headers = {"Referer": referer or NSE_HOME_URL}
+        self._prime(force=False, timeout=timeout)
+        response = self._session.get(url, headers=headers, timeout=timeout)
+        if response.status_code in (401, 403):
+            self._prime(force=True, timeout=timeout)
+            response = self._session.get(url, headers=headers, timeout=timeout)
+        return response
+
+    def _prime(self, force: bool, timeout: float) -> None:
+        with self._lock:
+            fresh = self._primed_at is not None and self._clock() - self._primed_at < NSE_COOKIE_TTL
+            if fresh and not force:
+                return
+            self._session.get(NSE_HOME_URL, timeout=timeout)
+            self._primed_at = self._clock()
+
+
+# Process-wide instances used by InvestmentNavigator
+http_client = AsyncHttpClient()
+nse_session = NseSession()
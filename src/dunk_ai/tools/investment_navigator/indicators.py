@@ -0,0 +1,297 @@
+# tools/investment_navigator/indicators.py
+"""
+Technical indicator engine for the Investment Navigator.
+
+- Per-symbol rolling state updated one bar at a time: running sums for the
+  SMAs, Wilder-smoothed gains/losses for RSI, a sliding Welford variance for
+  volatility and monotonic queues for the 52-week high/low
+- Reads are constant-time snapshots of that state
+- A vectorized batch mode computing the same indicators for a whole
+  universe from a 2D close-price matrix
+"""
+
+import copy
+import math
+import threading
+import warnings
+from collections import deque
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+SMA_WINDOWS = (20, 50)
+RSI_PERIOD = 14
+VOLATILITY_WINDOW = 126   # daily returns, about six months
+TRADING_DAYS = 252
+HIGH_LOW_WINDOW = 252     # bars, about one year
+RETURN_PERIODS = {"one_week": 5, "one_month": 22, "three_month": 66}
+
+_CLOSE_HISTORY = max(max(SMA_WINDOWS) + 1, max(RETURN_PERIODS.values()))
+
+
+def _rsi(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+class IndicatorState:
+    """Rolling indicator state of one symbol; `push` is O(1) amortized."""
+
+    def __init__(self):
+        self.count = 0
+        self.last_date: Optional[np.datetime64] = None
+        self.closes: deque = deque(maxlen=_CLOSE_HISTORY)
+        self.sums = {window: 0.0 for window in SMA_WINDOWS}
+        # Wilder smoothing, seeded with the simple mean of the first deltas
+        self.deltas = 0
+        self.avg_gain = 0.0
+        self.avg_loss = 0.0
+        # Sliding Welford over the last VOLATILITY_WINDOW returns
+        self.returns: deque = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        # Monotonic queues of (bar number, close) for the high/low window
+        self.highs: deque = deque()
+        self.lows: deque = deque()
+
+    def push(self, close: float) -> None:
+        """Add the next bar's close."""
+        close = float(close)
+        previous = self.closes[-1] if self.closes else None
+        for window in SMA_WINDOWS:
+            self.sums[window] += close
+            if len(self.closes) >= window:
+                self.sums[window] -= self.closes[-window]
+        self.closes.append(close)
+
+        if previous is not None:
+            change = close - previous
+            self.deltas += 1
+            weight = min(self.deltas, RSI_PERIOD)
+            self.avg_gain += (max(change, 0.0) - self.avg_gain) / weight
+            self.avg_loss += (max(-change, 0.0) - self.avg_loss) / weight
+            self._add_return(change / previous if previous else 0.0)
+
+        index = self.count
+        while self.highs and self.highs[-1][1] <= close:
+            self.highs.pop()
+        while self.lows and self.lows[-1][1] >= close:
+            self.lows.pop()
+        self.highs.append((index, close))
+        self.lows.append((index, close))
+        oldest = index - HIGH_LOW_WINDOW + 1
+        if self.highs[0][0] < oldest:
+            self.highs.popleft()
+        if self.lows[0][0] < oldest:
+            self.lows.popleft()
+        self.count += 1
+
+    def _add_return(self, value: float) -> None:
+        if len(self.returns) == VOLATILITY_WINDOW:
+            dropped = self.returns.popleft()
+            size = len(self.returns)
+            if size == 0:
+                self.mean = self.m2 = 0.0
+            else:
+                delta = dropped - self.mean
+                self.mean -= delta / size
+                self.m2 -= delta * (dropped - self.mean)
+        self.returns.append(value)
+        delta = value - self.mean
+        self.mean += delta / len(self.returns)
+        self.m2 += delta * (value - self.mean)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current indicator values (None where there is not enough history); O(1)."""
+        closes = self.closes
+        if not closes:
+            return {"bars": 0}
+        current = closes[-1]
+
+        def trailing_return(period: int) -> Optional[float]:
+            if self.count <= period:
+                return None
+            base = closes[-period]
+            return (current - base) / base * 100
+
+        variance = max(self.m2, 0.0) / len(self.returns) if self.returns else None
+        return {
+            "bars": self.count,
+            "current_price": current,
+            "previous_close": closes[-2] if len(closes) > 1 else None,
+            **{f"sma_{window}": self.sums[window] / min(len(closes), window) for window in SMA_WINDOWS},
+            "rsi": _rsi(self.avg_gain, self.avg_loss) if self.deltas >= RSI_PERIOD else None,
+            "volatility_pct": math.sqrt(variance * TRADING_DAYS) * 100 if variance is not None else None,
+            **{f"{name}_return_pct": trailing_return(period) for name, period in RETURN_PERIODS.items()},
+            "high_52w": self.highs[0][1],
+            "low_52w": self.lows[0][1],
+        }
+
+
+class IndicatorEngine:
+    """
+    Thread-safe per-symbol indicator states fed with daily bars.
+
+    Only completed bars are committed to a symbol's state. A bar of the
+    session still trading is applied to a throwaway copy, so it can be
+    revised by later refreshes without corrupting the running state.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._states: Dict[str, IndicatorState] = {}
+
+    def update(
+        self,
+        symbol: str,
+        dates: Sequence,
+        closes: Sequence[float],
+        completed_through=None
+    ) -> Dict[str, Any]:
+        """
+        Feed bars and return the symbol's indicators.
+
+        Bars at or before the last committed date are skipped, so callers
+        can pass their whole history window on every call.
+
+        Args:
+            symbol (str): Ticker
+            dates (Sequence): Bar dates, ascending
+            closes (Sequence[float]): Closing prices
+            completed_through (date): Last completed session; later bars are
+                provisional (default: every bar is completed)
+
+        Returns:
+            dict: Indicator snapshot, as in `IndicatorState.snapshot`
+        """
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        closes = np.asarray(closes, dtype=float)
+        cutoff = np.datetime64(completed_through, "D") if completed_through is not None else None
+        symbol = symbol.strip().upper()
+
+        with self._lock:
+            state = self._states.setdefault(symbol, IndicatorState())
+            start = 0 if state.last_date is None else int(np.searchsorted(dates, state.last_date, side="right"))
+            end = len(dates) if cutoff is None else int(np.searchsorted(dates, cutoff, side="right"))
+            for close in closes[start:max(start, end)]:
+                if not math.isnan(close):
+                    state.push(close)
+            if end > start:
+                state.last_date = dates[end - 1]
+
+            provisional = [close for close in closes[max(start, end):] if not math.isnan(close)]
+            if not provisional:
+                return state.snapshot()
+            live = copy.deepcopy(state)
+        live.push(provisional[-1])
+        return live.snapshot()
+
+    def get(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """Committed indicators of a symbol, or None if it was never fed."""
+        with self._lock:
+            state = self._states.get(symbol.strip().upper())
+            return state.snapshot() if state is not None else None
+
+    def reset(self, symbol: Optional[str] = None) -> None:
+        """Drop the state of one symbol, or of every symbol."""
+        with self._lock:
+            if symbol is None:
+                self._states.clear()
+            else:
+                self._states.pop(symbol.strip().upper(), None)
+
+
+def forward_fill(values: np.ndarray) -> np.ndarray:
+    """Forward-fill NaNs along the last axis; leading NaNs stay NaN."""
+    valid = ~np.isnan(values)
+    index = np.where(valid, np.arange(values.shape[-1]), 0)
+    np.maximum.accumulate(index, axis=-1, out=index)
+    filled = np.take_along_axis(values, index, axis=-1)
+    return np.where(np.maximum.accumulate(valid, axis=-1), filled, np.nan)
+
+
+def _wilder_averages(closes: np.ndarray, record: bool = False):
+    """Wilder-smoothed gains/losses along the last axis (optionally every step)."""
+    deltas = np.diff(closes, axis=-1)
+    gains, losses = np.clip(deltas, 0, None), np.clip(-deltas, 0, None)
+    shape = closes.shape[:-1]
+    avg_gain, avg_loss, count = np.zeros(shape), np.zeros(shape), np.zeros(shape)
+    path = np.full(closes.shape, np.nan) if record else None
+
+    for step in range(deltas.shape[-1]):
+        valid = ~np.isnan(deltas[..., step])
+        count = count + valid
+        weight = np.minimum(np.maximum(count, 1), RSI_PERIOD)
+        avg_gain = np.where(valid, avg_gain + (gains[..., step] - avg_gain) / weight, avg_gain)
+        avg_loss = np.where(valid, avg_loss + (losses[..., step] - avg_loss) / weight, avg_loss)
+        if record:
+            path[..., step + 1] = np.where(count >= RSI_PERIOD, _rsi_array(avg_gain, avg_loss), np.nan)
+    return avg_gain, avg_loss, count, path
+
+
+def _rsi_array(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, np.where(avg_gain > 0, 100.0, 50.0), rsi)
+
+
+def rsi_series(closes: Sequence[float]) -> np.ndarray:
+    """
+    Wilder RSI after every bar of one close series (NaN until RSI_PERIOD deltas).
+
+    Args:
+        closes (Sequence[float]): Closing prices, oldest first
+
+    Returns:
+        np.ndarray: RSI per bar, same length as `closes`
+    """
+    return _wilder_averages(np.asarray(closes, dtype=float), record=True)[3]
+
+
+def compute_indicators(closes: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compute indicators for a universe of symbols in one vectorized pass.
+
+    Matches what an `IndicatorState` fed with each row would report.
+    Interior gaps are forward-filled; leading NaNs mark symbols with a
+    shorter history.
+
+    Args:
+        closes (np.ndarray): Close prices shaped (symbols, bars), oldest
+            bar first; a 1D array is treated as a single symbol
+
+    Returns:
+        dict: Arrays shaped (symbols,) keyed like `IndicatorState.snapshot`;
+            NaN where there is not enough history
+    """
+    closes = forward_fill(np.atleast_2d(np.asarray(closes, dtype=float)))
+    bars = (~np.isnan(closes)).sum(axis=-1)
+
+    # All-NaN slices (symbols with too little history) are expected
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        avg_gain, avg_loss, deltas, _ = _wilder_averages(closes)
+        returns = closes[:, 1:] / closes[:, :-1] - 1
+        result = {
+            "bars": bars,
+            "current_price": closes[:, -1],
+            "previous_close": np.where(bars > 1, closes[:, -2], np.nan) if closes.shape[1] > 1
+            else np.full(len(closes), np.nan),
+            **{f"sma_{window}": np.nanmean(closes[:, -window:], axis=1) for window in SMA_WINDOWS},
+            "rsi": np.where(deltas >= RSI_PERIOD, _rsi_array(avg_gain, avg_loss), np.nan),
+            "volatility_pct": np.nanstd(returns[:, -VOLATILITY_WINDOW:], axis=1) * math.sqrt(TRADING_DAYS) * 100,
+            "high_52w": np.nanmax(closes[:, -HIGH_LOW_WINDOW:], axis=1),
+            "low_52w": np.nanmin(closes[:, -HIGH_LOW_WINDOW:], axis=1),
+        }
+        for name, period in RETURN_PERIODS.items():
+            if closes.shape[1] >= period:
+                base = closes[:, -period]
+                result[f"{name}_return_pct"] = np.where(bars > period, (closes[:, -1] - base) / base * 100, np.nan)
+            else:
+                result[f"{name}_return_pct"] = np.full(len(closes), np.nan)
+    return result
+
+
+# Shared by every navigator in the process
+indicator_engine = IndicatorEngine()
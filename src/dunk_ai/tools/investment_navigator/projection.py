@@ -0,0 +1,183 @@
+# tools/investment_navigator/projection.py
+"""
+SIP and goal projections for the Investment Navigator.
+
+- Return and volatility are estimated from a price or NAV history
+- Monthly returns are simulated as lognormal draws from a seeded NumPy
+  Generator; the median path compounds at the estimated annual return
+- Paths are simulated in fixed-size chunks so memory stays bounded, and
+  only year-end values are kept; since chunks draw from one Generator in
+  order, results do not depend on the chunk size
+- Year-by-year percentile bands, the chance of reaching a goal amount and
+  the XIRR of the median outcome are reported
+"""
+
+import math
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from dunk_ai.tools.investment_navigator.returns import DAYS_PER_YEAR, xirr
+
+PROJECTION_PATHS = 10_000
+PROJECTION_CHUNK = 2_000   # paths simulated at once
+MAX_PROJECTION_PATHS = 100_000
+MAX_PROJECTION_YEARS = 50
+PERCENTILES = (5, 25, 50, 75, 95)
+
+ESTIMATE_YEARS = 10        # trailing history used for return and volatility
+MIN_ESTIMATE_YEARS = 1.0
+
+
+def estimate_parameters(dates: np.ndarray, closes: np.ndarray, years: float = ESTIMATE_YEARS) -> Dict[str, Any]:
+    """
+    Annual return and volatility of a price or NAV series.
+
+    The return is the CAGR over the trailing window; the volatility is the
+    standard deviation of log returns, annualized by the observed number of
+    prices per year (so it suits both trading-day and calendar-day series).
+
+    Args:
+        dates (np.ndarray): Price dates (datetime64[D]), oldest first
+        closes (np.ndarray): Prices
+        years (float): Trailing window to use, in years
+
+    Returns:
+        dict: annual_return, annual_volatility (fractions), history_start,
+            history_end and observations
+
+    Raises:
+        ValueError: If less than a year of prices is available
+    """
+    dates = np.asarray(dates, dtype="datetime64[D]")
+    closes = np.asarray(closes, dtype=float)
+    keep = np.isfinite(closes) & (closes > 0)
+    dates, closes = dates[keep], closes[keep]
+    if len(dates):
+        first = int(np.searchsorted(dates, dates[-1] - np.timedelta64(int(years * DAYS_PER_YEAR), "D")))
+        dates, closes = dates[first:], closes[first:]
+    span = (dates[-1] - dates[0]).astype(int) / DAYS_PER_YEAR if len(dates) else 0.0
+    if span < MIN_ESTIMATE_YEARS:
+        raise ValueError(f"At least {MIN_ESTIMATE_YEARS:g} year of price history is needed for a projection.")
+
+    log_returns = np.diff(np.log(closes))
+    return {
+        "annual_return": float((closes[-1] / closes[0]) ** (1 / span) - 1),
+        "annual_volatility": float(np.std(log_returns, ddof=1) * math.sqrt(len(log_returns) / span)),
+        "history_start": str(dates[0]),
+        "history_end": str(dates[-1]),
+        "observations": int(len(closes))
+    }
+
+
+def contribution_schedule(monthly_amount: float, months: int, step_up_pct: float = 0.0,
+                          initial_amount: float = 0.0) -> np.ndarray:
+    """Amount invested at the start of each month; the SIP steps up once a year."""
+    amounts = monthly_amount * (1 + step_up_pct / 100) ** (np.arange(months) // 12)
+    amounts[0] += initial_amount
+    return amounts
+
+
+def simulate_sip(
+    monthly_amount: float,
+    years: int,
+    annual_return: float,
+    annual_volatility: float,
+    initial_amount: float = 0.0,
+    step_up_pct: float = 0.0,
+    goal: Optional[float] = None,
+    paths: int = PROJECTION_PATHS,
+    seed: Optional[int] = None,
+    chunk_size: int = PROJECTION_CHUNK,
+    percentiles: Sequence[int] = PERCENTILES
+) -> Dict[str, Any]:
+    """
+    Monte Carlo projection of a SIP.
+
+    Each month's contribution is invested at the start of the month and
+    grows by that month's simulated return. With cumulative log returns L,
+    the value after month t is exp(L_t) * sum_{k<=t} c_k * exp(-L_{k-1}),
+    so a chunk of paths is valued with two cumulative sums.
+
+    Args:
+        monthly_amount (float): SIP amount per month
+        years (int): Investment horizon in years
+        annual_return (float): Expected annual return (0.12 = 12%)
+        annual_volatility (float): Annual volatility (0.18 = 18%)
+        initial_amount (float): Lump sum invested at the start
+        step_up_pct (float): Yearly SIP increase in percent
+        goal (float): Target corpus; its probability is reported
+        paths (int): Simulated paths
+        seed (int): Generator seed, for reproducible results
+        chunk_size (int): Paths simulated at once
+        percentiles (Sequence[int]): Percentiles reported per year
+
+    Returns:
+        dict: Contains:
+            - total_invested: Sum of all contributions
+            - final_value: Percentiles and mean of the final corpus
+            - bands: One row per year (invested and value percentiles)
+            - median_xirr_pct: XIRR of the contributions vs. the median corpus
+            - goal_probability_pct: Share of paths reaching `goal`, if given
+    """
+    if monthly_amount < 0 or initial_amount < 0 or monthly_amount + initial_amount <= 0:
+        raise ValueError("Monthly and initial amounts must be non-negative, and at least one positive.")
+    if not 1 <= years <= MAX_PROJECTION_YEARS:
+        raise ValueError(f"years must be between 1 and {MAX_PROJECTION_YEARS}.")
+    if not 1 <= paths <= MAX_PROJECTION_PATHS:
+        raise ValueError(f"paths must be between 1 and {MAX_PROJECTION_PATHS}.")
+    if annual_return <= -1 or annual_volatility < 0:
+        raise ValueError("Annual return must be above -100% and volatility non-negative.")
+    if goal is not None and goal <= 0:
+        raise ValueError("goal must be positive.")
+
+    months = int(years) * 12
+    contributions = contribution_schedule(monthly_amount, months, step_up_pct, initial_amount)
+    year_ends = np.arange(11, months, 12)
+    drift = math.log1p(annual_return) / 12
+    shock = annual_volatility / math.sqrt(12)
+
+    rng = np.random.default_rng(seed)
+    values = np.empty((paths, len(year_ends)))
+    for start in range(0, paths, chunk_size):
+        count = min(chunk_size, paths - start)
+        growth = rng.standard_normal((count, months))
+        growth *= shock
+        growth += drift
+        np.cumsum(growth, axis=1, out=growth)                      # L_1 .. L_M
+        weights = np.empty_like(growth)
+        weights[:, 0] = contributions[0]
+        np.exp(-growth[:, :-1], out=weights[:, 1:])                 # exp(-L_{k-1})
+        weights[:, 1:] *= contributions[1:]
+        np.cumsum(weights, axis=1, out=weights)
+        values[start:start + count] = np.exp(growth[:, year_ends]) * weights[:, year_ends]
+
+    invested = np.cumsum(contributions)[year_ends]
+    bands_table = np.percentile(values, percentiles, axis=0)
+    bands = [
+        {
+            "year": year + 1,
+            "invested": round(float(invested[year]), 2),
+            **{f"p{p}": round(float(bands_table[row, year]), 2) for row, p in enumerate(percentiles)}
+        }
+        for year in range(len(year_ends))
+    ]
+
+    final = values[:, -1]
+    median = float(np.median(final))
+    flow_years = np.append(np.arange(months) - months, 0) / 12
+    median_xirr = xirr(np.append(-contributions, median)[None, :], flow_years)[0]
+
+    result = {
+        "total_invested": round(float(invested[-1]), 2),
+        "final_value": {
+            **{f"p{p}": round(float(value), 2) for p, value in zip(percentiles, bands_table[:, -1])},
+            "mean": round(float(final.mean()), 2)
+        },
+        "median_xirr_pct": round(float(median_xirr) * 100, 2) if np.isfinite(median_xirr) else None,
+        "bands": bands
+    }
+    if goal is not None:
+        result["goal"] = goal
+        result["goal_probability_pct"] = round(float(np.count_nonzero(final >= goal)) / paths * 100, 2)
+    return result
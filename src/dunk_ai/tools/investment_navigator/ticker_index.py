@@ -0,0 +1,240 @@
+# tools/investment_navigator/ticker_index.py
+"""
+Local ticker-resolution index for the Investment Navigator.
+
+- A seed table of common NSE names (nse_tickers.csv) plus symbols learned
+  from network searches, persisted to a JSON file and loaded once
+- Exact lookups by symbol, normalized name or alias answer without network
+  access; a process-wide LRU sits in front of them
+- Unique-prefix and trigram matches (for misspellings) are only a fallback
+  for names the network search does not know: distinct listed companies
+  share prefixes and trigrams ("Bank of India" vs "State Bank of India")
+- Learned aliases are user queries, so they are stored under
+  `DUNK_DATA_DIR`, not the publicly served `assets/`
+"""
+
+import bisect
+import csv
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+from dunk_ai.tools.investment_navigator.portfolio import PRIVATE_DATA_DIR
+
+SEED_PATH = Path(__file__).resolve().with_name("nse_tickers.csv")
+STORE_PATH = PRIVATE_DATA_DIR / "ticker_index.json"
+
+LRU_SIZE = 1024
+MIN_PREFIX_LENGTH = 3
+TRIGRAM_THRESHOLD = 0.55  # Dice similarity needed for a fuzzy match
+
+# Already a listed symbol, e.g. "TCS.NS" or "BAJAJ-AUTO.BO"
+_SYMBOL_PATTERN = re.compile(r"[A-Za-z0-9&\-]+\.(NS|BO)", re.IGNORECASE)
+_CORPORATE_WORDS = {"the", "ltd", "limited", "inc", "co", "company", "corp", "corporation"}
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case a company name and drop punctuation and spaces ("Larsen & Toubro" -> "larsenandtoubro")."""
+    words = re.findall(r"[a-z0-9]+", name.lower().replace("&", " and "))
+    return "".join(words)
+
+
+def _keys_for(name: str) -> Set[str]:
+    """Lookup keys for a name: as written, and without corporate suffixes."""
+    words = re.findall(r"[a-z0-9]+", name.lower().replace("&", " and "))
+    keys = {"".join(words), "".join(word for word in words if word not in _CORPORATE_WORDS)}
+    keys.discard("")
+    return keys
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"  {key} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+class TickerIndex:
+    """
+    Thread-safe name -> symbol index with fuzzy lookup and write-back.
+
+    Seed entries are read-only; entries added at runtime are persisted to
+    `store_path` so they survive restarts.
+    """
+
+    def __init__(
+        self,
+        seed_path: Optional[Path] = SEED_PATH,
+        store_path: Optional[Path] = STORE_PATH,
+        lru_size: int = LRU_SIZE
+    ):
+        self._store_path = Path(store_path) if store_path else None
+        self._lru_size = lru_size
+        self._lock = threading.RLock()
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._names: Dict[str, str] = {}
+        self._learned: Dict[str, Dict[str, object]] = {}
+        self._by_key: Dict[str, str] = {}
+        self._sorted_keys: List[str] = []
+        self._by_trigram: Dict[str, Set[str]] = {}
+
+        if seed_path and Path(seed_path).exists():
+            with open(seed_path, newline="", encoding="utf-8") as handle:
+                for row in csv.DictReader(handle):
+                    aliases = [alias for alias in (row.get("aliases") or "").split("|") if alias]
+                    self._index(row["symbol"], row["name"], aliases)
+        if self._store_path and self._store_path.exists():
+            try:
+                learned = json.loads(self._store_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                learned = {}
+            for symbol, entry in learned.items():
+                self._index(symbol, entry.get("name", ""), entry.get("aliases", []))
+            self._learned.update(learned)
+        self._sorted_keys = sorted(self._by_key)
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def resolve(self, query: str) -> Optional[str]:
+        """
+        Resolve a symbol, or an exactly known name or alias, without network access.
+
+        Args:
+            query (str): Company name, alias or symbol
+
+        Returns:
+            str | None: Symbol such as "TCS.NS", or None if nothing matches exactly
+        """
+        query = query.strip()
+        if _SYMBOL_PATTERN.fullmatch(query):
+            return query.upper()
+        key = normalize_name(query)
+        if not key:
+            return None
+
+        with self._lock:
+            symbol = self._lru.get(key)
+            if symbol is not None:
+                self._lru.move_to_end(key)
+                return symbol
+
+            # As written, then without corporate suffixes ("... Ltd")
+            symbol = self._by_key.get(key) or next(
+                (self._by_key[alt] for alt in _keys_for(query) if alt in self._by_key), None
+            )
+            if symbol is not None:
+                self._lru[key] = symbol
+                if len(self._lru) > self._lru_size:
+                    self._lru.popitem(last=False)
+            return symbol
+
+    def match(self, query: str) -> Optional[str]:
+        """
+        Closest indexed symbol by unique prefix or trigram similarity.
+
+        Only meant as a fallback once the network search has missed: it
+        tolerates typos, but can also pick a different company with a
+        similar name. Matches are not cached.
+
+        Args:
+            query (str): Company name or alias
+
+        Returns:
+            str | None: Symbol, or None if the match is missing or ambiguous
+        """
+        key = normalize_name(query)
+        if not key:
+            return None
+        with self._lock:
+            symbol = self.resolve(query)
+            if symbol is not None:
+                return symbol
+            prefixed = self._prefix_symbols(key)
+            if len(prefixed) > 1:
+                # An ambiguous prefix ("tata", "hdfc") is not a typo
+                return None
+            return prefixed.pop() if prefixed else self._match_trigram(key)
+
+    def add(self, symbol: str, name: str, aliases: Iterable[str] = ()) -> None:
+        """
+        Add or extend an entry (e.g. from a network search) and persist it.
+
+        Args:
+            symbol (str): Listed symbol, e.g. "TCS.NS"
+            name (str): Company name
+            aliases (Iterable[str]): Extra names that should resolve to `symbol`
+        """
+        symbol = symbol.strip().upper()
+        aliases = [alias for alias in aliases if alias and alias.strip()]
+        with self._lock:
+            entry = self._learned.setdefault(symbol, {"name": name or symbol, "aliases": []})
+            entry["aliases"] = sorted(set(entry["aliases"]) | set(aliases))
+            self._index(symbol, name, aliases)
+            # Existing keys are never remapped, so cached exact answers stay valid
+            self._sorted_keys = sorted(self._by_key)
+            self._save()
+
+    def _index(self, symbol: str, name: str, aliases: Iterable[str]) -> None:
+        symbol = symbol.strip().upper()
+        self._names.setdefault(symbol, name or symbol)
+        keys = _keys_for(symbol.rsplit(".", 1)[0])
+        for text in (name, *aliases):
+            if text:
+                keys |= _keys_for(text)
+        for key in keys:
+            # Seed and earlier entries keep their keys
+            if self._by_key.setdefault(key, symbol) == symbol:
+                for trigram in _trigrams(key):
+                    self._by_trigram.setdefault(trigram, set()).add(key)
+
+    def _prefix_symbols(self, key: str) -> Set[str]:
+        """Symbols of the keys starting with `key` (stops once two are found)."""
+        symbols = set()
+        if len(key) < MIN_PREFIX_LENGTH:
+            return symbols
+        start = bisect.bisect_left(self._sorted_keys, key)
+        for candidate in self._sorted_keys[start:]:
+            if not candidate.startswith(key) or len(symbols) > 1:
+                break
+            symbols.add(self._by_key[candidate])
+        return symbols
+
+    def _match_trigram(self, key: str) -> Optional[str]:
+        """Symbol of the closest key by trigram Dice similarity, above TRIGRAM_THRESHOLD."""
+        if len(key) < MIN_PREFIX_LENGTH:
+            return None
+        grams = _trigrams(key)
+        overlap: Dict[str, int] = {}
+        for trigram in grams:
+            for candidate in self._by_trigram.get(trigram, ()):
+                overlap[candidate] = overlap.get(candidate, 0) + 1
+
+        best_score, best_symbols = 0.0, set()
+        for candidate, shared in overlap.items():
+            score = 2 * shared / (len(grams) + len(_trigrams(candidate)))
+            if score > best_score:
+                best_score, best_symbols = score, {self._by_key[candidate]}
+            elif score == best_score:
+                best_symbols.add(self._by_key[candidate])
+        # Ties between different symbols are left to the network search
+        if best_score < TRIGRAM_THRESHOLD or len(best_symbols) != 1:
+            return None
+        return best_symbols.pop()
+
+    def _save(self) -> None:
+        if self._store_path is None:
+            return
+        try:
+            self._store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self._store_path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(self._learned, indent=2, sort_keys=True), encoding="utf-8")
+            os.replace(tmp_path, self._store_path)
+        except OSError as e:
+            print(f"[ticker_index] ⚠️ Could not persist ticker index: {e}")
+
+
+# Loaded once per process and shared by every navigator
+ticker_index = TickerIndex()
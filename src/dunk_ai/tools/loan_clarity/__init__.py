@@ -5,6 +5,8 @@ Comprehensive loan calculation and analysis tool with:
 - EMI calculations (flat rate and reducing balance)
 - Amortization schedules
 - Prepayment and early settlement analysis
+- Prepayment scenario simulation (lump sums, step-ups, rate resets, holidays)
+- Sensitivity grids over rate × tenure × principal
 - Loan comparison
 - Tax benefits calculator (India-specific)
 - Loan eligibility calculator
@@ -15,20 +17,57 @@ Comprehensive loan calculation and analysis tool with:
 from .logic import (
     flat_rate,
     reducing_balance,
+    flat_rate_batch,
+    reducing_balance_batch,
+    BATCH_REQUEST_MAX_ROWS,
     calculate_prepayment_impact,
     calculate_early_settlement,
     modify_emi,
     modify_tenure,
-    get_periods_per_year
+    get_periods_per_year,
+    get_loan_terms,
+    LoanTerms
 )
 
 # Schedule generation
 from .schedule import (
     generate_amortization_schedule,
+    generate_amortization_columns,
+    iter_amortization_columns,
+    iter_amortization_schedule,
+    extend_year_wise_summary,
+    schedule_columns_to_rows,
+    schedule_columns_to_lists,
     get_outstanding_principal,
     get_year_wise_summary
 )
 
+# Payment dates
+from .dates import (
+    generate_payment_dates,
+    payment_months,
+    payment_years
+)
+
+# Schedule aggregation
+from .aggregation import (
+    aggregate_loan_years,
+    aggregate_schedule,
+    fiscal_years,
+    format_fiscal_year
+)
+
+# Prepayment scenarios
+from .scenario import simulate_loan_scenario
+
+# Sensitivity grid
+from .sensitivity import (
+    SENSITIVITY_REQUEST_MAX_AXIS,
+    SENSITIVITY_REQUEST_MAX_CELLS,
+    loan_sensitivity_grid,
+    sensitivity_grid_to_lists
+)
+
 # Loan comparison
 from .comparison import (
     compare_loans,
@@ -50,7 +89,11 @@ from .eligibility import (
 # Effective rate
 from .effective_rate import (
     calculate_effective_rate,
-    calculate_apr
+    calculate_apr,
+    effective_rate_from_terms,
+    apr_from_terms,
+    solve_periodic_irr,
+    solve_periodic_irr_batch
 )
 
 # Validations
@@ -64,14 +107,21 @@ from .validations import (
     validate_prepayment_amount,
     validate_income,
     validate_tax_slab,
-    validate_loan_type
+    validate_loan_type,
+    validate_loan_columns,
+    validate_scenario_events
 )
 
 __all__ = [
     # Core calculations
     "flat_rate",
     "reducing_balance",
+    "flat_rate_batch",
+    "reducing_balance_batch",
+    "BATCH_REQUEST_MAX_ROWS",
     "get_periods_per_year",
+    "get_loan_terms",
+    "LoanTerms",
     # Prepayment and settlement
     "calculate_prepayment_impact",
     "calculate_early_settlement",
@@ -80,8 +130,30 @@ __all__ = [
     "modify_tenure",
     # Schedule
     "generate_amortization_schedule",
+    "generate_amortization_columns",
+    "iter_amortization_columns",
+    "iter_amortization_schedule",
+    "extend_year_wise_summary",
+    "schedule_columns_to_rows",
+    "schedule_columns_to_lists",
     "get_outstanding_principal",
     "get_year_wise_summary",
+    # Payment dates
+    "generate_payment_dates",
+    "payment_months",
+    "payment_years",
+    # Schedule aggregation
+    "aggregate_loan_years",
+    "aggregate_schedule",
+    "fiscal_years",
+    "format_fiscal_year",
+    # Prepayment scenarios
+    "simulate_loan_scenario",
+    # Sensitivity grid
+    "loan_sensitivity_grid",
+    "sensitivity_grid_to_lists",
+    "SENSITIVITY_REQUEST_MAX_AXIS",
+    "SENSITIVITY_REQUEST_MAX_CELLS",
     # Comparison
     "compare_loans",
     "break_even_analysis",
@@ -94,6 +166,10 @@ __all__ = [
     # Effective rate
     "calculate_effective_rate",
     "calculate_apr",
+    "effective_rate_from_terms",
+    "apr_from_terms",
+    "solve_periodic_irr",
+    "solve_periodic_irr_batch",
     # Validations
     "validate_principal",
     "validate_interest_rate",
@@ -105,4 +181,6 @@ __all__ = [
     "validate_income",
     "validate_tax_slab",
     "validate_loan_type",
+    "validate_loan_columns",
+    "validate_scenario_events",
 ]
\ No newline at end of file
@@ -4,12 +4,17 @@ Loan Clarity Tool – Loan Comparison Module
 This module provides functionality to compare multiple loan options:
 - Side-by-side comparison of loan offers
 - Total cost analysis
+- True APR of every offer, solved together
 - Best option recommendation
 - Break-even analysis
 """
 
 from typing import List, Dict, Any
-from .logic import reducing_balance, flat_rate
+
+import numpy as np
+
+from .logic import get_loan_terms
+from .effective_rate import effective_rate_from_terms, solve_periodic_irr_batch
 
 
 def compare_loans(loan_options: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -34,6 +39,7 @@ def compare_loans(loan_options: List[Dict[str, Any]]) -> Dict[str, Any]:
             - summary: Summary statistics
     """
     comparisons = []
+    offer_terms = []
     
     for idx, loan in enumerate(loan_options):
         principal = loan["principal"]
@@ -46,25 +52,16 @@ def compare_loans(loan_options: List[Dict[str, Any]]) -> Dict[str, Any]:
         loan_name = loan.get("loan_name", f"Loan {idx + 1}")
 
         # Calculate loan details
-        if interest_method == "flat":
-            emi, total_interest, total_payment, num_payments = flat_rate(
-                principal, annual_rate, tenure_years, repayment_frequency
-            )
-        else:
-            emi, total_interest, total_payment, num_payments = reducing_balance(
-                principal, annual_rate, tenure_years, repayment_frequency
-            )
+        terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+        emi, total_interest, total_payment, num_payments = terms.as_tuple()
 
         # Calculate effective cost
         total_cost = total_payment + processing_fee + other_charges
         effective_cost = total_cost - principal
 
         # Calculate effective interest rate (including charges)
-        from .effective_rate import calculate_effective_rate
-        effective_rate = calculate_effective_rate(
-            principal, annual_rate, tenure_years, repayment_frequency,
-            processing_fee, other_charges, interest_method
-        )
+        effective_rate = effective_rate_from_terms(terms, processing_fee, other_charges)
+        offer_terms.append((terms, principal - processing_fee - other_charges))
 
         comparisons.append({
             "loan_name": loan_name,
@@ -82,6 +79,17 @@ def compare_loans(loan_options: List[Dict[str, Any]]) -> Dict[str, Any]:
             "number_of_payments": num_payments
         })
 
+    # True APR for the whole offer set in one vectorized IRR solve
+    periodic_irr = solve_periodic_irr_batch(
+        [net for _, net in offer_terms],
+        [terms.emi for terms, _ in offer_terms],
+        [terms.number_of_payments for terms, _ in offer_terms],
+        [terms.periodic_rate for terms, _ in offer_terms]
+    )
+    for comparison, (terms, _), irr in zip(comparisons, offer_terms, periodic_irr.tolist()):
+        apr = terms.annual_rate if np.isnan(irr) else irr * terms.periods_per_year * 100
+        comparison["apr"] = round(apr, 2)
+
     # Find best option (lowest total cost)
     best_idx = min(range(len(comparisons)), key=lambda i: comparisons[i]["total_cost"])
     best_option = comparisons[best_idx]
@@ -130,27 +138,17 @@ def break_even_analysis(
         dict: Break-even analysis results
     """
     # Calculate EMIs
-    if loan1.get("interest_method", "reducing") == "flat":
-        emi1, _, total1, _ = flat_rate(
-            loan1["principal"], loan1["annual_rate"],
-            loan1["tenure_years"], loan1.get("repayment_frequency", "monthly")
-        )
-    else:
-        emi1, _, total1, _ = reducing_balance(
-            loan1["principal"], loan1["annual_rate"],
-            loan1["tenure_years"], loan1.get("repayment_frequency", "monthly")
-        )
-
-    if loan2.get("interest_method", "reducing") == "flat":
-        emi2, _, total2, _ = flat_rate(
-            loan2["principal"], loan2["annual_rate"],
-            loan2["tenure_years"], loan2.get("repayment_frequency", "monthly")
-        )
-    else:
-        emi2, _, total2, _ = reducing_balance(
-            loan2["principal"], loan2["annual_rate"],
-            loan2["tenure_years"], loan2.get("repayment_frequency", "monthly")
-        )
+    emi1, _, total1, _ = get_loan_terms(
+        loan1["principal"], loan1["annual_rate"],
+        loan1["tenure_years"], loan1.get("repayment_frequency", "monthly"),
+        loan1.get("interest_method", "reducing")
+    ).as_tuple()
+
+    emi2, _, total2, _ = get_loan_terms(
+        loan2["principal"], loan2["annual_rate"],
+        loan2["tenure_years"], loan2.get("repayment_frequency", "monthly"),
+        loan2.get("interest_method", "reducing")
+    ).as_tuple()
 
     # Add charges
     total1 += loan1.get("processing_fee", 0) + loan1.get("other_charges", 0)
@@ -4,62 +4,210 @@ Loan Clarity Tool – Effective Interest Rate Calculator
 This module calculates:
 - Effective interest rate including processing fees and other charges
 - True cost of borrowing
-- APR (Annual Percentage Rate) equivalent
+- APR (Annual Percentage Rate) as the IRR of the net disbursement
+  against the EMI stream, with a vectorized solver for offer sets
 """
 
 from typing import Dict, Any
-from .logic import reducing_balance, flat_rate, get_periods_per_year
-import math
 
+import numpy as np
 
-def calculate_effective_rate(
-    principal: float,
-    annual_rate: float,
-    tenure_years: float,
-    repayment_frequency: str = "monthly",
+from .logic import LoanTerms, get_loan_terms
+
+# Bracket for the periodic IRR; the annuity factor is monotonic on it
+IRR_LOWER_BOUND = -0.5
+IRR_UPPER_BOUND = 1.0
+
+
+def _annuity_factor(rate: np.ndarray, number_of_payments: np.ndarray):
+    """
+    Present value of 1 paid per period, and its derivative with respect to rate.
+
+    a(i) = (1 - (1+i)^-n) / i,  a'(i) = (n (1+i)^-(n+1) - a(i)) / i
+    Both use their analytic limits n and -n(n+1)/2 as i approaches 0.
+    """
+    near_zero = np.abs(rate) < 1e-9
+    safe_rate = np.where(near_zero, 1.0, rate)
+    discount = (1 + safe_rate) ** -number_of_payments
+    factor = (1 - discount) / safe_rate
+    derivative = (number_of_payments * discount / (1 + safe_rate) - factor) / safe_rate
+    factor = np.where(near_zero, number_of_payments, factor)
+    derivative = np.where(near_zero, -number_of_payments * (number_of_payments + 1) / 2.0, derivative)
+    return factor, derivative
+
+
+def solve_periodic_irr_batch(
+    net_disbursement,
+    payment,
+    number_of_payments,
+    guess=None,
+    tolerance: float = 1e-10,
+    max_iterations: int = 50
+) -> np.ndarray:
+    """
+    Solve the periodic IRR of many level-payment loans at once.
+
+    Finds i such that net_disbursement = payment * a(i) using Newton steps
+    on the analytic annuity derivative, warm-started from `guess`. Loans
+    that do not converge fall back to bisection on a fixed bracket.
+
+    Args:
+        net_disbursement (array-like): Amount actually received per loan
+        payment (array-like): Level payment (EMI) per loan
+        number_of_payments (array-like): Number of payments per loan
+        guess (array-like): Starting periodic rates, e.g. the nominal rates
+        tolerance (float): Convergence tolerance on the rate
+        max_iterations (int): Newton iterations before falling back
+
+    Returns:
+        np.ndarray: Periodic IRR per loan (NaN where no IRR exists)
+    """
+    net_disbursement = np.atleast_1d(np.asarray(net_disbursement, dtype=float))
+    payment = np.atleast_1d(np.asarray(payment, dtype=float))
+    number_of_payments = np.atleast_1d(np.asarray(number_of_payments, dtype=float))
+    net_disbursement, payment, number_of_payments = np.broadcast_arrays(
+        net_disbursement, payment, number_of_payments
+    )
+    if guess is None:
+        rate = np.full(net_disbursement.shape, 0.01)
+    else:
+        rate = np.broadcast_to(np.asarray(guess, dtype=float), net_disbursement.shape).copy()
+    rate = np.clip(rate, IRR_LOWER_BOUND, IRR_UPPER_BOUND)
+
+    solvable = (net_disbursement > 0) & (payment > 0) & (number_of_payments > 0)
+    converged = ~solvable
+
+    with np.errstate(over="ignore", invalid="ignore", divide="ignore"):
+        for _ in range(max_iterations):
+            active = ~converged
+            if not active.any():
+                break
+            factor, derivative = _annuity_factor(rate[active], number_of_payments[active])
+            residual = payment[active] * factor - net_disbursement[active]
+            step = residual / (payment[active] * derivative)
+            new_rate = np.clip(rate[active] - step, IRR_LOWER_BOUND, IRR_UPPER_BOUND)
+            done = np.abs(new_rate - rate[active]) < tolerance
+            rate[active] = new_rate
+            converged[active] = done | ~np.isfinite(new_rate)
+
+        # Bisection fallback for anything Newton could not settle
+        factor, _ = _annuity_factor(rate, number_of_payments)
+        residual = payment * factor - net_disbursement
+        unresolved = solvable & ~(np.isfinite(rate) & (np.abs(residual) <= 1e-6 * net_disbursement))
+        if unresolved.any():
+            low = np.full(unresolved.sum(), IRR_LOWER_BOUND)
+            high = np.full(unresolved.sum(), IRR_UPPER_BOUND)
+            n = number_of_payments[unresolved]
+            pay = payment[unresolved]
+            net = net_disbursement[unresolved]
+            for _ in range(200):
+                mid = (low + high) / 2
+                mid_factor, _ = _annuity_factor(mid, n)
+                # a(i) decreases with i, so a positive residual means the rate is too low
+                too_low = pay * mid_factor - net > 0
+                low = np.where(too_low, mid, low)
+                high = np.where(too_low, high, mid)
+                if np.all(high - low < tolerance):
+                    break
+            mid = (low + high) / 2
+            mid_factor, _ = _annuity_factor(mid, n)
+            in_bracket = np.abs(pay * mid_factor - net) <= 1e-6 * net
+            rate[unresolved] = np.where(in_bracket, mid, np.nan)
+
+    rate[~solvable] = np.nan
+    return rate
+
+
+def solve_periodic_irr(
+    net_disbursement: float,
+    payment: float,
+    number_of_payments: int,
+    guess: float = None
+) -> float:
+    """
+    Solve the periodic IRR of a single level-payment loan.
+
+    Args:
+        net_disbursement (float): Amount actually received
+        payment (float): Level payment (EMI)
+        number_of_payments (int): Number of payments
+        guess (float): Starting periodic rate (default: 1%)
+
+    Returns:
+        float: Periodic IRR (NaN if none exists)
+    """
+    if net_disbursement <= 0 or payment <= 0 or number_of_payments <= 0:
+        return float("nan")
+
+    # Scalar Newton iteration; the vectorized solver handles the rare misses
+    rate = min(max(guess or 0.01, IRR_LOWER_BOUND), IRR_UPPER_BOUND)
+    for _ in range(50):
+        if abs(rate) < 1e-9:
+            break
+        discount = (1 + rate) ** -number_of_payments
+        factor = (1 - discount) / rate
+        residual = payment * factor - net_disbursement
+        derivative = (number_of_payments * discount / (1 + rate) - factor) / rate
+        new_rate = min(max(rate - residual / (payment * derivative), IRR_LOWER_BOUND), IRR_UPPER_BOUND)
+        if abs(new_rate - rate) < 1e-10:
+            if abs(residual) <= 1e-6 * net_disbursement:
+                return new_rate
+            break
+        rate = new_rate
+    return float(solve_periodic_irr_batch(net_disbursement, payment, number_of_payments, guess)[0])
+
+
+def apr_from_terms(
+    terms: LoanTerms,
     processing_fee: float = 0.0,
-    other_charges: float = 0.0,
-    interest_method: str = "reducing"
+    other_charges: float = 0.0
 ) -> float:
     """
-    Calculate effective interest rate including all charges.
+    Calculate the true APR from already computed loan terms.
 
     Args:
-        principal (float): Loan amount
-        annual_rate (float): Annual interest rate (%)
-        tenure_years (float): Loan tenure in years
-        repayment_frequency (str): "monthly", "quarterly", or "annually"
+        terms (LoanTerms): Cached loan terms from `get_loan_terms`
+        processing_fee (float): Processing fee amount
+        other_charges (float): Other charges (insurance, etc.)
+
+    Returns:
+        float: APR (%), the annualized IRR of the net disbursement against
+            the EMI stream; the nominal rate if charges exceed the principal
+    """
+    net_disbursement = terms.principal - processing_fee - other_charges
+    periodic_irr = solve_periodic_irr(
+        net_disbursement, terms.emi, terms.number_of_payments, terms.periodic_rate
+    )
+    if np.isnan(periodic_irr):
+        return terms.annual_rate
+    return round(periodic_irr * terms.periods_per_year * 100, 2)
+
+
+def effective_rate_from_terms(
+    terms: LoanTerms,
+    processing_fee: float = 0.0,
+    other_charges: float = 0.0
+) -> float:
+    """
+    Calculate effective interest rate from already computed loan terms.
+
+    Args:
+        terms (LoanTerms): Cached loan terms from `get_loan_terms`
         processing_fee (float): Processing fee amount
         other_charges (float): Other charges (insurance, etc.)
-        interest_method (str): "reducing" or "flat"
 
     Returns:
         float: Effective interest rate (%)
     """
-    # Calculate loan details
-    if interest_method == "flat":
-        emi, total_interest, total_payment, num_payments = flat_rate(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
-    else:
-        emi, total_interest, total_payment, num_payments = reducing_balance(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
+    principal = terms.principal
+    annual_rate = terms.annual_rate
+    tenure_years = terms.tenure_years
 
     # Effective principal (amount actually received after charges)
     effective_principal = principal - processing_fee - other_charges
     if effective_principal <= 0:
         return annual_rate  # Return original rate if charges exceed principal
 
-    # Total amount to be repaid (including all charges)
-    total_cost = total_payment + processing_fee + other_charges
-    
-    # Calculate effective rate: the rate that would produce the same total cost
-    # if applied to the effective principal
-    # Effective rate = ((Total cost - Effective principal) / Effective principal) / tenure * 100
-    # This accounts for both the interest on full principal and the charges
-    total_cost_over_principal = total_cost - effective_principal
-    
     if effective_principal > 0 and tenure_years > 0:
         # The effective rate is the rate that, when applied to effective_principal,
         # would give the same total cost
@@ -76,6 +224,34 @@ def calculate_effective_rate(
     return round(effective_rate, 2)
 
 
+def calculate_effective_rate(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str = "monthly",
+    processing_fee: float = 0.0,
+    other_charges: float = 0.0,
+    interest_method: str = "reducing"
+) -> float:
+    """
+    Calculate effective interest rate including all charges.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+        processing_fee (float): Processing fee amount
+        other_charges (float): Other charges (insurance, etc.)
+        interest_method (str): "reducing" or "flat"
+
+    Returns:
+        float: Effective interest rate (%)
+    """
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+    return effective_rate_from_terms(terms, processing_fee, other_charges)
+
+
 def calculate_apr(
     principal: float,
     annual_rate: float,
@@ -100,32 +276,25 @@ def calculate_apr(
     Returns:
         dict: APR details
     """
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+
     # Calculate effective rate
-    effective_rate = calculate_effective_rate(
-        principal, annual_rate, tenure_years, repayment_frequency,
-        processing_fee, other_charges, interest_method
-    )
+    effective_rate = effective_rate_from_terms(terms, processing_fee, other_charges)
 
-    # Calculate loan details
-    if interest_method == "flat":
-        emi, total_interest, total_payment, num_payments = flat_rate(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
-    else:
-        emi, total_interest, total_payment, num_payments = reducing_balance(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
+    # True APR: IRR of the net disbursement against the EMI stream
+    apr = apr_from_terms(terms, processing_fee, other_charges)
+    effective_annual_rate = ((1 + apr / 100.0 / terms.periods_per_year) ** terms.periods_per_year - 1) * 100
 
-    total_cost = total_payment + processing_fee + other_charges
+    total_cost = terms.total_payment + processing_fee + other_charges
     total_charges = processing_fee + other_charges
 
     return {
         "nominal_rate": round(annual_rate, 2),
         "effective_rate": effective_rate,
-        "apr": effective_rate,  # APR is same as effective rate in this context
+        "apr": apr,
+        "effective_annual_rate": round(effective_annual_rate, 2),
         "total_charges": round(total_charges, 2),
         "total_cost": round(total_cost, 2),
         "charges_percentage": round((total_charges / principal) * 100, 2) if principal > 0 else 0.0,
-        "rate_difference": round(effective_rate - annual_rate, 2)
+        "rate_difference": round(apr - annual_rate, 2)
     }
-
@@ -9,7 +9,7 @@ This module calculates:
 """
 
 from typing import Dict, Any
-from .logic import reducing_balance, get_periods_per_year
+from .logic import get_loan_terms, get_periods_per_year
 
 
 def calculate_loan_eligibility(
@@ -136,11 +136,9 @@ def calculate_affordability(
         dict: Affordability analysis
     """
     # Calculate EMI for desired loan
-    if interest_method == "flat":
-        from .logic import flat_rate
-        emi, _, _, _ = flat_rate(desired_loan_amount, annual_rate, tenure_years, repayment_frequency)
-    else:
-        emi, _, _, _ = reducing_balance(desired_loan_amount, annual_rate, tenure_years, repayment_frequency)
+    emi = get_loan_terms(
+        desired_loan_amount, annual_rate, tenure_years, repayment_frequency, interest_method
+    ).emi
 
     total_emi = emi + existing_emis
     maximum_emi = monthly_income * emi_to_income_ratio
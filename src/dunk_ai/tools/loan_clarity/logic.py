@@ -7,11 +7,24 @@ This file contains the core calculation logic for:
 3. Prepayment Impact Calculations
 4. Early Settlement Calculations
 5. EMI Modification Scenarios
-6. Helper functions
+6. Cached loan terms shared by all Loan Clarity modules
+7. Helper functions
 """
 
 import math
-from typing import Tuple, Dict, Any
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Tuple, Dict, Any, Optional
+
+import numpy as np
+
+from .validations import (
+    validate_principal,
+    validate_interest_rate,
+    validate_tenure,
+    validate_repayment_frequency,
+    validate_loan_columns
+)
 
 
 # --- Helpers ---
@@ -31,85 +44,220 @@ def get_periods_per_year(frequency: str) -> int:
     return freq_map[frequency]
 
 
-# --- Flat Rate Method ---
-def flat_rate(principal, annual_rate, tenure_years, repayment_frequency):
+def _loan_columns(principal, annual_rate, tenure_years, repayment_frequency, max_rows=None):
     """
-    Calculate loan details using Flat Rate interest method.
-
-    Args:
-        principal (float): Loan amount
-        annual_rate (float): Annual interest rate (%)
-        tenure_years (float): Loan tenure in years
-        repayment_frequency (str): "monthly", "quarterly", or "annually"
+    Normalize batch loan inputs into validated NumPy columns.
 
-    Returns:
-        tuple: (emi, total_interest, total_payment, number_of_payments)
+    `principal` may also be a DataFrame with `principal`, `annual_rate`,
+    `tenure_years` and (optionally) `repayment_frequency` columns. Batches
+    longer than `max_rows` (if given) are rejected.
     """
-    from .validations import (
-        validate_principal,
-        validate_interest_rate,
-        validate_tenure,
-        validate_repayment_frequency
+    if hasattr(principal, "columns"):
+        frame = principal
+        principal = frame["principal"]
+        annual_rate = frame["annual_rate"]
+        tenure_years = frame["tenure_years"]
+        if "repayment_frequency" in frame.columns:
+            repayment_frequency = frame["repayment_frequency"]
+
+    principal = np.atleast_1d(np.asarray(principal, dtype=float))
+    annual_rate = np.atleast_1d(np.asarray(annual_rate, dtype=float))
+    tenure_years = np.atleast_1d(np.asarray(tenure_years, dtype=float))
+    if max_rows is not None and len(principal) > max_rows:
+        raise ValueError(f"Batch is too large ({len(principal)} loans, limit {max_rows}).")
+    if isinstance(repayment_frequency, str):
+        repayment_frequency = np.full(len(principal), repayment_frequency)
+    repayment_frequency = np.atleast_1d(np.asarray(repayment_frequency, dtype=str))
+
+    validate_loan_columns(principal, annual_rate, tenure_years, repayment_frequency)
+
+    periods_per_year = np.select(
+        [repayment_frequency == "monthly", repayment_frequency == "quarterly"], [12, 4], 1
     )
-    
+    number_of_payments = (tenure_years * periods_per_year).astype(int)
+    if (number_of_payments <= 0).any():
+        raise ValueError("Number of payments must be greater than 0.")
+    return principal, annual_rate, tenure_years, periods_per_year, number_of_payments
+
+
+
+# --- Cached Loan Terms ---
+LOAN_TERMS_CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class LoanTerms:
+    """Closed-form terms of one loan, computed once and shared via `get_loan_terms`."""
+
+    principal: float
+    annual_rate: float
+    tenure_years: float
+    repayment_frequency: str
+    interest_method: str
+    periods_per_year: int
+    number_of_payments: int
+    periodic_rate: float
+    growth: float
+    emi: float
+    total_interest: float
+    total_payment: float
+
+    def as_tuple(self) -> Tuple[float, float, float, int]:
+        """Return (emi, total_interest, total_payment, number_of_payments)."""
+        return self.emi, self.total_interest, self.total_payment, self.number_of_payments
+
+    def outstanding_after(self, payments_made: int) -> float:
+        """
+        Outstanding principal after `payments_made` payments.
+
+        Args:
+            payments_made (int): Number of payments already made
+
+        Returns:
+            float: Outstanding principal amount
+        """
+        if payments_made <= 0:
+            return self.principal
+        if payments_made >= self.number_of_payments:
+            return 0.0
+
+        if self.interest_method == "reducing":
+            if self.periodic_rate == 0:
+                # Zero-rate loan: every payment repays P / n
+                return round(max(0, self.principal * (1 - payments_made / self.number_of_payments)), 2)
+            # Outstanding principal formula: P * ((1+r)^n - (1+r)^p) / ((1+r)^n - 1)
+            # where n = total payments, p = payments made
+            outstanding = self.principal * (
+                (self.growth - (1 + self.periodic_rate) ** payments_made) / (self.growth - 1)
+            )
+            return round(outstanding, 2)
+
+        # Flat rate: simple calculation
+        outstanding = self.total_payment - self.emi * payments_made
+        return round(max(0, outstanding), 2)
+
+
+@lru_cache(maxsize=LOAN_TERMS_CACHE_SIZE)
+def _cached_loan_terms(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str,
+    interest_method: str
+) -> LoanTerms:
     # Validate inputs
     validate_principal(principal)
     validate_interest_rate(annual_rate)
     validate_tenure(tenure_years)
     validate_repayment_frequency(repayment_frequency)
-    
+
     periods_per_year = get_periods_per_year(repayment_frequency)
     number_of_payments = int(tenure_years * periods_per_year)
+    if number_of_payments <= 0:
+        raise ValueError("Number of payments must be greater than 0.")
 
-    total_interest = (principal * annual_rate * tenure_years) / 100.0
-    total_payment = principal + total_interest
-    emi = total_payment / number_of_payments
+    periodic_rate = (annual_rate / 100.0) / periods_per_year
+    growth = (1 + periodic_rate) ** number_of_payments
 
-    return round(emi, 2), round(total_interest, 2), round(total_payment, 2), number_of_payments
+    if interest_method == "flat":
+        total_interest = (principal * annual_rate * tenure_years) / 100.0
+        total_payment = principal + total_interest
+        emi = total_payment / number_of_payments
+    elif periodic_rate == 0:
+        # Zero-rate loan: the principal is split evenly, as in reducing_balance_batch
+        emi = principal / number_of_payments
+        total_payment = principal
+        total_interest = 0.0
+    else:
+        # EMI formula: P * r * (1+r)^n / ((1+r)^n -1)
+        emi = (principal * periodic_rate * growth) / (growth - 1)
+        total_payment = emi * number_of_payments
+        total_interest = total_payment - principal
+
+    return LoanTerms(
+        principal=principal,
+        annual_rate=annual_rate,
+        tenure_years=tenure_years,
+        repayment_frequency=repayment_frequency,
+        interest_method=interest_method,
+        periods_per_year=periods_per_year,
+        number_of_payments=number_of_payments,
+        periodic_rate=periodic_rate,
+        growth=growth,
+        emi=round(emi, 2),
+        total_interest=round(total_interest, 2),
+        total_payment=round(total_payment, 2)
+    )
 
 
-# --- Reducing Balance Method ---
-def reducing_balance(principal, annual_rate, tenure_years, repayment_frequency):
+def get_loan_terms(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str,
+    interest_method: str = "reducing"
+) -> LoanTerms:
     """
-    Calculate loan details using Reducing Balance (EMI) interest method.
+    Return the cached closed-form terms for a loan.
+
+    Inputs are normalized (numbers to float, any method other than "flat"
+    to "reducing") and held in a bounded LRU cache, so repeated calls for
+    the same loan across modules compute (1+r)^n and the EMI only once.
 
     Args:
         principal (float): Loan amount
         annual_rate (float): Annual interest rate (%)
         tenure_years (float): Loan tenure in years
         repayment_frequency (str): "monthly", "quarterly", or "annually"
+        interest_method (str): "reducing" or "flat" (default: "reducing")
 
     Returns:
-        tuple: (emi, total_interest, total_payment, number_of_payments)
+        LoanTerms: Validated loan terms with EMI and totals
+
+    Raises:
+        ValueError: If any input is invalid
     """
-    from .validations import (
-        validate_principal,
-        validate_interest_rate,
-        validate_tenure,
-        validate_repayment_frequency
+    return _cached_loan_terms(
+        float(principal),
+        float(annual_rate),
+        float(tenure_years),
+        repayment_frequency,
+        "flat" if interest_method == "flat" else "reducing"
     )
-    
-    # Validate inputs
-    validate_principal(principal)
-    validate_interest_rate(annual_rate)
-    validate_tenure(tenure_years)
-    validate_repayment_frequency(repayment_frequency)
-    
-    periods_per_year = get_periods_per_year(repayment_frequency)
-    number_of_payments = int(tenure_years * periods_per_year)
-    if number_of_payments <= 0:
-        raise ValueError("Number of payments must be greater than 0.")
 
-    periodic_rate = (annual_rate / 100.0) / periods_per_year
 
-    # EMI formula: P * r * (1+r)^n / ((1+r)^n -1)
-    emi = (principal * periodic_rate * (1 + periodic_rate) ** number_of_payments) / \
-          ((1 + periodic_rate) ** number_of_payments - 1)
+# --- Flat Rate Method ---
+def flat_rate(principal, annual_rate, tenure_years, repayment_frequency):
+    """
+    Calculate loan details using Flat Rate interest method.
 
-    total_payment = emi * number_of_payments
-    total_interest = total_payment - principal
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+
+    Returns:
+        tuple: (emi, total_interest, total_payment, number_of_payments)
+    """
+    return get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, "flat").as_tuple()
+
+
+# --- Reducing Balance Method ---
+def reducing_balance(principal, annual_rate, tenure_years, repayment_frequency):
+    """
+    Calculate loan details using Reducing Balance (EMI) interest method.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
 
-    return round(emi, 2), round(total_interest, 2), round(total_payment, 2), number_of_payments
+    Returns:
+        tuple: (emi, total_interest, total_payment, number_of_payments)
+    """
+    return get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, "reducing").as_tuple()
 
 
 # --- Prepayment Impact Calculations ---
@@ -146,18 +294,10 @@ def calculate_prepayment_impact(
             - interest_saved: Total interest saved
             - new_total_payment: New total payment amount
     """
-    # Calculate original EMI
-    if interest_method == "flat":
-        original_emi, _, _, _ = flat_rate(principal, annual_rate, tenure_years, repayment_frequency)
-    else:
-        original_emi, _, _, _ = reducing_balance(principal, annual_rate, tenure_years, repayment_frequency)
-
-    # Get outstanding principal
-    from .schedule import get_outstanding_principal
-    outstanding = get_outstanding_principal(
-        principal, annual_rate, tenure_years, repayment_frequency,
-        payments_made, interest_method
-    )
+    # Calculate original EMI and outstanding principal from the shared terms
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+    original_emi = terms.emi
+    outstanding = terms.outstanding_after(payments_made)
 
     new_principal = outstanding - prepayment_amount
     if new_principal <= 0:
@@ -172,20 +312,15 @@ def calculate_prepayment_impact(
             "message": "Prepayment amount exceeds outstanding principal. Loan can be fully closed."
         }
 
-    periods_per_year = get_periods_per_year(repayment_frequency)
-    remaining_payments = int(tenure_years * periods_per_year) - payments_made
+    periods_per_year = terms.periods_per_year
+    remaining_payments = terms.number_of_payments - payments_made
 
     if reduce_emi:
         # Calculate new EMI with same tenure
         remaining_tenure_years = remaining_payments / periods_per_year
-        if interest_method == "flat":
-            new_emi, _, new_total, _ = flat_rate(
-                new_principal, annual_rate, remaining_tenure_years, repayment_frequency
-            )
-        else:
-            new_emi, _, new_total, _ = reducing_balance(
-                new_principal, annual_rate, remaining_tenure_years, repayment_frequency
-            )
+        new_emi, _, new_total, _ = get_loan_terms(
+            new_principal, annual_rate, remaining_tenure_years, repayment_frequency, interest_method
+        ).as_tuple()
 
         # Calculate original remaining payment
         original_remaining = original_emi * remaining_payments
@@ -203,7 +338,7 @@ def calculate_prepayment_impact(
         }
     else:
         # Calculate new tenure with same EMI
-        periodic_rate = (annual_rate / 100.0) / periods_per_year
+        periodic_rate = terms.periodic_rate
 
         if interest_method == "reducing":
             # Solve for n: EMI = P * r * (1+r)^n / ((1+r)^n - 1)
@@ -269,26 +404,13 @@ def calculate_early_settlement(
             - interest_saved: Interest that would have been paid
             - total_savings: Total savings including interest and charges
     """
-    from .schedule import get_outstanding_principal
-
-    outstanding = get_outstanding_principal(
-        principal, annual_rate, tenure_years, repayment_frequency,
-        payments_made, interest_method
-    )
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+    outstanding = terms.outstanding_after(payments_made)
 
     # Calculate original total payment
-    if interest_method == "flat":
-        _, total_interest, total_payment, total_payments = flat_rate(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
-    else:
-        _, total_interest, total_payment, total_payments = reducing_balance(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
+    emi, total_interest, total_payment, total_payments = terms.as_tuple()
 
     # Calculate amount already paid
-    emi, _, _, _ = reducing_balance(principal, annual_rate, tenure_years, repayment_frequency) \
-        if interest_method == "reducing" else flat_rate(principal, annual_rate, tenure_years, repayment_frequency)
     amount_paid = emi * payments_made
 
     # Remaining interest that would be paid
@@ -338,13 +460,11 @@ def modify_emi(
             - tenure_change_years: Change in tenure
     """
     # Get original EMI
-    if interest_method == "flat":
-        original_emi, _, _, _ = flat_rate(principal, annual_rate, tenure_years, repayment_frequency)
-    else:
-        original_emi, _, _, _ = reducing_balance(principal, annual_rate, tenure_years, repayment_frequency)
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+    original_emi = terms.emi
 
-    periods_per_year = get_periods_per_year(repayment_frequency)
-    periodic_rate = (annual_rate / 100.0) / periods_per_year
+    periods_per_year = terms.periods_per_year
+    periodic_rate = terms.periodic_rate
 
     if interest_method == "reducing":
         # Calculate new tenure: n = log(1 + P*r/EMI) / log(1+r)
@@ -399,16 +519,14 @@ def modify_tenure(
             - emi_change: Change in EMI
     """
     # Get original EMI
-    if interest_method == "flat":
-        original_emi, _, _, _ = flat_rate(principal, annual_rate, tenure_years, repayment_frequency)
-    else:
-        original_emi, _, _, _ = reducing_balance(principal, annual_rate, tenure_years, repayment_frequency)
+    original_emi = get_loan_terms(
+        principal, annual_rate, tenure_years, repayment_frequency, interest_method
+    ).emi
 
     # Calculate new EMI
-    if interest_method == "flat":
-        new_emi, _, _, _ = flat_rate(principal, annual_rate, new_tenure_years, repayment_frequency)
-    else:
-        new_emi, _, _, _ = reducing_balance(principal, annual_rate, new_tenure_years, repayment_frequency)
+    new_emi = get_loan_terms(
+        principal, annual_rate, new_tenure_years, repayment_frequency, interest_method
+    ).emi
 
     return {
         "original_emi": original_emi,
@@ -416,4 +534,95 @@ def modify_tenure(
         "original_tenure_years": tenure_years,
         "new_tenure_years": new_tenure_years,
         "emi_change": round(new_emi - original_emi, 2)
-    }
\ No newline at end of file
+    }
+
+
+# --- Batch Calculations ---
+# Limit for batches requested over the REST API and MCP, as for sensitivity grids
+BATCH_REQUEST_MAX_ROWS = 50_000
+
+
+def flat_rate_batch(
+    principal,
+    annual_rate=None,
+    tenure_years=None,
+    repayment_frequency="monthly",
+    max_rows: Optional[int] = None
+):
+    """
+    Calculate flat rate loan details for many loans at once.
+
+    Args:
+        principal (array-like | DataFrame): Loan amounts, or a DataFrame with
+            principal/annual_rate/tenure_years/repayment_frequency columns
+        annual_rate (array-like): Annual interest rates (%)
+        tenure_years (array-like): Loan tenures in years
+        repayment_frequency (str | array-like): One frequency for all loans
+            or one per loan (default: "monthly")
+        max_rows (int): Largest batch accepted (default: no limit)
+
+    Returns:
+        dict: Arrays for emi, total_interest, total_payment, number_of_payments
+    """
+    principal, annual_rate, tenure_years, _, number_of_payments = _loan_columns(
+        principal, annual_rate, tenure_years, repayment_frequency, max_rows
+    )
+
+    total_interest = (principal * annual_rate * tenure_years) / 100.0
+    total_payment = principal + total_interest
+    emi = total_payment / number_of_payments
+
+    return {
+        "emi": np.round(emi, 2),
+        "total_interest": np.round(total_interest, 2),
+        "total_payment": np.round(total_payment, 2),
+        "number_of_payments": number_of_payments
+    }
+
+
+def reducing_balance_batch(
+    principal,
+    annual_rate=None,
+    tenure_years=None,
+    repayment_frequency="monthly",
+    max_rows: Optional[int] = None
+):
+    """
+    Calculate reducing balance loan details for many loans at once.
+
+    Args:
+        principal (array-like | DataFrame): Loan amounts, or a DataFrame with
+            principal/annual_rate/tenure_years/repayment_frequency columns
+        annual_rate (array-like): Annual interest rates (%)
+        tenure_years (array-like): Loan tenures in years
+        repayment_frequency (str | array-like): One frequency for all loans
+            or one per loan (default: "monthly")
+        max_rows (int): Largest batch accepted (default: no limit)
+
+    Returns:
+        dict: Arrays for emi, total_interest, total_payment, number_of_payments
+    """
+    principal, annual_rate, _, periods_per_year, number_of_payments = _loan_columns(
+        principal, annual_rate, tenure_years, repayment_frequency, max_rows
+    )
+
+    periodic_rate = (annual_rate / 100.0) / periods_per_year
+    growth = (1 + periodic_rate) ** number_of_payments
+
+    # EMI formula: P * r * (1+r)^n / ((1+r)^n -1), and P / n for zero-rate loans
+    with np.errstate(divide="ignore", invalid="ignore"):
+        emi = np.where(
+            periodic_rate > 0,
+            principal * periodic_rate * growth / (growth - 1),
+            principal / number_of_payments
+        )
+
+    total_payment = emi * number_of_payments
+    total_interest = total_payment - principal
+
+    return {
+        "emi": np.round(emi, 2),
+        "total_interest": np.round(total_interest, 2),
+        "total_payment": np.round(total_payment, 2),
+        "number_of_payments": number_of_payments
+    }
@@ -5,24 +5,70 @@ This module generates detailed amortization schedules showing:
 - Period-by-period breakdown (payment number, opening balance, EMI, principal, interest, closing balance)
 - Cumulative interest and principal paid
 - Support for all repayment frequencies
-- Date-based schedules with proper period calculations
+- Calendar-accurate payment dates with end-of-month clamping
+- Chunked generators for streaming long schedules in constant memory
 """
 
-from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from .logic import reducing_balance, get_periods_per_year
+from datetime import datetime
+from typing import Iterator, List, Dict, Any, Union
 
+import numpy as np
 
-def generate_amortization_schedule(
+from .aggregation import aggregate_schedule
+from .dates import generate_payment_dates
+from .logic import get_loan_terms, get_periods_per_year
+
+
+SCHEDULE_COLUMNS = (
+    "payment_number",
+    "payment_date",
+    "opening_balance",
+    "emi",
+    "principal_paid",
+    "interest_paid",
+    "closing_balance",
+    "cumulative_principal",
+    "cumulative_interest",
+)
+
+
+# Periods computed per chunk when streaming a schedule
+SCHEDULE_CHUNK_SIZE = 120
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 2 decimals exactly like Python's `round(value, 2)`.
+
+    `np.round` scales by 100 first, which can tip values lying within float
+    error of a half cent the other way; those few are re-rounded in Python.
+    """
+    rounded = np.round(values, 2)
+    scaled = np.abs(values) * 100
+    near_half = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for index in near_half.tolist():
+        rounded[index] = round(float(values[index]), 2)
+    return rounded
+
+
+def iter_amortization_columns(
     principal: float,
     annual_rate: float,
     tenure_years: float,
     repayment_frequency: str,
     interest_method: str = "reducing",
-    start_date: datetime = None
-) -> List[Dict[str, Any]]:
+    start_date: datetime = None,
+    chunk_size: int = SCHEDULE_CHUNK_SIZE
+) -> Iterator[Dict[str, np.ndarray]]:
     """
-    Generate a complete amortization schedule for a loan.
+    Yield the amortization schedule as consecutive chunks of NumPy columns.
+
+    Each chunk is computed with vectorized passes seeded by the closed-form
+    annuity path, and only the balance and running totals are carried
+    between chunks. Memory stays bounded by `chunk_size` regardless of
+    tenure. Interest is charged on the rounded running balance, amounts are
+    rounded to 2 decimals and the final period is clamped, so rows match
+    the period-by-period schedule exactly.
 
     Args:
         principal (float): Loan amount
@@ -31,18 +77,11 @@ def generate_amortization_schedule(
         repayment_frequency (str): "monthly", "quarterly", or "annually"
         interest_method (str): "reducing" or "flat" (default: "reducing")
         start_date (datetime): Start date of the loan (default: today)
+        chunk_size (int): Periods per chunk; None yields a single chunk
 
-    Returns:
-        List[Dict]: List of dictionaries, each containing:
-            - payment_number: Payment sequence number
-            - payment_date: Date of payment
-            - opening_balance: Principal balance at start of period
-            - emi: EMI amount for this period
-            - principal_paid: Principal portion of EMI
-            - interest_paid: Interest portion of EMI
-            - closing_balance: Principal balance at end of period
-            - cumulative_principal: Total principal paid so far
-            - cumulative_interest: Total interest paid so far
+    Yields:
+        Dict[str, np.ndarray]: One array per entry of `SCHEDULE_COLUMNS`.
+            `payment_date` is a `datetime64[D]` array.
     """
     if start_date is None:
         start_date = datetime.now()
@@ -51,79 +90,227 @@ def generate_amortization_schedule(
     number_of_payments = int(tenure_years * periods_per_year)
 
     # Calculate EMI
-    if interest_method == "flat":
-        from .logic import flat_rate
-        emi, _, _, _ = flat_rate(principal, annual_rate, tenure_years, repayment_frequency)
-    else:
-        emi, _, _, _ = reducing_balance(principal, annual_rate, tenure_years, repayment_frequency)
-
-    schedule = []
-    current_balance = principal
-    cumulative_principal = 0.0
-    cumulative_interest = 0.0
-    periodic_rate = (annual_rate / 100.0) / periods_per_year
+    emi = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method).emi
 
-    # Calculate date increment based on frequency
-    if repayment_frequency == "monthly":
-        date_increment = timedelta(days=30)  # Approximate month
-    elif repayment_frequency == "quarterly":
-        date_increment = timedelta(days=90)  # Approximate quarter
-    else:  # annually
-        date_increment = timedelta(days=365)  # Approximate year
+    periodic_rate = (annual_rate / 100.0) / periods_per_year
+    if interest_method == "flat":
+        # Flat rate: interest is constant, principal increases
+        total_interest = (principal * annual_rate * tenure_years) / 100.0
+        flat_interest = round(total_interest / number_of_payments, 2)
 
-    current_date = start_date
+    chunk_size = chunk_size or number_of_payments
+    balance = principal
+    paid_principal = 0.0
+    paid_interest = 0.0
 
-    for payment_num in range(1, number_of_payments + 1):
-        opening_balance = round(current_balance, 2)
+    for chunk_start in range(0, number_of_payments, chunk_size):
+        periods = np.arange(chunk_start, min(chunk_start + chunk_size, number_of_payments))
 
         if interest_method == "flat":
-            # Flat rate: interest is constant, principal increases
-            total_interest = (principal * annual_rate * tenure_years) / 100.0
-            interest_paid = round(total_interest / number_of_payments, 2)
-            principal_paid = round(emi - interest_paid, 2)
-        else:
-            # Reducing balance: interest decreases, principal increases
-            interest_paid = round(current_balance * periodic_rate, 2)
-            principal_paid = round(emi - interest_paid, 2)
-
-        # Ensure principal doesn't exceed remaining balance
-        if principal_paid > current_balance:
-            principal_paid = round(current_balance, 2)
-            interest_paid = round(emi - principal_paid, 2)
-            emi_adjusted = round(principal_paid + interest_paid, 2)
+            interest_paid = np.full(len(periods), flat_interest)
+            principal_paid = _round2(emi - interest_paid)
+        elif periodic_rate > 0:
+            # Reducing balance: interest is charged on the rounded running
+            # balance. The closed-form annuity path is the first guess;
+            # each pass recomputes the balances from the rounded payments,
+            # fixing at least one more period, until nothing changes.
+            growth = (1 + periodic_rate) ** np.arange(len(periods))
+            opening_path = balance * growth - emi * (growth - 1) / periodic_rate
+            while True:
+                interest_paid = _round2(opening_path * periodic_rate)
+                principal_paid = _round2(emi - interest_paid)
+                corrected = np.concatenate(([balance], _round2(balance - np.cumsum(principal_paid))[:-1]))
+                if np.array_equal(corrected, opening_path):
+                    break
+                opening_path = corrected
         else:
-            emi_adjusted = emi
-
-        closing_balance = round(current_balance - principal_paid, 2)
-        # Ensure closing balance doesn't go negative
-        if closing_balance < 0:
-            closing_balance = 0.0
-            principal_paid = round(current_balance, 2)
-            emi_adjusted = round(principal_paid + interest_paid, 2)
-
-        cumulative_principal += principal_paid
-        cumulative_interest += interest_paid
-
-        schedule.append({
-            "payment_number": payment_num,
-            "payment_date": current_date.strftime("%Y-%m-%d"),
+            interest_paid = np.zeros(len(periods))
+            principal_paid = _round2(emi - interest_paid)
+
+        closing_balance = _round2(balance - np.cumsum(principal_paid))
+        opening_balance = np.concatenate(([round(balance, 2)], closing_balance[:-1]))
+        emi_paid = np.full(len(periods), emi)
+
+        # Stop at the first period that clears the loan
+        paid_off = np.flatnonzero(closing_balance <= 0)
+        if paid_off.size:
+            last = paid_off[0]
+            interest_paid = interest_paid[:last + 1]
+            principal_paid = principal_paid[:last + 1]
+            closing_balance = closing_balance[:last + 1]
+            opening_balance = opening_balance[:last + 1]
+            emi_paid = emi_paid[:last + 1]
+            periods = periods[:last + 1]
+
+            # Ensure principal doesn't exceed remaining balance
+            if principal_paid[last] > opening_balance[last]:
+                principal_paid[last] = opening_balance[last]
+                interest_paid[last] = round(emi - principal_paid[last], 2)
+            closing_balance[last] = 0.0
+            principal_paid[last] = opening_balance[last]
+            emi_paid[last] = round(principal_paid[last] + interest_paid[last], 2)
+
+        cumulative_principal = np.cumsum(np.concatenate(([paid_principal], principal_paid)))[1:]
+        cumulative_interest = np.cumsum(np.concatenate(([paid_interest], interest_paid)))[1:]
+
+        yield {
+            "payment_number": periods + 1,
+            "payment_date": generate_payment_dates(start_date, periods, repayment_frequency),
             "opening_balance": opening_balance,
-            "emi": round(emi_adjusted, 2),
+            "emi": emi_paid,
             "principal_paid": principal_paid,
             "interest_paid": interest_paid,
             "closing_balance": closing_balance,
-            "cumulative_principal": round(cumulative_principal, 2),
-            "cumulative_interest": round(cumulative_interest, 2)
-        })
+            "cumulative_principal": _round2(cumulative_principal),
+            "cumulative_interest": _round2(cumulative_interest),
+        }
+
+        if paid_off.size:
+            return
+        balance = float(closing_balance[-1])
+        paid_principal = cumulative_principal[-1]
+        paid_interest = cumulative_interest[-1]
+
+
+def generate_amortization_columns(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str,
+    interest_method: str = "reducing",
+    start_date: datetime = None
+) -> Dict[str, np.ndarray]:
+    """
+    Generate the amortization schedule as whole NumPy columns.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+        interest_method (str): "reducing" or "flat" (default: "reducing")
+        start_date (datetime): Start date of the loan (default: today)
+
+    Returns:
+        Dict[str, np.ndarray]: One array per entry of `SCHEDULE_COLUMNS`.
+            `payment_date` is a `datetime64[D]` array.
+    """
+    chunks = list(iter_amortization_columns(
+        principal, annual_rate, tenure_years, repayment_frequency,
+        interest_method, start_date, chunk_size=None
+    ))
+    if len(chunks) == 1:
+        return chunks[0]
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in SCHEDULE_COLUMNS}
+
+
+def schedule_columns_to_lists(columns: Dict[str, np.ndarray]) -> Dict[str, list]:
+    """
+    Convert columnar schedule arrays into JSON-serializable lists.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Output of `generate_amortization_columns`
+
+    Returns:
+        Dict[str, list]: Same keys, with dates as "YYYY-MM-DD" strings
+    """
+    lists = {name: columns[name].tolist() for name in SCHEDULE_COLUMNS if name != "payment_date"}
+    lists["payment_date"] = np.datetime_as_string(columns["payment_date"], unit="D").tolist()
+    return {name: lists[name] for name in SCHEDULE_COLUMNS}
+
+
+def schedule_columns_to_rows(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """
+    Build per-period row dictionaries from columnar schedule arrays.
+
+    Args:
+        columns (Dict[str, np.ndarray]): Output of `generate_amortization_columns`
+
+    Returns:
+        List[Dict]: One dictionary per payment, keyed by `SCHEDULE_COLUMNS`
+    """
+    lists = schedule_columns_to_lists(columns)
+    return [
+        dict(zip(SCHEDULE_COLUMNS, values))
+        for values in zip(*(lists[name] for name in SCHEDULE_COLUMNS))
+    ]
 
-        current_balance = closing_balance
-        current_date += date_increment
 
-        # Break if loan is fully paid
-        if closing_balance <= 0:
-            break
+def generate_amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str,
+    interest_method: str = "reducing",
+    start_date: datetime = None,
+    as_columns: bool = False
+) -> Union[List[Dict[str, Any]], Dict[str, np.ndarray]]:
+    """
+    Generate a complete amortization schedule for a loan.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+        interest_method (str): "reducing" or "flat" (default: "reducing")
+        start_date (datetime): Start date of the loan (default: today)
+        as_columns (bool): If True, return the columnar arrays from
+            `generate_amortization_columns` instead of row dictionaries
 
-    return schedule
+    Returns:
+        List[Dict]: List of dictionaries, each containing:
+            - payment_number: Payment sequence number
+            - payment_date: Date of payment
+            - opening_balance: Principal balance at start of period
+            - emi: EMI amount for this period
+            - principal_paid: Principal portion of EMI
+            - interest_paid: Interest portion of EMI
+            - closing_balance: Principal balance at end of period
+            - cumulative_principal: Total principal paid so far
+            - cumulative_interest: Total interest paid so far
+    """
+    columns = generate_amortization_columns(
+        principal, annual_rate, tenure_years, repayment_frequency,
+        interest_method, start_date
+    )
+    if as_columns:
+        return columns
+    return schedule_columns_to_rows(columns)
+
+
+def iter_amortization_schedule(
+    principal: float,
+    annual_rate: float,
+    tenure_years: float,
+    repayment_frequency: str,
+    interest_method: str = "reducing",
+    start_date: datetime = None,
+    chunk_size: int = SCHEDULE_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield amortization schedule rows, one chunk of periods at a time.
+
+    Produces the same rows as `generate_amortization_schedule` while only
+    holding `chunk_size` periods in memory.
+
+    Args:
+        principal (float): Loan amount
+        annual_rate (float): Annual interest rate (%)
+        tenure_years (float): Loan tenure in years
+        repayment_frequency (str): "monthly", "quarterly", or "annually"
+        interest_method (str): "reducing" or "flat" (default: "reducing")
+        start_date (datetime): Start date of the loan (default: today)
+        chunk_size (int): Periods computed per chunk
+
+    Yields:
+        Dict: One schedule row, keyed by `SCHEDULE_COLUMNS`
+    """
+    for columns in iter_amortization_columns(
+        principal, annual_rate, tenure_years, repayment_frequency,
+        interest_method, start_date, chunk_size
+    ):
+        yield from schedule_columns_to_rows(columns)
 
 
 def get_outstanding_principal(
@@ -151,42 +338,20 @@ def get_outstanding_principal(
     if payments_made <= 0:
         return principal
 
-    periods_per_year = get_periods_per_year(repayment_frequency)
-    total_payments = int(tenure_years * periods_per_year)
-
-    if payments_made >= total_payments:
-        return 0.0
-
-    if interest_method == "reducing":
-        periodic_rate = (annual_rate / 100.0) / periods_per_year
-        emi, _, _, _ = reducing_balance(principal, annual_rate, tenure_years, repayment_frequency)
-
-        # Outstanding principal formula: P * ((1+r)^n - (1+r)^p) / ((1+r)^n - 1)
-        # where n = total payments, p = payments made
-        outstanding = principal * (
-            ((1 + periodic_rate) ** total_payments - (1 + periodic_rate) ** payments_made) /
-            ((1 + periodic_rate) ** total_payments - 1)
-        )
-        return round(outstanding, 2)
-    else:
-        # Flat rate: simple calculation
-        from .logic import flat_rate
-        emi, total_interest, total_payment, _ = flat_rate(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
-        total_paid = emi * payments_made
-        outstanding = total_payment - total_paid
-        return round(max(0, outstanding), 2)
+    return get_loan_terms(
+        principal, annual_rate, tenure_years, repayment_frequency, interest_method
+    ).outstanding_after(payments_made)
 
 
 def get_year_wise_summary(
-    schedule: List[Dict[str, Any]]
+    schedule: Union[List[Dict[str, Any]], Dict[str, np.ndarray]]
 ) -> List[Dict[str, Any]]:
     """
     Generate year-wise summary from amortization schedule.
 
     Args:
-        schedule (List[Dict]): Complete amortization schedule
+        schedule (List[Dict] | Dict[str, np.ndarray]): Complete amortization
+            schedule, either as rows or as columnar arrays
 
     Returns:
         List[Dict]: Year-wise summary with:
@@ -196,34 +361,61 @@ def get_year_wise_summary(
             - total_payment: Total payment in this year
             - closing_balance: Balance at end of year
     """
-    year_wise = {}
-    current_year = None
-
-    for entry in schedule:
-        payment_date = datetime.strptime(entry["payment_date"], "%Y-%m-%d")
-        year = payment_date.year
-
-        if year not in year_wise:
-            year_wise[year] = {
-                "year": year,
-                "total_principal": 0.0,
-                "total_interest": 0.0,
-                "total_payment": 0.0,
-                "closing_balance": entry["closing_balance"]
-            }
-
-        year_wise[year]["total_principal"] += entry["principal_paid"]
-        year_wise[year]["total_interest"] += entry["interest_paid"]
-        year_wise[year]["total_payment"] += entry["emi"]
-        year_wise[year]["closing_balance"] = entry["closing_balance"]
+    if isinstance(schedule, dict):
+        return _year_wise_summary_from_columns(schedule)
+
+    # Row schedules: gather the needed fields into columns once
+    return _year_wise_summary_from_columns({
+        "payment_date": np.array([entry["payment_date"] for entry in schedule], dtype="datetime64[D]"),
+        "principal_paid": np.fromiter((entry["principal_paid"] for entry in schedule), float, len(schedule)),
+        "interest_paid": np.fromiter((entry["interest_paid"] for entry in schedule), float, len(schedule)),
+        "emi": np.fromiter((entry["emi"] for entry in schedule), float, len(schedule)),
+        "closing_balance": np.fromiter((entry["closing_balance"] for entry in schedule), float, len(schedule)),
+    })
+
+
+def _year_wise_summary_from_columns(columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """Aggregate columnar schedule arrays by calendar year in one pass."""
+    yearly = aggregate_schedule(columns, "calendar")
+    total_principal = np.round(yearly["principal_paid"], 2)
+    total_interest = np.round(yearly["interest_paid"], 2)
+    total_payment = np.round(yearly["total_payment"], 2)
+    closing_balance = np.round(yearly["closing_balance"], 2)
+
+    return [
+        {
+            "year": year,
+            "total_principal": principal_paid,
+            "total_interest": interest_paid,
+            "total_payment": payment,
+            "closing_balance": balance
+        }
+        for year, principal_paid, interest_paid, payment, balance in zip(
+            yearly["year"].tolist(), total_principal.tolist(), total_interest.tolist(),
+            total_payment.tolist(), closing_balance.tolist()
+        )
+    ]
 
-    # Round values
-    for year_data in year_wise.values():
-        year_data["total_principal"] = round(year_data["total_principal"], 2)
-        year_data["total_interest"] = round(year_data["total_interest"], 2)
-        year_data["total_payment"] = round(year_data["total_payment"], 2)
-        year_data["closing_balance"] = round(year_data["closing_balance"], 2)
 
-    return sorted(year_wise.values(), key=lambda x: x["year"])
+def extend_year_wise_summary(
+    summary: List[Dict[str, Any]],
+    columns: Dict[str, np.ndarray]
+) -> List[Dict[str, Any]]:
+    """
+    Fold one chunk of columnar schedule arrays into a running year-wise summary.
 
+    Args:
+        summary (List[Dict]): Year-wise summary built from earlier chunks (updated in place)
+        columns (Dict[str, np.ndarray]): Next chunk from `iter_amortization_columns`
 
+    Returns:
+        List[Dict]: The updated summary
+    """
+    chunk_summary = _year_wise_summary_from_columns(columns)
+    if summary and chunk_summary and summary[-1]["year"] == chunk_summary[0]["year"]:
+        carried, first = summary[-1], chunk_summary.pop(0)
+        for key in ("total_principal", "total_interest", "total_payment"):
+            carried[key] = round(carried[key] + first[key], 2)
+        carried["closing_balance"] = first["closing_balance"]
+    summary.extend(chunk_summary)
+    return summary
@@ -9,8 +9,75 @@ This module calculates tax benefits for home loans in India:
 - Net cost after tax benefits
 """
 
-from typing import Dict, Any
-from .logic import reducing_balance, flat_rate
+from datetime import date, datetime
+from typing import Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+
+from .aggregation import FISCAL_YEAR_START_MONTH, aggregate_loan_years, format_fiscal_year
+from .logic import LoanTerms, get_loan_terms
+
+
+SECTION_24_LIMIT = 200000      # ₹2 lakh, self-occupied home loans
+SECTION_80C_LIMIT = 150000     # ₹1.5 lakh
+SECTION_80EEA_LIMIT = 150000   # ₹1.5 lakh
+SECTION_80EEA_MAX_LOAN = 3500000  # ₹35 lakh
+SECTION_80EEB_LIMIT = 150000   # ₹1.5 lakh
+
+
+def _current_fiscal_year() -> int:
+    """Starting year of the fiscal year that contains today."""
+    today = date.today()
+    return today.year if today.month >= FISCAL_YEAR_START_MONTH else today.year - 1
+
+
+def _fiscal_year_flows(
+    terms: LoanTerms,
+    start_date: Optional[Union[date, datetime]],
+    financial_year: Optional[int]
+) -> Dict[str, np.ndarray]:
+    """
+    Interest and principal paid per fiscal year.
+
+    Without a start date the loan is assumed to begin with the requested
+    (or current) fiscal year, so its first fiscal year is a full one.
+    """
+    if start_date is None:
+        start_date = date(financial_year or _current_fiscal_year(), FISCAL_YEAR_START_MONTH, 1)
+    return aggregate_loan_years(terms, start_date, "fiscal")
+
+
+def _section_deductions(
+    annual_interest: np.ndarray,
+    annual_principal: np.ndarray,
+    principal: float,
+    loan_type: str,
+    is_first_time_buyer: bool,
+    is_self_occupied: bool
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Deductions under Sections 24(b), 80C, 80EEA and 80EEB, capped per year."""
+    none = np.zeros_like(annual_interest)
+
+    # Section 24(b): Interest deduction (no limit for let-out property)
+    if loan_type == "home_loan":
+        section_24 = np.minimum(annual_interest, SECTION_24_LIMIT) if is_self_occupied else annual_interest
+    else:
+        section_24 = none
+
+    # Section 80C: Principal repayment deduction (only for home loans)
+    section_80c = np.minimum(annual_principal, SECTION_80C_LIMIT) if loan_type == "home_loan" else none
+
+    # Section 80EEA: Interest beyond 24(b) for first-time buyers with loans up to ₹35 lakh
+    if loan_type == "home_loan" and is_first_time_buyer and principal <= SECTION_80EEA_MAX_LOAN:
+        section_80eea = np.minimum(annual_interest - section_24, SECTION_80EEA_LIMIT)
+    else:
+        section_80eea = none
+
+    # Section 80EEB: Electric vehicle loan interest deduction
+    # (assumes vehicle loans are EV loans; would need an explicit flag)
+    section_80eeb = np.minimum(annual_interest, SECTION_80EEB_LIMIT) if loan_type == "vehicle_loan" else none
+
+    return section_24, section_80c, section_80eea, section_80eeb
 
 
 def calculate_tax_benefits(
@@ -23,11 +90,17 @@ def calculate_tax_benefits(
     tax_slab: float = 30.0,
     is_first_time_buyer: bool = False,
     is_self_occupied: bool = True,
-    financial_year: int = None
+    financial_year: int = None,
+    start_date: Optional[Union[date, datetime]] = None
 ) -> Dict[str, Any]:
     """
     Calculate tax benefits for a loan (India-specific).
 
+    Interest and principal are the amounts paid during the fiscal year
+    (April to March), computed in closed form from the loan terms by
+    `aggregate_loan_years`. They are unrounded, so they can differ from the
+    rounded amortization schedule by a few rupees a year on long loans.
+
     Args:
         principal (float): Loan amount
         annual_rate (float): Annual interest rate (%)
@@ -38,12 +111,16 @@ def calculate_tax_benefits(
         tax_slab (float): Income tax slab percentage (5, 10, 20, 30)
         is_first_time_buyer (bool): Whether first-time home buyer (for Section 80EEA)
         is_self_occupied (bool): Whether property is self-occupied (for Section 24)
-        financial_year (int): Financial year (default: current year)
+        financial_year (int): Starting year of the fiscal year, e.g. 2024 for
+            FY 2024-25 (default: first fiscal year of the loan)
+        start_date (date): Date of the first payment (default: start of
+            `financial_year`, or of the current fiscal year)
 
     Returns:
         dict: Contains:
-            - annual_interest: Annual interest payment
-            - annual_principal: Annual principal repayment
+            - financial_year: Fiscal year label (e.g. "2024-25")
+            - annual_interest: Interest paid in the fiscal year
+            - annual_principal: Principal repaid in the fiscal year
             - section_24_deduction: Interest deduction under Section 24(b)
             - section_80c_deduction: Principal deduction under Section 80C
             - section_80eea_deduction: Additional interest deduction (if applicable)
@@ -52,54 +129,26 @@ def calculate_tax_benefits(
             - tax_savings: Actual tax saved
             - net_interest_cost: Interest cost after tax benefits
     """
-    from datetime import datetime
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+    yearly = _fiscal_year_flows(terms, start_date, financial_year)
     if financial_year is None:
-        financial_year = datetime.now().year
+        financial_year = int(yearly["year"][0])
 
-    # Calculate loan details
-    if interest_method == "flat":
-        emi, total_interest, total_payment, num_payments = flat_rate(
-            principal, annual_rate, tenure_years, repayment_frequency
-        )
-    else:
-        emi, total_interest, total_payment, num_payments = reducing_balance(
-            principal, annual_rate, tenure_years, repayment_frequency
+    matches = np.flatnonzero(yearly["year"] == financial_year)
+    if len(matches) == 0:
+        raise ValueError(
+            f"No payments fall in FY {format_fiscal_year(financial_year)}; the loan runs from "
+            f"FY {format_fiscal_year(int(yearly['year'][0]))} to FY {format_fiscal_year(int(yearly['year'][-1]))}"
         )
+    annual_interest = float(yearly["interest_paid"][matches[0]])
+    annual_principal = float(yearly["principal_paid"][matches[0]])
 
-    # Calculate annual amounts (approximate)
-    periods_per_year = 12 if repayment_frequency == "monthly" else (4 if repayment_frequency == "quarterly" else 1)
-    annual_emi = emi * periods_per_year
-    annual_interest = total_interest / tenure_years
-    annual_principal = annual_emi - annual_interest
-
-    # Section 24(b): Interest deduction
-    if loan_type == "home_loan":
-        if is_self_occupied:
-            section_24_deduction = min(annual_interest, 200000)  # ₹2 lakh limit
-        else:
-            section_24_deduction = annual_interest  # No limit for let-out
-    else:
-        section_24_deduction = 0.0
-
-    # Section 80C: Principal repayment deduction (only for home loans)
-    if loan_type == "home_loan":
-        section_80c_deduction = min(annual_principal, 150000)  # ₹1.5 lakh limit
-    else:
-        section_80c_deduction = 0.0
-
-    # Section 80EEA: Additional interest for first-time home buyers
-    section_80eea_deduction = 0.0
-    if loan_type == "home_loan" and is_first_time_buyer:
-        # Additional ₹1.5 lakh interest deduction
-        # Only if property value < ₹45 lakh and loan < ₹35 lakh
-        if principal <= 3500000:  # ₹35 lakh
-            section_80eea_deduction = min(annual_interest - section_24_deduction, 150000)
-
-    # Section 80EEB: Electric vehicle loan interest deduction
-    section_80eeb_deduction = 0.0
-    if loan_type == "vehicle_loan":
-        # Assuming it's an EV loan (would need explicit flag in real implementation)
-        section_80eeb_deduction = min(annual_interest, 150000)  # ₹1.5 lakh limit
+    section_24_deduction, section_80c_deduction, section_80eea_deduction, section_80eeb_deduction = (
+        float(deduction) for deduction in _section_deductions(
+            np.float64(annual_interest), np.float64(annual_principal), principal,
+            loan_type, is_first_time_buyer, is_self_occupied
+        )
+    )
 
     # Total deduction
     total_tax_deduction = section_24_deduction + section_80c_deduction + \
@@ -112,6 +161,7 @@ def calculate_tax_benefits(
     net_interest_cost = annual_interest - tax_savings
 
     return {
+        "financial_year": format_fiscal_year(financial_year),
         "annual_interest": round(annual_interest, 2),
         "annual_principal": round(annual_principal, 2),
         "section_24_deduction": round(section_24_deduction, 2),
@@ -134,11 +184,16 @@ def calculate_lifetime_tax_benefits(
     interest_method: str = "reducing",
     tax_slab: float = 30.0,
     is_first_time_buyer: bool = False,
-    is_self_occupied: bool = True
+    is_self_occupied: bool = True,
+    start_date: Optional[Union[date, datetime]] = None
 ) -> Dict[str, Any]:
     """
     Calculate total tax benefits over the entire loan tenure.
 
+    Interest and principal are bucketed by fiscal year (April to March) and
+    every section's cap is applied to each year separately, so front-loaded
+    interest and back-loaded principal are both capped where they fall.
+
     Args:
         principal (float): Loan amount
         annual_rate (float): Annual interest rate (%)
@@ -149,34 +204,67 @@ def calculate_lifetime_tax_benefits(
         tax_slab (float): Income tax slab percentage
         is_first_time_buyer (bool): Whether first-time home buyer
         is_self_occupied (bool): Whether property is self-occupied
+        start_date (date): Date of the first payment (default: start of the
+            current fiscal year)
 
     Returns:
-        dict: Lifetime tax benefits summary
+        dict: Contains:
+            - total_interest: Interest over the full tenure
+            - lifetime_tax_savings: Tax saved over all fiscal years
+            - lifetime_deduction: Deductions claimed over all fiscal years
+            - net_interest_after_tax: Interest cost after tax benefits
+            - tax_benefit_percentage: Tax savings as a share of interest
+            - section_totals: Lifetime deduction per section
+            - yearly_breakdown: Per fiscal year interest, principal,
+              deductions by section, total deduction and tax savings
     """
-    # Calculate annual benefits
-    annual_benefits = calculate_tax_benefits(
-        principal, annual_rate, tenure_years, repayment_frequency,
-        loan_type, interest_method, tax_slab, is_first_time_buyer, is_self_occupied
-    )
-
-    # Calculate total over tenure
-    lifetime_tax_savings = annual_benefits["tax_savings"] * tenure_years
-    lifetime_deduction = annual_benefits["total_tax_deduction"] * tenure_years
+    terms = get_loan_terms(principal, annual_rate, tenure_years, repayment_frequency, interest_method)
+    yearly = _fiscal_year_flows(terms, start_date, None)
 
-    # Calculate total interest
-    if interest_method == "flat":
-        _, total_interest, _, _ = flat_rate(principal, annual_rate, tenure_years, repayment_frequency)
-    else:
-        _, total_interest, _, _ = reducing_balance(principal, annual_rate, tenure_years, repayment_frequency)
+    deductions = np.stack(_section_deductions(
+        yearly["interest_paid"], yearly["principal_paid"], principal,
+        loan_type, is_first_time_buyer, is_self_occupied
+    ))
+    yearly_deduction = deductions.sum(axis=0)
+    yearly_savings = yearly_deduction * (tax_slab / 100.0)
 
+    section_totals = deductions.sum(axis=1)
+    lifetime_deduction = float(section_totals.sum())
+    lifetime_tax_savings = lifetime_deduction * (tax_slab / 100.0)
+    total_interest = terms.total_interest
     net_interest_after_tax = total_interest - lifetime_tax_savings
 
+    rounded = np.round(np.vstack((
+        yearly["interest_paid"], yearly["principal_paid"], deductions, yearly_deduction, yearly_savings
+    )), 2).tolist()
+    yearly_breakdown = [
+        {
+            "financial_year": format_fiscal_year(year),
+            "interest_paid": interest_paid,
+            "principal_paid": principal_paid,
+            "section_24_deduction": section_24,
+            "section_80c_deduction": section_80c,
+            "section_80eea_deduction": section_80eea,
+            "section_80eeb_deduction": section_80eeb,
+            "total_tax_deduction": total_deduction,
+            "tax_savings": savings
+        }
+        for year, interest_paid, principal_paid, section_24, section_80c, section_80eea, section_80eeb,
+        total_deduction, savings in zip(yearly["year"].tolist(), *rounded)
+    ]
+    section_24_total, section_80c_total, section_80eea_total, section_80eeb_total = np.round(section_totals, 2).tolist()
+
     return {
         "total_interest": round(total_interest, 2),
         "lifetime_tax_savings": round(lifetime_tax_savings, 2),
         "lifetime_deduction": round(lifetime_deduction, 2),
         "net_interest_after_tax": round(max(0, net_interest_after_tax), 2),
-        "tax_benefit_percentage": round((lifetime_tax_savings / total_interest) * 100, 2) if total_interest > 0 else 0.0
+        "tax_benefit_percentage": round((lifetime_tax_savings / total_interest) * 100, 2) if total_interest > 0 else 0.0,
+        "section_totals": {
+            "section_24_deduction": section_24_total,
+            "section_80c_deduction": section_80c_total,
+            "section_80eea_deduction": section_80eea_total,
+            "section_80eeb_deduction": section_80eeb_total
+        },
+        "yearly_breakdown": yearly_breakdown
     }
-
-
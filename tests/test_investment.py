@@ -1,18 +1,788 @@
 # tests/test_investment.py
 
+import asyncio
+import threading
+import time
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import httpx
+import numpy as np
+import pandas as pd
+import pytest
+
+from dunk_ai.tools.investment_navigator import investment, returns
+from dunk_ai.tools.investment_navigator.charts import ChartRenderer
+from dunk_ai.tools.investment_navigator.forecasting import ForecastService, fit_forecast
+from dunk_ai.tools.investment_navigator.history_store import OhlcvStore
+from dunk_ai.tools.investment_navigator.indicators import HIGH_LOW_WINDOW, IndicatorEngine, compute_indicators
+from dunk_ai.tools.investment_navigator.http_client import NSE_COOKIE_TTL, AsyncHttpClient
 from dunk_ai.tools.investment_navigator.investment import InvestmentNavigator
+from dunk_ai.tools.investment_navigator.market_data import (
+    OPEN_MARKET_TTL,
+    MarketDataCache,
+    market_ttl,
+)
+from dunk_ai.tools.investment_navigator.mutual_funds import NavCache, SchemeIndex, nav_returns
+from dunk_ai.tools.investment_navigator.portfolio import PortfolioStore, match_lots
+from dunk_ai.tools.investment_navigator.projection import estimate_parameters, simulate_sip
+from dunk_ai.tools.investment_navigator.returns import cagr, time_weighted_return, xirr, xirr_many
+from dunk_ai.tools.investment_navigator.price_sources import SourceHealth, hedged_call, hedged_call_async
+from dunk_ai.tools.investment_navigator.ticker_index import TickerIndex
+
+
+def _history_frame(days=260):
+    index = pd.bdate_range(end=pd.Timestamp.now(tz="Asia/Kolkata").normalize(), periods=days)
+    close = 100 + np.cumsum(np.random.default_rng(0).normal(0, 1, days))
+    return pd.DataFrame({"Close": close}, index=index)
 
 def test_get_stock_price():
     tool = InvestmentNavigator()
     result = tool.get_stock_price("TCS")
     print("Stock price test result:", result)
 
-def test_portfolio_summary():
-    tool = InvestmentNavigator()
+def test_portfolio_summary(tmp_path):
+    tool = InvestmentNavigator(portfolio=PortfolioStore(tmp_path / "portfolio.db"))
     result = tool.portfolio_summary("user123")
     print("Portfolio summary test result:", result)
 
 
-if __name__ == "__main__":
-    test_get_stock_price()
-    test_portfolio_summary()
+def test_market_data_cache_slices_and_expires():
+    calls = []
+    now = [0.0]
+
+    def fetcher(symbol, period):
+        calls.append((symbol, period))
+        return _history_frame()
+
+    cache = MarketDataCache(fetcher=fetcher, ttl=lambda symbol: 60.0, clock=lambda: now[0])
+    one_year = cache.get_history("tcs.ns", "1y")
+    six_months = cache.get_history("TCS.NS", "6mo")
+    quote = cache.get_history("TCS.NS", "5d")
+
+    assert calls == [("TCS.NS", "1y")]
+    assert len(quote) == 5
+    assert 100 < len(six_months) < len(one_year)
+    assert six_months.index[-1] == one_year.index[-1]
+
+    now[0] = 61.0
+    cache.get_history("TCS.NS", "6mo")
+    assert calls == [("TCS.NS", "1y"), ("TCS.NS", "1y")]
+
+
+def test_market_data_cache_coalesces_concurrent_fetches():
+    calls = []
+
+    def slow_fetcher(symbol, period):
+        calls.append(symbol)
+        time.sleep(0.1)
+        return _history_frame()
+
+    cache = MarketDataCache(fetcher=slow_fetcher)
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(cache.get_history("INFY.NS", "6mo")))
+        for _ in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls == ["INFY.NS"]
+    assert len(results) == 8
+    assert cache.stats["coalesced"] == 7
+
+
+def test_market_ttl_follows_trading_hours():
+    ist = ZoneInfo("Asia/Kolkata")
+    assert market_ttl("TCS.NS", datetime(2024, 6, 12, 11, 0, tzinfo=ist)) == OPEN_MARKET_TTL
+    # Wednesday 15:00 IST is 5:30 in New York, before the US open
+    assert market_ttl("AAPL", datetime(2024, 6, 12, 15, 0, tzinfo=ist)) > OPEN_MARKET_TTL
+    # Friday evening waits for Monday, capped
+    assert market_ttl("TCS.NS", datetime(2024, 6, 14, 18, 0, tzinfo=ist)) == 6 * 3600
+
+
+def test_async_nse_quote_reuses_cookies():
+    now = [0.0]
+    calls = []
+
+    def handler(request):
+        calls.append(request.url.path)
+        if request.url.path == "/":
+            return httpx.Response(200, headers={"set-cookie": "nsit=abc; Path=/"})
+        if "nsit=abc" not in request.headers.get("cookie", ""):
+            return httpx.Response(403)
+        return httpx.Response(200, json={"priceInfo": {"lastPrice": 110.0, "previousClose": 100.0}})
+
+    client = AsyncHttpClient(transport=httpx.MockTransport(handler), clock=lambda: now[0])
+    tool = InvestmentNavigator(client=client)
+
+    async def run():
+        first = await tool.get_nse_price_async("TCS.NS")
+        await tool.get_nse_price_async("INFY.NS")
+        now[0] += NSE_COOKIE_TTL + 1
+        await tool.get_nse_price_async("TCS.NS")
+        await client.aclose()
+        return first
+
+    quote = asyncio.run(run())
+    assert quote["current_price"] == 110.0
+    assert quote["day_change_percent"] == 10.0
+    assert quote["trend"] == "Bullish"
+    # Homepage is primed once, then again only after the cookies go stale
+    assert calls.count("/") == 2
+    assert calls.count("/api/quote-equity") == 3
+
+
+def test_async_client_limits_per_host_concurrency():
+    active = {"example.com": 0, "other.com": 0}
+    peak = dict(active)
+
+    async def handler(request):
+        host = request.url.host
+        active[host] += 1
+        peak[host] = max(peak[host], active[host])
+        await asyncio.sleep(0.01)
+        active[host] -= 1
+        return httpx.Response(200, json={})
+
+    client = AsyncHttpClient(transport=httpx.MockTransport(handler), host_concurrency={"example.com": 2})
+
+    async def run():
+        urls = [f"https://example.com/{i}" for i in range(6)] + [f"https://other.com/{i}" for i in range(6)]
+        await asyncio.gather(*(client.get_json(url) for url in urls))
+        await client.aclose()
+
+    asyncio.run(run())
+    assert peak["example.com"] == 2
+    assert peak["other.com"] > 2
+
+
+def test_hedged_call_returns_first_valid_source():
+    health = SourceHealth()
+
+    def slow():
+        time.sleep(0.5)
+        return {"current_price": 1.0}
+
+    started = time.monotonic()
+    result = hedged_call({
+        "slow": slow,
+        "broken": lambda: {"error": "blocked"},
+        "fast": lambda: {"current_price": 2.0}
+    }, health, hedge_delay=0.05)
+
+    # The hedge fires before the slow source answers; the failure launches the next at once
+    assert result["current_price"] == 2.0
+    assert time.monotonic() - started < 0.4
+    assert health.stats("broken")["success_rate"] == 0.0
+    assert health.order(["slow", "broken", "fast"])[-1] == "broken"
+
+    failed = hedged_call({"a": lambda: {"error": "x"}, "b": lambda: 1 / 0}, SourceHealth(), hedge_delay=0.05)
+    assert failed["error"].startswith("All price sources failed")
+
+
+def test_hedged_call_async_cancels_losers_and_honours_deadline():
+    health = SourceHealth()
+
+    async def slow():
+        await asyncio.sleep(5)
+        return {"current_price": 1.0}
+
+    async def quick():
+        await asyncio.sleep(0.02)
+        return {"current_price": 2.0}
+
+    async def run():
+        won = await hedged_call_async({"slow": slow, "quick": quick}, health, hedge_delay=0.01)
+        timed_out = await hedged_call_async({"slow": slow}, health, deadline=0.05)
+        return won, timed_out
+
+    won, timed_out = asyncio.run(run())
+    assert won["current_price"] == 2.0
+    assert "deadline exceeded" in timed_out["error"]
+    # Cancelled attempts are not counted against a source
+    assert health.stats("slow")["attempts"] == 0
+    assert health.stats("quick")["attempts"] == 1
+
+
+def test_get_stock_prices_batches_and_falls_back_per_symbol():
+    batches = []
+
+    def batch_fetcher(symbols, period):
+        batches.append((list(symbols), period))
+        return {symbol: _history_frame(5) for symbol in symbols if symbol != "NOPE.NS"}
+
+    def fetcher(symbol, period):
+        raise AssertionError("single-symbol fetch should not be used")
+
+    cache = MarketDataCache(fetcher=fetcher, batch_fetcher=batch_fetcher, ttl=lambda symbol: 60)
+    tool = InvestmentNavigator(market_data=cache, health=SourceHealth())
+    tool.resolve_ticker = lambda query: query.upper()
+    fallbacks = []
+    tool.get_nse_price = lambda ticker: fallbacks.append(ticker) or {"ticker": ticker, "current_price": 5.0, "source": "NSE"}
+    tool.get_google_price = lambda ticker: {"error": "unused"}
+
+    result = tool.get_stock_prices(["tcs.ns", "infy.ns", "nope.ns", "tcs.ns"])
+    assert batches == [(["TCS.NS", "INFY.NS", "NOPE.NS"], "5d")]
+    assert fallbacks == ["NOPE.NS"]
+    assert [row[1] for row in result["rows"]] == ["TCS.NS", "INFY.NS", "NOPE.NS"]
+    assert result["rows"][2][result["columns"].index("source")] == "NSE"
+    assert result["errors"] == []
+
+    # Cached symbols are not downloaded again
+    tool.get_stock_prices(["TCS.NS", "WIPRO.NS"])
+    assert batches[-1] == (["WIPRO.NS"], "5d")
+
+
+def test_ticker_index_resolves_locally_and_learns(tmp_path, monkeypatch):
+    store = tmp_path / "ticker_index.json"
+    index = TickerIndex(store_path=store)
+
+    assert index.resolve("TCS") == "TCS.NS"
+    assert index.resolve("Larsen & Toubro Ltd") == "LT.NS"
+    assert index.resolve("infy.bo") == "INFY.BO"         # already a symbol
+    assert index.resolve("Zydus Wellness") is None
+    # Prefix and typo matches are only offered as a fallback
+    assert index.resolve("state bank") is None
+    assert index.match("state bank") == "SBIN.NS"        # unique prefix
+    assert index.match("relaince") == "RELIANCE.NS"      # typo
+    assert index.match("tata") is None                   # ambiguous prefix
+
+    def offline(*args, **kwargs):
+        raise AssertionError("indexed names must not hit the network")
+
+    monkeypatch.setattr("dunk_ai.tools.investment_navigator.investment.requests.get", offline)
+    tool = InvestmentNavigator(tickers=index)
+    assert tool.resolve_ticker("Reliance Industries") == "RELIANCE.NS"
+
+    # Network matches are written back and survive a restart
+    class Search:
+        def json(self):
+            return {"quotes": [{"symbol": "ZYDUSWELL.NS", "longname": "Zydus Wellness Limited"}]}
+
+    monkeypatch.setattr("dunk_ai.tools.investment_navigator.investment.requests.get", lambda *a, **k: Search())
+    assert tool.resolve_ticker("Zydus Wellness") == "ZYDUSWELL.NS"
+    assert TickerIndex(store_path=store).resolve("zydus wellness ltd") == "ZYDUSWELL.NS"
+
+
+def test_similar_company_names_ask_the_search_before_fuzzy_matching(tmp_path, monkeypatch):
+    tool = InvestmentNavigator(tickers=TickerIndex(store_path=tmp_path / "ticker_index.json"))
+    listed = {
+        "bankofindia": "BANKINDIA.NS",
+        "hindustancopper": "HINDCOPPER.NS",
+        "tatatechnologies": "TATATECH.NS",
+        "mahindrafinance": "M&MFIN.NS",
+    }
+
+    class Search:
+        def __init__(self, url):
+            self.symbol = listed.get(url.rsplit("=", 1)[1])
+
+        def json(self):
+            return {"quotes": [{"symbol": self.symbol}] if self.symbol else []}
+
+    monkeypatch.setattr("dunk_ai.tools.investment_navigator.investment.requests.get", lambda url, **k: Search(url))
+    for name, symbol in [("Bank of India", "BANKINDIA.NS"), ("Hindustan Copper", "HINDCOPPER.NS"),
+                         ("Tata Technologies", "TATATECH.NS"), ("Mahindra Finance", "M&MFIN.NS")]:
+        assert tool.resolve_ticker(name) == symbol
+        assert tool.resolve_ticker(name) == symbol
+    # The fuzzy match still catches typos the search does not know
+    assert tool.resolve_ticker("relaince") == "RELIANCE.NS"
+
+
+def _ohlcv_frame(end, days):
+    index = pd.bdate_range(end=end, periods=days, tz="Asia/Kolkata")
+    close = 100 + np.cumsum(np.random.default_rng(1).normal(0, 1, days))
+    return pd.DataFrame({"Open": close, "High": close + 1, "Low": close - 1, "Close": close, "Volume": 1e6}, index=index)
+
+
+def test_ohlcv_store_fetches_only_missing_bars(tmp_path):
+    ist = ZoneInfo("Asia/Kolkata")
+    calls = []
+
+    def fetcher(symbol, start, period):
+        calls.append(start)
+        full = _ohlcv_frame("2025-01-13", 400)
+        if start is None:
+            return full[full.index.date <= datetime(2025, 1, 10).date()]
+        return full[full.index.date >= start]
+
+    saturday = datetime(2025, 1, 11, 18, 0, tzinfo=ist)
+    store = OhlcvStore(root=tmp_path, fetcher=fetcher, ttl=lambda symbol: 60, now=lambda: saturday)
+    first = store.get_history("tcs.ns", "1y")
+    assert calls == [None]
+    assert first.index[-1] == pd.Timestamp("2025-01-10")
+    assert 250 <= len(first) <= 262
+
+    # A restart with the same store is warm: nothing to download until a session closes
+    restarted = OhlcvStore(root=tmp_path, fetcher=fetcher, ttl=lambda symbol: 60, now=lambda: saturday)
+    assert restarted.get_history("TCS.NS", "max").equals(store.get_history("TCS.NS", "max"))
+    assert calls == [None]
+
+    monday_close = datetime(2025, 1, 13, 16, 0, tzinfo=ist)
+    later = OhlcvStore(root=tmp_path, fetcher=fetcher, ttl=lambda symbol: 60, now=lambda: monday_close)
+    assert later.get_history("TCS.NS", "5d").index[-1] == pd.Timestamp("2025-01-13")
+    assert calls[-1] == datetime(2025, 1, 10).date()     # the last stored bar is checked again
+    assert later.stats["bars_fetched"] == 2
+
+
+def test_ohlcv_store_downloads_again_after_a_split(tmp_path):
+    ist = ZoneInfo("Asia/Kolkata")
+    calls = []
+    split = {"ratio": 1.0}
+
+    def fetcher(symbol, start, period):
+        calls.append(start)
+        full = _ohlcv_frame("2025-01-13", 400)
+        full[["Open", "High", "Low", "Close"]] /= split["ratio"]
+        if start is None:
+            return full[full.index.date <= datetime(2025, 1, 10).date()]
+        return full[full.index.date >= start]
+
+    OhlcvStore(root=tmp_path, fetcher=fetcher, now=lambda: datetime(2025, 1, 11, 18, 0, tzinfo=ist)).get_history("TCS.NS")
+
+    # A 1:2 split before Monday's session halves every upstream price
+    split["ratio"] = 2.0
+    later = OhlcvStore(root=tmp_path, fetcher=fetcher, now=lambda: datetime(2025, 1, 13, 16, 0, tzinfo=ist))
+    closes = later.get_history("TCS.NS", "max")["Close"]
+    expected = _ohlcv_frame("2025-01-13", 400)["Close"] / 2
+    assert calls[1] == datetime(2025, 1, 10).date()
+    assert calls[2] == expected.index[-len(closes)].date()
+    assert np.allclose(closes.to_numpy(), expected.tail(len(closes)).to_numpy())
+
+    restarted = OhlcvStore(root=tmp_path, fetcher=fetcher, now=lambda: datetime(2025, 1, 13, 18, 0, tzinfo=ist))
+    assert restarted.get_history("TCS.NS", "max")["Close"].equals(closes)
+
+
+def test_stock_analytics_runs_offline_from_fixture_store(tmp_path):
+    fixture = OhlcvStore(root=tmp_path, fetcher=lambda symbol, start, period: _ohlcv_frame("2025-01-10", 300),
+                         now=lambda: datetime(2025, 1, 11, tzinfo=ZoneInfo("Asia/Kolkata")))
+    fixture.get_history("FIXTURE.NS")
+
+    def offline(symbol, start, period):
+        raise ConnectionError("offline")
+
+    store = OhlcvStore(root=tmp_path, fetcher=offline)
+    result = InvestmentNavigator(history=store).get_stock_analytics("FIXTURE.NS")
+
+    closes = _ohlcv_frame("2025-01-10", 300)["Close"]
+    assert "error" not in result
+    assert result["current_price"] == round(closes.iloc[-1], 2)
+    assert result["52_week_high"] == round(closes.tail(HIGH_LOW_WINDOW).max(), 2)
+    assert "forecast_chart_path" not in result
+
+
+def test_indicator_engine_matches_batch_and_keeps_live_bars_provisional():
+    rng = np.random.default_rng(2)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (4, 320)), axis=1))
+    closes[3, :200] = np.nan  # listed later
+    dates = np.datetime64("2024-01-01") + np.arange(320)
+    batch = compute_indicators(closes)
+
+    engine = IndicatorEngine()
+    for row in range(len(closes)):
+        # Fed in two chunks, as bars arrive
+        engine.update(f"S{row}", dates[:300], closes[row, :300])
+        streamed = engine.update(f"S{row}", dates, closes[row])
+        for key, value in streamed.items():
+            assert value == pytest.approx(batch[key][row], rel=1e-9), key
+
+    # A bar after the last completed session is not committed
+    live = engine.update("S0", np.append(dates, dates[-1] + 1), np.append(closes[0], closes[0, -1] * 1.1),
+                         completed_through=dates[-1])
+    assert live["current_price"] == pytest.approx(closes[0, -1] * 1.1)
+    assert engine.get("S0")["current_price"] == pytest.approx(closes[0, -1])
+    assert engine.get("S0")["bars"] == 320
+
+
+def test_forecast_service_serves_cache_and_refits_in_background():
+    calls = []
+    release = threading.Event()
+
+    def fitter(closes, start_params=None):
+        calls.append(start_params)
+        if len(calls) > 1:
+            release.wait(5)
+        return {"forecast": [float(closes[-1])] * 7, "params": [len(calls)], "warm_start": start_params is not None}
+
+    service = ForecastService(fitter=fitter)
+    closes = np.arange(100.0, 140.0)
+    monday, tuesday = datetime(2025, 1, 13).date(), datetime(2025, 1, 14).date()
+
+    first = service.get_forecast("tcs.ns", closes, monday)
+    assert first["status"] == "ready" and first["forecast"][0] == 139.0
+    assert service.get_forecast("TCS.NS", closes, monday)["status"] == "ready"
+    assert len(calls) == 1
+
+    # A new day returns yesterday's forecast at once and warm-starts the refit
+    started = time.monotonic()
+    stale = service.get_forecast("TCS.NS", np.append(closes, 150.0), tuesday)
+    assert time.monotonic() - started < 1
+    assert stale["status"] == "stale" and stale["as_of"] == "2025-01-13"
+    release.set()
+    for _ in range(100):
+        fresh = service.get_forecast("TCS.NS", np.append(closes, 150.0), tuesday)
+        if fresh["status"] == "ready":
+            break
+        time.sleep(0.01)
+    assert fresh["forecast"][0] == 150.0
+    assert calls == [None, [1]]
+
+
+def test_fit_forecast_warm_start_matches_cold_fit():
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(3).normal(0, 0.01, 120)))
+    cold = fit_forecast(closes[:-1])
+    warm = fit_forecast(closes, start_params=cold["params"])
+    assert warm["warm_start"]
+    assert warm["forecast"] == pytest.approx(fit_forecast(closes)["forecast"], rel=1e-3)
+
+
+def test_get_forecasts_fits_watchlist_in_process_pool(tmp_path):
+    frames = {"TCS.NS": _ohlcv_frame("2025-01-10", 120), "INFY.NS": _ohlcv_frame("2025-01-10", 120),
+              "NEWCO.NS": _ohlcv_frame("2025-01-10", 10)}
+    store = OhlcvStore(root=tmp_path, fetcher=lambda symbol, start, period: frames[symbol], now=lambda: datetime(2025, 1, 11))
+    service = ForecastService()
+    tool = InvestmentNavigator(history=store, forecasts=service, tickers=TickerIndex(seed_path=None, store_path=None))
+
+    timed_out = tool.get_forecasts(["TCS.NS", "INFY.NS"], max_workers=1, timeout=1e-4)
+    assert not timed_out["forecasts"]
+    assert all("timed out" in failure["error"] for failure in timed_out["failures"])
+
+    result = tool.get_forecasts(["TCS.NS", "INFY.NS", "NEWCO.NS"], max_workers=1)
+    assert [row["ticker"] for row in result["forecasts"]] == ["TCS.NS", "INFY.NS"]
+    assert result["failures"] == [{"query": "NEWCO.NS", "ticker": "NEWCO.NS", "error": "Not enough history for a forecast"}]
+    row = result["forecasts"][0]
+    assert len(row["forecast_next_7d"]) == 7
+    assert row["predicted_trend"] in ("Bullish", "Bearish", "Stable")
+    assert service.stats["fits"] == 2
+
+    # A second scan of the same bars is served from the cache
+    assert tool.get_forecasts(["TCS.NS"], max_workers=1)["forecasts"][0]["forecast_next_7d"] == row["forecast_next_7d"]
+    assert service.stats["fits"] == 2
+
+    with pytest.raises(ValueError):
+        tool.get_forecasts(["TCS.NS"], max_workers=0)
+
+
+def test_concurrent_forecast_scans_share_one_process_pool():
+    closes = _ohlcv_frame("2025-01-10", 120)["Close"].to_numpy()
+    service = ForecastService(processes=2)
+    large = {f"S{index}.NS": (closes + index, date(2025, 1, 10)) for index in range(6)}
+    small = {f"T{index}.NS": (closes - index, date(2025, 1, 10)) for index in range(2)}
+    results = {}
+    scans = [
+        threading.Thread(target=lambda: results.update(large=service.forecast_many(large, max_workers=2))),
+        threading.Thread(target=lambda: results.update(small=service.forecast_many(small, max_workers=1))),
+    ]
+    for scan in scans:
+        scan.start()
+    for scan in scans:
+        scan.join()
+
+    pool = service._processes
+    assert all(view["status"] == "ready" for view in results["large"].values())
+    assert all(view["status"] == "ready" for view in results["small"].values())
+    assert service.stats["fits"] == 8
+    # A scan asking for fewer workers neither resizes nor replaces the pool
+    service.forecast_many({"U.NS": (closes * 2, date(2025, 1, 10))}, max_workers=1)
+    assert service._processes is pool
+
+
+def test_stock_chart_is_rendered_lazily_and_served_from_cache(tmp_path):
+    store = OhlcvStore(root=tmp_path / "ohlcv", fetcher=lambda symbol, start, period: _ohlcv_frame("2025-01-10", 300),
+                       now=lambda: datetime(2025, 1, 11, tzinfo=ZoneInfo("Asia/Kolkata")))
+    charts = ChartRenderer(root=tmp_path / "plots")
+    tool = InvestmentNavigator(history=store, charts=charts)
+
+    tool.get_stock_analytics("FIXTURE.NS")
+    assert not (tmp_path / "plots").exists()
+
+    first = tool.get_stock_chart("FIXTURE.NS")
+    assert first["chart_status"] == "rendered"
+    assert first["chart_path"].endswith(".png") and "FIXTURE.NS_2025-01-10_" in first["chart_path"]
+    second = tool.get_stock_chart("FIXTURE.NS")
+    assert second["chart_status"] == "cached"
+    assert second["chart_path"] == first["chart_path"]
+    assert charts.stats == {"renders": 1, "hits": 1}
+
+
+def test_pending_chart_answers_202_with_a_retry_hint(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from dunk_ai.api.main import app
+    from dunk_ai.api.routes import investment as investment_routes
+    from dunk_ai.tools.investment_navigator import charts as charts_module
+
+    release = threading.Event()
+    draw = charts_module.render_forecast_chart
+
+    def slow_render(*args, **kwargs):
+        release.wait(10)
+        return draw(*args, **kwargs)
+
+    monkeypatch.setattr(charts_module, "render_forecast_chart", slow_render)
+    store = OhlcvStore(root=tmp_path / "ohlcv", fetcher=lambda symbol, start, period: _ohlcv_frame("2025-01-10", 300),
+                       now=lambda: datetime(2025, 1, 11, tzinfo=ZoneInfo("Asia/Kolkata")))
+    tool = InvestmentNavigator(history=store, charts=ChartRenderer(root=tmp_path / "plots", wait=0.05))
+    monkeypatch.setattr(investment_routes, "_navigator", lambda: tool)
+    client = TestClient(app)
+
+    pending = client.get("/api/investment/plot/FIXTURE.NS")
+    assert pending.status_code == 202
+    assert pending.headers["Retry-After"] == str(pending.json()["retry_after_seconds"])
+    assert pending.json()["chart_status"] == "pending" and "chart_path" not in pending.json()
+
+    release.set()
+    for _ in range(100):
+        ready = client.get("/api/investment/plot/FIXTURE.NS")
+        if ready.status_code == 200:
+            break
+        time.sleep(0.05)
+    assert ready.status_code == 200 and ready.json()["chart_path"].endswith(".png")
+
+
+SCHEMES = [
+    {"schemeCode": 122639, "schemeName": "Parag Parikh Flexi Cap Fund - Direct Plan - Growth"},
+    {"schemeCode": 122640, "schemeName": "Parag Parikh Flexi Cap Fund - Regular Plan - Growth"},
+    {"schemeCode": 122641, "schemeName": "Parag Parikh Flexi Cap Fund - Direct Plan - IDCW"},
+    {"schemeCode": 118955, "schemeName": "HDFC Flexi Cap Fund - Growth Option - Direct Plan"},
+    {"schemeCode": 120503, "schemeName": "Axis ELSS Tax Saver Fund - Direct Plan - Growth Option"},
+]
+
+
+def _nav_rows(start, days, annual=0.10):
+    """mfapi-style rows (newest first) compounding at `annual` per year."""
+    rows = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        rows.append({"date": day.strftime("%d-%m-%Y"), "nav": f"{100 * (1 + annual) ** (offset / 365.25):.6f}"})
+    return rows[::-1]
+
+
+def test_scheme_index_fuzzy_search_and_persistence(tmp_path):
+    calls = []
+    store = tmp_path / "schemes.json"
+    index = SchemeIndex(store_path=store, fetcher=lambda: calls.append(1) or SCHEMES)
+
+    assert index.search("parag parikh flexi cap")[0]["scheme_code"] == "122639"
+    assert index.search("parag parik flexy cap")[0]["scheme_code"] == "122639"
+    assert index.search("axis tax saver")[0]["scheme_code"] == "120503"
+    assert index.search("nonexistent bluechip") == []
+
+    # A restart reads the stored list instead of downloading it again
+    reloaded = SchemeIndex(store_path=store, fetcher=lambda: calls.append(1) or SCHEMES)
+    assert reloaded.name_of("118955") == SCHEMES[3]["schemeName"]
+    assert calls == [1]
+
+
+def test_nav_cache_fetches_only_new_rows_and_computes_returns(tmp_path):
+    rows = _nav_rows(date(2019, 1, 1), 6 * 365)
+    starts = []
+
+    def fetcher(code, start):
+        starts.append(start)
+        newer = [row for row in rows if start is None or datetime.strptime(row["date"], "%d-%m-%Y").date() >= start]
+        return {"meta": {"scheme_name": "Test Fund"}, "data": newer}
+
+    now = [0.0]
+    cache = NavCache(root=tmp_path, fetcher=fetcher, ttl=60, clock=lambda: now[0])
+    meta, dates, navs = cache.get_history("122639")
+    assert meta["scheme_name"] == "Test Fund" and len(dates) == 6 * 365
+    assert cache.get_history("122639")[1] is dates  # within the TTL
+
+    rows[:0] = _nav_rows(date(2019, 1, 1), 6 * 365 + 2)[:2]
+    now[0] = 61.0
+    _, dates, navs = cache.get_history("122639")
+    assert starts == [None, dates[-3].item() + timedelta(days=1)]
+    assert cache.stats["rows_fetched"] == 6 * 365 + 2
+
+    restarted = NavCache(root=tmp_path, fetcher=fetcher)
+    assert len(restarted.get_history("122639")[1]) == len(dates)
+    assert starts[-1] == dates[-1].item() + timedelta(days=1)
+
+    result = nav_returns(dates, navs)
+    assert result["returns"]["1Y"]["return_pct"] == pytest.approx(10, abs=0.1)
+    assert result["returns"]["3Y"]["cagr_pct"] == pytest.approx(10, abs=0.1)
+    assert result["returns"]["5Y"]["sip_xirr_pct"] == pytest.approx(10, abs=0.1)
+    assert "sip_xirr_pct" not in result["returns"]["6M"]
+    assert result["since_inception_cagr_pct"] == pytest.approx(10, abs=0.05)
+
+
+def test_mutual_fund_nav_and_returns_served_from_cache(tmp_path):
+    rows = _nav_rows(date(2022, 1, 1), 800)
+    cache = NavCache(root=tmp_path / "nav", fetcher=lambda code, start: {"meta": {"scheme_name": "PPFAS"}, "data": rows})
+    tool = InvestmentNavigator(schemes=SchemeIndex(store_path=None, fetcher=lambda: SCHEMES), navs=cache)
+
+    nav = tool.get_mutual_fund_nav("Parag Parikh Flexi Cap")
+    assert nav["scheme_code"] == "122639"
+    assert nav["latest_nav"] == float(rows[0]["nav"]) and nav["date"] == rows[0]["date"]
+
+    returns = tool.get_mutual_fund_returns("122639")
+    assert returns["returns"]["5Y"] is None
+    assert returns["returns"]["1Y"]["cagr_pct"] == pytest.approx(10, abs=0.1)
+
+    history = tool.get_mutual_fund_history("122639", "1m")
+    assert history["dates"][0] == "2024-02-10" and history["dates"][-1] == "2024-03-10"
+    assert len(history["navs"]) == len(history["dates"])
+    assert cache.stats["fetches"] == 1
+
+
+def test_fifo_lots_and_vectorized_xirr():
+    lots = match_lots(np.array([0, 0, 0, 1]), np.array([10.0, 10.0, -15.0, 4.0]), np.array([100.0, 120.0, 130.0, 50.0]), 2)
+    assert lots["open_quantity"].tolist() == [5.0, 4.0]
+    assert lots["cost_basis"].tolist() == [600.0, 200.0]
+    assert lots["realized_pnl"].tolist() == [350.0, 0.0]
+    with pytest.raises(ValueError):
+        match_lots(np.array([0]), np.array([-1.0]), np.array([100.0]), 1)
+
+    rates = xirr(
+        np.array([[-1000.0, 0.0, 1100.0], [-1000.0, -1000.0, 2310.0], [1000.0, 0.0, 10.0]]),
+        np.array([-2.0, -1.0, 0.0])
+    )
+    assert rates[0] == pytest.approx(np.sqrt(1.1) - 1)
+    assert rates[1] == pytest.approx(0.10)
+    assert np.isnan(rates[2])  # no outflow, no rate
+
+
+def test_portfolio_summary_values_holdings_from_one_batched_download(tmp_path):
+    today = date.today()
+    index = pd.bdate_range(end=pd.Timestamp(today), periods=300)
+    frame = pd.DataFrame({"Close": np.linspace(100, 200, 300)}, index=index)
+    batches = []
+
+    def batch_fetcher(symbols, period):
+        batches.append(sorted(symbols))
+        return {symbol: frame for symbol in symbols if symbol != "GONE.NS"}
+
+    cache = MarketDataCache(
+        fetcher=lambda symbol, period: pytest.fail("single-symbol fetch should not be used"),
+        batch_fetcher=batch_fetcher
+    )
+    navs = NavCache(
+        root=tmp_path / "nav",
+        fetcher=lambda code, start: {"meta": {"scheme_name": "Fund"}, "data": _nav_rows(today - timedelta(days=730), 731)}
+    )
+    store = PortfolioStore(tmp_path / "portfolio.db")
+    tool = InvestmentNavigator(market_data=cache, navs=navs, portfolio=store)
+    tool.resolve_ticker = lambda query: query.upper()
+
+    first = index[0].date()
+    tool.add_portfolio_transaction("u1", "tcs.ns", "buy", 10, 100, first)
+    tool.add_portfolio_transaction("u1", "tcs.ns", "sell", 4, 150, index[150].date())
+    tool.add_portfolio_transaction("u1", "122639", "buy", 100, 100, today - timedelta(days=730), "mutual_fund")
+    tool.add_portfolio_transaction("u1", "gone.ns", "buy", 1, 10, first)
+    with pytest.raises(ValueError):
+        tool.add_portfolio_transaction("u1", "TCS.NS", "sell", 7, 150, today)
+    assert len(tool.get_portfolio_transactions("u1")["transactions"]) == 4
+
+    summary = tool.portfolio_summary("u1")
+    assert batches == [["GONE.NS", "TCS.NS"]]
+    holdings = {row["symbol"]: row for row in summary["holdings"]}
+    assert holdings["TCS.NS"]["quantity"] == 6 and holdings["TCS.NS"]["market_value"] == 1200
+    assert holdings["TCS.NS"]["realized_pnl"] == pytest.approx(200, abs=1)
+    assert holdings["122639"]["market_value"] == pytest.approx(100 * 100 * 1.1 ** (730 / 365.25), rel=1e-6)
+    assert holdings["122639"]["xirr_pct"] == pytest.approx(10, abs=0.1)
+    assert summary["missing_prices"] == ["GONE.NS"]
+    assert summary["total_value"] == pytest.approx(1200 + holdings["122639"]["market_value"], abs=0.01)
+    assert sum(summary["allocation_pct"].values()) == pytest.approx(100, abs=0.01)
+    assert summary["max_drawdown_pct"] <= 0
+
+    transaction_id = tool.get_portfolio_transactions("u1")["transactions"][-1]["id"]
+    assert tool.delete_portfolio_transaction("u1", transaction_id)["deleted"] == transaction_id
+    assert "error" in tool.delete_portfolio_transaction("u1", transaction_id)
+    assert InvestmentNavigator(portfolio=store).portfolio_summary("u2")["holdings"] == []
+
+
+def test_back_dated_sells_and_deleted_buys_cannot_break_the_portfolio(tmp_path):
+    store = PortfolioStore(tmp_path / "portfolio.db")
+    buy = store.add_transaction("u1", "TCS.NS", "buy", 10, 100, date(2024, 1, 1))
+    store.add_transaction("u1", "TCS.NS", "sell", 10, 120, date(2024, 3, 1))
+
+    # The later sell already takes the whole holding
+    with pytest.raises(ValueError, match="2024-03-01"):
+        store.add_transaction("u1", "TCS.NS", "sell", 5, 110, date(2024, 2, 1))
+    with pytest.raises(ValueError):
+        store.delete_transaction("u1", buy["id"])
+    # Holdings are keyed by symbol and asset type, as in valuation
+    store.add_transaction("u1", "TCS.NS", "buy", 5, 100, date(2024, 1, 1), "mutual_fund")
+    with pytest.raises(ValueError):
+        store.add_transaction("u1", "TCS.NS", "sell", 5, 110, date(2024, 2, 1))
+
+    store.add_transaction("u1", "TCS.NS", "buy", 5, 105, date(2024, 1, 15))
+    store.add_transaction("u1", "TCS.NS", "sell", 5, 110, date(2024, 2, 1))
+    rows = [row for row in store.transactions("u1") if row["asset_type"] == "stock"]
+    quantity = np.array([row["quantity"] if row["side"] == "buy" else -row["quantity"] for row in rows])
+    lots = match_lots(np.zeros(len(rows), dtype=int), quantity, np.array([row["price"] for row in rows]), 1)
+    assert lots["open_quantity"][0] == pytest.approx(0)
+    assert len(store.transactions("u1")) == 5
+
+
+def test_xirr_many_solves_ragged_cash_flow_sets_in_one_batch(monkeypatch):
+    rng = np.random.default_rng(1)
+    today = np.datetime64("2025-01-01", "D")
+    rates = rng.uniform(-0.2, 0.4, 300)
+    flow_sets = []
+    for rate in rates:
+        days = np.sort(rng.choice(np.arange(30, 3000), int(rng.integers(1, 60)), replace=False))
+        amounts = -rng.uniform(1_000, 10_000, len(days))
+        value = -(amounts * (1 + rate) ** (days / 365.25)).sum()
+        flow_sets.append((np.append(today - days, today), np.append(amounts, value)))
+    flow_sets.append(([today], [-100.0]))  # nothing returned yet
+
+    solved = xirr_many(flow_sets)
+    assert solved[:-1] == pytest.approx(rates, abs=1e-6)
+    assert np.isnan(solved[-1])
+
+    # Sets Newton leaves unconverged are solved by the bracketed fallback
+    monkeypatch.setattr(returns, "XIRR_ITERATIONS", 1)
+    assert xirr([[-1.0, 0.0, 5.0], [-1.0, 0.0, 0.5]], [-0.2, -0.1, 0.0]) == pytest.approx([5 ** 5 - 1, 0.5 ** 5 - 1])
+    monkeypatch.undo()
+
+    assert cagr(100, 121, 2) == pytest.approx(0.10)
+    assert np.isnan(cagr(0, 121, 2))
+    # 100 grows 10%, then 100 more is added and everything doubles
+    assert time_weighted_return([100, 110, 420], [100, 0, 100]) == pytest.approx(1.1 * (320 / 110) - 1)
+
+
+def test_sip_projection_is_seeded_chunked_and_matches_closed_form():
+    # No volatility: every path is the annuity-due future value at 12% a year
+    monthly = 1.12 ** (1 / 12)
+    expected = 10_000 * sum(monthly ** k for k in range(1, 181))
+    flat = simulate_sip(10_000, 15, 0.12, 0.0, paths=10, seed=1)
+    assert flat["final_value"]["p5"] == pytest.approx(expected) and flat["final_value"]["p95"] == pytest.approx(expected)
+    assert flat["total_invested"] == 1_800_000 and flat["median_xirr_pct"] == pytest.approx(12, abs=0.01)
+    assert [band["year"] for band in flat["bands"]] == list(range(1, 16))
+
+    result = simulate_sip(10_000, 15, 0.12, 0.18, goal=5_000_000, paths=10_000, seed=42)
+    assert simulate_sip(10_000, 15, 0.12, 0.18, goal=5_000_000, paths=10_000, seed=42, chunk_size=777) == result
+    final = result["final_value"]
+    assert final["p5"] < final["p25"] < final["p50"] < final["p75"] < final["p95"]
+    assert final["p50"] == pytest.approx(expected, rel=0.05)
+    assert 0 < result["goal_probability_pct"] < 100
+
+    stepped = simulate_sip(10_000, 2, 0.0, 0.0, step_up_pct=10, initial_amount=50_000, paths=1)
+    assert stepped["total_invested"] == 50_000 + 120_000 + 132_000
+    with pytest.raises(ValueError):
+        simulate_sip(10_000, 0, 0.12, 0.18)
+
+
+def test_project_sip_estimates_return_and_volatility_from_nav_history(tmp_path):
+    today = date.today()
+    rows = _nav_rows(today - timedelta(days=4 * 365), 4 * 365 + 1)
+    navs = NavCache(root=tmp_path / "nav", fetcher=lambda code, start: {"meta": {"scheme_name": "Fund"}, "data": rows})
+    tool = InvestmentNavigator(schemes=SchemeIndex(store_path=None, fetcher=lambda: SCHEMES), navs=navs)
+
+    projection = tool.project_sip(10_000, 10, scheme="122639", goal=2_000_000, paths=2_000, seed=7)
+    assert projection["basis"]["source"] == "mutual_fund" and projection["basis"]["scheme_code"] == "122639"
+    assert projection["annual_return_pct"] == pytest.approx(10, abs=0.05)
+    assert projection["annual_volatility_pct"] == pytest.approx(0, abs=0.01)
+    assert projection["goal_probability_pct"] == 100
+
+    manual = tool.project_sip(10_000, 10, scheme="122639", annual_volatility_pct=15, paths=2_000, seed=7)
+    assert manual["annual_volatility_pct"] == 15 and "goal_probability_pct" not in manual
+    with pytest.raises(ValueError):
+        tool.project_sip(10_000, 10, annual_return_pct=12)
+    with pytest.raises(ValueError):
+        estimate_parameters(np.array(["2024-01-01", "2024-03-01"], dtype="datetime64[D]"), np.array([1.0, 1.1]))
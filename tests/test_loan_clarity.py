@@ -15,9 +15,13 @@ Tests cover:
 
 import pytest
 from datetime import datetime
+import numpy as np
 from dunk_ai.tools.loan_clarity.logic import (
     flat_rate,
     reducing_balance,
+    flat_rate_batch,
+    reducing_balance_batch,
+    get_loan_terms,
     calculate_prepayment_impact,
     calculate_early_settlement,
     modify_emi,
@@ -25,13 +29,32 @@ from dunk_ai.tools.loan_clarity.logic import (
 )
 from dunk_ai.tools.loan_clarity.schedule import (
     generate_amortization_schedule,
+    generate_amortization_columns,
+    iter_amortization_columns,
+    iter_amortization_schedule,
+    extend_year_wise_summary,
+    schedule_columns_to_rows,
     get_outstanding_principal,
     get_year_wise_summary
 )
+from dunk_ai.tools.loan_clarity.dates import generate_payment_dates
+from dunk_ai.tools.loan_clarity.aggregation import aggregate_loan_years, aggregate_schedule
+from dunk_ai.tools.loan_clarity.scenario import simulate_loan_scenario
+from dunk_ai.tools.loan_clarity.sensitivity import (
+    SENSITIVITY_REQUEST_MAX_AXIS,
+    SENSITIVITY_REQUEST_MAX_CELLS,
+    loan_sensitivity_grid,
+    sensitivity_grid_to_lists,
+)
 from dunk_ai.tools.loan_clarity.comparison import compare_loans, break_even_analysis
 from dunk_ai.tools.loan_clarity.tax_benefits import calculate_tax_benefits, calculate_lifetime_tax_benefits
 from dunk_ai.tools.loan_clarity.eligibility import calculate_loan_eligibility, calculate_affordability
-from dunk_ai.tools.loan_clarity.effective_rate import calculate_effective_rate, calculate_apr
+from dunk_ai.tools.loan_clarity.effective_rate import (
+    calculate_effective_rate,
+    calculate_apr,
+    solve_periodic_irr,
+    solve_periodic_irr_batch
+)
 
 
 # ========== Basic EMI Calculation Tests ==========
@@ -86,6 +109,74 @@ def test_reducing_balance_annually():
     assert round(total_interest, 2) == pytest.approx(7660.26, rel=1e-2)
 
 
+def test_reducing_balance_batch_matches_scalar():
+    """Test batch reducing balance agrees with the scalar calculator"""
+    loans = [(100000, 12, 1, "monthly"), (50000, 10, 2, "annually"), (2500000, 8.5, 20, "quarterly")]
+    result = reducing_balance_batch(*(list(column) for column in zip(*loans)))
+
+    for idx, loan in enumerate(loans):
+        emi, total_interest, total_payment, num_pay = reducing_balance(*loan)
+        assert result["emi"][idx] == pytest.approx(emi, abs=0.01)
+        assert result["total_interest"][idx] == pytest.approx(total_interest, abs=0.01)
+        assert result["total_payment"][idx] == pytest.approx(total_payment, abs=0.01)
+        assert result["number_of_payments"][idx] == num_pay
+
+
+def test_zero_rate_loan_splits_principal_evenly():
+    """Test a 0% loan gives the same P / n terms from the scalar and batch calculators"""
+    emi, total_interest, total_payment, num_pay = reducing_balance(100000, 0, 5, "monthly")
+    batch = reducing_balance_batch([100000], [0], [5])
+
+    assert (emi, total_interest, total_payment, num_pay) == (1666.67, 0.0, 100000.0, 60)
+    assert batch["emi"][0] == emi
+    assert batch["total_interest"][0] == total_interest
+    assert batch["total_payment"][0] == total_payment
+    assert get_loan_terms(100000, 0, 5, "monthly").outstanding_after(12) == 80000.0
+
+
+def test_batch_requests_are_capped():
+    """Test API/MCP batches are limited in rows while library callers are not"""
+    from pydantic import ValidationError
+
+    from dunk_ai.api.routes.loan_clarity import BatchEmiRequest
+    from dunk_ai.tools.loan_clarity import BATCH_REQUEST_MAX_ROWS
+
+    rows = BATCH_REQUEST_MAX_ROWS + 1
+    with pytest.raises(ValueError, match="limit 50000"):
+        reducing_balance_batch([100000] * rows, [10] * rows, [5] * rows, max_rows=BATCH_REQUEST_MAX_ROWS)
+    assert len(reducing_balance_batch([100000] * rows, [10] * rows, [5] * rows)["emi"]) == rows
+
+    with pytest.raises(ValidationError):
+        BatchEmiRequest(principal=[100000] * rows, annual_rate=[10], tenure_years=[5])
+
+
+def test_flat_rate_batch():
+    """Test batch flat rate calculation with a shared frequency"""
+    result = flat_rate_batch(np.array([100000, 100000]), [10, 12], [1, 2], "quarterly")
+
+    assert result["number_of_payments"].tolist() == [4, 8]
+    assert result["total_interest"].tolist() == [10000.0, 24000.0]
+    assert result["emi"].tolist() == [27500.0, 15500.0]
+
+
+def test_batch_validation_reports_row():
+    """Test that batch validation names the offending row"""
+    with pytest.raises(ValueError, match="Row 1"):
+        reducing_balance_batch([100000, 100000], [10, -1], [1, 1], "monthly")
+    with pytest.raises(ValueError):
+        flat_rate_batch([100000], [10, 12], [1, 1], "monthly")
+
+
+def test_loan_terms_are_cached_and_shared():
+    """Test that normalized inputs hit the same cached loan terms"""
+    terms = get_loan_terms(1000000, 10, 20, "monthly")
+
+    assert get_loan_terms(1000000.0, 10.0, 20.0, "monthly", "reducing") is terms
+    assert terms.as_tuple() == reducing_balance(1000000, 10, 20, "monthly")
+    assert terms.outstanding_after(60) == get_outstanding_principal(1000000, 10, 20, "monthly", 60)
+    assert get_loan_terms(1000000, 10, 20, "monthly", "flat") is not terms
+
+
 # ========== Amortization Schedule Tests ==========
 
 def test_generate_amortization_schedule():
@@ -105,6 +196,134 @@ def test_generate_amortization_schedule():
     assert schedule[-1]["cumulative_principal"] == pytest.approx(100000, rel=1e-1)
 
 
+def test_amortization_columns_match_rows():
+    """Test columnar schedule and row schedule carry the same values"""
+    start = datetime(2024, 1, 1)
+    columns = generate_amortization_columns(5000000, 8.5, 30, "monthly", "reducing", start)
+    rows = generate_amortization_schedule(5000000, 8.5, 30, "monthly", "reducing", start)
+
+    assert len(columns["payment_number"]) == len(rows) == 360
+    assert columns["closing_balance"][-1] < columns["emi"][-1]
+    assert columns["cumulative_principal"][-1] + columns["closing_balance"][-1] == pytest.approx(5000000)
+    assert schedule_columns_to_rows(columns) == rows
+    assert get_year_wise_summary(columns) == get_year_wise_summary(rows)
+
+
+def _reference_schedule(principal, annual_rate, tenure_years, repayment_frequency, interest_method):
+    """Period-by-period schedule of the original engine (without dates)."""
+    periods_per_year = {"monthly": 12, "quarterly": 4, "annually": 1}[repayment_frequency]
+    number_of_payments = int(tenure_years * periods_per_year)
+    calculate = flat_rate if interest_method == "flat" else reducing_balance
+    emi = calculate(principal, annual_rate, tenure_years, repayment_frequency)[0]
+    periodic_rate = annual_rate / 100.0 / periods_per_year
+    balance, cumulative_principal, cumulative_interest, rows = principal, 0.0, 0.0, []
+    for payment_number in range(1, number_of_payments + 1):
+        opening_balance = round(balance, 2)
+        if interest_method == "flat":
+            interest_paid = round(principal * annual_rate * tenure_years / 100.0 / number_of_payments, 2)
+        else:
+            interest_paid = round(balance * periodic_rate, 2)
+        principal_paid = round(emi - interest_paid, 2)
+        emi_paid = emi
+        if principal_paid > balance:
+            principal_paid = round(balance, 2)
+            interest_paid = round(emi - principal_paid, 2)
+            emi_paid = round(principal_paid + interest_paid, 2)
+        closing_balance = round(balance - principal_paid, 2)
+        if closing_balance < 0:
+            closing_balance = 0.0
+            principal_paid = round(balance, 2)
+            emi_paid = round(principal_paid + interest_paid, 2)
+        cumulative_principal += principal_paid
+        cumulative_interest += interest_paid
+        rows.append((payment_number, opening_balance, round(emi_paid, 2), principal_paid, interest_paid,
+                     closing_balance, round(cumulative_principal, 2), round(cumulative_interest, 2)))
+        balance = closing_balance
+        if closing_balance <= 0:
+            break
+    return rows
+
+
+def test_amortization_columns_match_period_by_period_engine():
+    """Test interest is charged on the rounded running balance, row for row"""
+    rng = np.random.default_rng(0)
+    columns = ("payment_number", "opening_balance", "emi", "principal_paid", "interest_paid",
+               "closing_balance", "cumulative_principal", "cumulative_interest")
+    for index in range(300):
+        loan = (
+            float(rng.integers(10_000, 20_000_000)) + (0.0 if index % 2 else 0.55),
+            round(float(rng.uniform(0.5, 24)), 2),
+            int(rng.integers(1, 31)),
+            ("monthly", "quarterly", "annually")[index % 3],
+            "flat" if index % 5 == 0 else "reducing",
+        )
+        expected = _reference_schedule(*loan)
+        for chunk_size in (None, 37):
+            chunks = list(iter_amortization_columns(*loan, chunk_size=chunk_size))
+            actual = list(zip(*(np.concatenate([chunk[name] for chunk in chunks]).tolist() for name in columns)))
+            assert actual == expected, loan
+
+
+def test_flat_amortization_columns():
+    """Test flat rate columns keep interest constant"""
+    columns = generate_amortization_columns(100000, 10, 1, "monthly", "flat")
+
+    assert len(columns["interest_paid"]) == 12
+    assert set(columns["interest_paid"][:-1].tolist()) == {833.33}
+    assert columns["cumulative_principal"][-1] == pytest.approx(100000, abs=1)
+
+
+def test_streamed_schedule_matches_full_schedule():
+    """Test chunked generators reproduce the full schedule and yearly summary"""
+    start = datetime(2024, 4, 1)
+    rows = generate_amortization_schedule(2000000, 9, 20, "monthly", "reducing", start)
+
+    assert list(iter_amortization_schedule(2000000, 9, 20, "monthly", "reducing", start, chunk_size=50)) == rows
+
+    summary = []
+    for chunk in iter_amortization_columns(2000000, 9, 20, "monthly", "reducing", start, chunk_size=50):
+        assert len(chunk["payment_number"]) <= 50
+        extend_year_wise_summary(summary, chunk)
+    expected = get_year_wise_summary(rows)
+    assert [year["year"] for year in summary] == [year["year"] for year in expected]
+    assert summary[-1]["closing_balance"] == expected[-1]["closing_balance"]
+
+
+def test_payment_dates_clamp_to_month_end():
+    """Test calendar stepping keeps the anchor day and clamps short months"""
+    monthly = generate_payment_dates(datetime(2024, 1, 31), 4, "monthly")
+    assert monthly.astype(str).tolist() == ["2024-01-31", "2024-02-29", "2024-03-31", "2024-04-30"]
+
+    quarterly = generate_payment_dates(datetime(2023, 11, 30), 3, "quarterly")
+    assert quarterly.astype(str).tolist() == ["2023-11-30", "2024-02-29", "2024-05-30"]
+
+    annually = generate_payment_dates(datetime(2024, 2, 29), 2, "annually")
+    assert annually.astype(str).tolist() == ["2024-02-29", "2025-02-28"]
+
+    schedule = generate_amortization_schedule(100000, 10, 1, "monthly", "reducing", datetime(2024, 1, 1))
+    assert schedule[-1]["payment_date"] == "2024-12-01"
+    assert [year["year"] for year in get_year_wise_summary(schedule)] == [2024]
+
+
+def test_fiscal_year_aggregation():
+    """Test calendar and April-March buckets share totals and split correctly"""
+    columns = generate_amortization_columns(1000000, 9, 3, "monthly", "reducing", datetime(2024, 1, 15))
+    buckets = {basis: aggregate_schedule(columns, basis) for basis in ("calendar", "fiscal")}
+
+    assert buckets["calendar"]["year"].tolist() == [2024, 2025, 2026]
+    assert buckets["fiscal"]["year"].tolist() == [2023, 2024, 2025, 2026]
+    assert buckets["fiscal"]["payments"].tolist() == [3, 12, 12, 9]
+    for basis in ("calendar", "fiscal"):
+        assert buckets[basis]["interest_paid"].sum() == pytest.approx(columns["interest_paid"].sum())
+        assert buckets[basis]["closing_balance"][-1] == columns["closing_balance"][-1]
+    assert buckets["fiscal"]["interest_paid"][0] == pytest.approx(columns["interest_paid"][:3].sum())
+
+    closed_form = aggregate_loan_years(get_loan_terms(1000000, 9, 3, "monthly"), datetime(2024, 1, 15))
+    assert closed_form["year"].tolist() == buckets["fiscal"]["year"].tolist()
+    np.testing.assert_allclose(closed_form["interest_paid"], buckets["fiscal"]["interest_paid"], atol=1)
+    np.testing.assert_allclose(closed_form["principal_paid"], buckets["fiscal"]["principal_paid"], atol=1)
+
+
 def test_get_outstanding_principal():
     """Test outstanding principal calculation"""
     outstanding = get_outstanding_principal(
@@ -159,6 +378,124 @@ def test_prepayment_impact_reduce_tenure():
     assert result["interest_saved"] > 0
 
 
+def test_scenario_without_events_matches_loan():
+    """Test an empty scenario reproduces the original loan"""
+    result = simulate_loan_scenario(5000000, 8.5, 20, "monthly", [])
+
+    assert result["number_of_payments"] == 240
+    assert result["interest_saved"] == 0
+    assert result["tenure_reduction_periods"] == 0
+    assert result["total_interest"] == pytest.approx(result["original_total_interest"])
+    assert result["total_interest"] == pytest.approx(
+        get_loan_terms(5000000, 8.5, 20, "monthly").total_interest, abs=10
+    )
+
+
+def test_scenario_matches_period_by_period_simulation():
+    """Test segment-wise closed forms against a plain monthly loop"""
+    events = [
+        {"type": "lump_sum", "period": 12, "amount": 100000, "every": 12},
+        {"type": "emi_change", "period": 12, "percent": 5, "every": 12, "count": 10},
+        {"type": "rate_change", "period": 36, "annual_rate": 9.25},
+        {"type": "holiday", "period": 6, "periods": 3},
+    ]
+    result = simulate_loan_scenario(5000000, 8.5, 20, "monthly", events)
+
+    balance, emi, rate, period, interest = 5000000.0, 43391.16, 8.5 / 1200, 0, 0.0
+    while balance > 1e-6:
+        if period and period % 12 == 0:
+            balance -= min(100000, balance)
+            if period <= 120:
+                emi = round(emi * 1.05, 2)
+        if period == 36:
+            rate = 9.25 / 1200
+        if balance <= 1e-6:
+            break
+        accrued = balance * rate
+        interest += accrued
+        balance += accrued - (0 if 6 <= period < 9 else min(emi, balance + accrued))
+        period += 1
+
+    assert result["total_interest"] == pytest.approx(interest, abs=0.01)
+    assert result["tenure_periods"] == period
+    assert result["number_of_payments"] == period - 3
+    assert result["interest_saved"] > 0
+    assert result["segments"][1]["emi"] == 0  # payment holiday
+
+
+def test_scenario_lump_sum_reduces_tenure():
+    """Test a single prepayment keeps the EMI and shortens the loan"""
+    result = simulate_loan_scenario(
+        5000000, 8.5, 20, "monthly", [{"type": "lump_sum", "period": 24, "amount": 500000}]
+    )
+
+    assert result["total_prepaid"] == 500000
+    assert result["final_emi"] == result["original_emi"]
+    assert result["tenure_reduction_periods"] > 0
+    assert result["interest_saved"] > 0
+
+
+def test_scenario_validation():
+    """Test malformed events and non-amortizing EMIs are rejected"""
+    with pytest.raises(ValueError, match="Event 0"):
+        simulate_loan_scenario(5000000, 8.5, 20, "monthly", [{"type": "bonus", "period": 12}])
+    with pytest.raises(ValueError, match="never be repaid"):
+        simulate_loan_scenario(5000000, 8.5, 20, "monthly", [{"type": "emi_change", "period": 12, "emi": 1000}])
+    # Checked in the library too, not only by the route model
+    with pytest.raises(ValueError, match="count"):
+        simulate_loan_scenario(5000000, 8.5, 20, "monthly",
+                               [{"type": "lump_sum", "period": 12, "amount": 100000, "every": 12, "count": 0}])
+    with pytest.raises(ValueError, match="amount"):
+        simulate_loan_scenario(5000000, 8.5, 20, "monthly", [{"type": "lump_sum", "period": 12, "amount": "100000"}])
+
+
+def test_sensitivity_grid_matches_scalar():
+    """Test the broadcast grid agrees with scalar EMI and APR calculations"""
+    grid = loan_sensitivity_grid([8.0, 9.0, 10.5], [10, 20, 30], [1000000, 5000000])
+
+    assert grid["emi"].shape == (3, 3, 2)
+    emi, total_interest, _, _ = reducing_balance(5000000, 9.0, 20, "monthly")
+    assert grid["emi"][1, 1, 1] == emi
+    assert grid["total_interest"][1, 1, 1] == total_interest
+    assert (grid["apr"] == np.array([8.0, 9.0, 10.5])[:, None, None]).all()
+
+    with_fees = loan_sensitivity_grid([9.0], [20], [5000000], processing_fee_percent=1, other_charges=5000)
+    assert with_fees["apr"][0, 0, 0] == pytest.approx(
+        calculate_apr(5000000, 9.0, 20, "monthly", 50000, 5000)["apr"], abs=0.01
+    )
+
+    payload = sensitivity_grid_to_lists(grid, squeeze=True)
+    assert payload["axes"] == ["annual_rate", "tenure_years", "principal"]
+    compact = sensitivity_grid_to_lists(loan_sensitivity_grid([8.0, 9.0], [10, 20], [5000000]), squeeze=True)
+    assert compact["axes"] == ["annual_rate", "tenure_years"]
+    assert compact["principal"] == 5000000
+    assert len(compact["emi"]) == 2 and len(compact["emi"][0]) == 2
+
+    pooled = loan_sensitivity_grid([8.0, 9.0, 10.5], [10, 20, 30], [1000000, 5000000], parallel=True, max_workers=2)
+    assert np.array_equal(pooled["emi"], grid["emi"])
+
+    with pytest.raises(ValueError):
+        loan_sensitivity_grid([9.0], [60], [5000000])
+
+
+def test_sensitivity_requests_are_capped_well_below_the_library_limit():
+    """Test API/MCP grids are limited per axis and in total cells"""
+    from pydantic import ValidationError
+
+    from dunk_ai.api.routes.loan_clarity import SensitivityRequest
+
+    rates = np.linspace(5, 15, 100).tolist()
+    tenures = np.arange(1, 31).tolist()
+    with pytest.raises(ValueError, match="limit 50000"):
+        loan_sensitivity_grid(rates, tenures, np.linspace(1e5, 1e7, 20).tolist(), max_cells=SENSITIVITY_REQUEST_MAX_CELLS)
+    assert loan_sensitivity_grid(rates, tenures, [1e5, 1e6], max_cells=SENSITIVITY_REQUEST_MAX_CELLS)["emi"].shape == (100, 30, 2)
+
+    with pytest.raises(ValidationError):
+        SensitivityRequest(annual_rates=[9.0] * (SENSITIVITY_REQUEST_MAX_AXIS + 1), tenure_years=[20], principals=[1e6])
+    with pytest.raises(ValidationError):
+        SensitivityRequest(annual_rates=[], tenure_years=[20], principals=[1e6])
+
+
 # ========== Early Settlement Tests ==========
 
 def test_early_settlement():
@@ -242,6 +579,7 @@ def test_compare_loans():
     assert "best_option" in result
     assert len(result["comparisons"]) == 2
     assert result["best_option"]["index"] >= 0
+    assert all(c["apr"] >= c["annual_rate"] for c in result["comparisons"])
 
 
 # ========== Tax Benefits Tests ==========
@@ -284,6 +622,47 @@ def test_tax_benefits_first_time_buyer():
     assert result["section_80eea_deduction"] >= 0
 
 
+def test_tax_benefits_use_fiscal_year_payments():
+    """Test yearly benefits follow the front-loaded interest of the schedule"""
+    first = calculate_tax_benefits(5000000, 8.5, 20, "monthly", financial_year=2024)
+    later = calculate_tax_benefits(
+        5000000, 8.5, 20, "monthly", financial_year=2034, start_date=datetime(2024, 4, 1)
+    )
+
+    assert first["financial_year"] == "2024-25"
+    assert first["annual_interest"] > later["annual_interest"]
+    assert first["annual_principal"] < later["annual_principal"]
+    assert first["annual_interest"] + first["annual_principal"] == pytest.approx(
+        12 * get_loan_terms(5000000, 8.5, 20, "monthly").emi, abs=1
+    )
+
+    with pytest.raises(ValueError):
+        calculate_tax_benefits(5000000, 8.5, 20, "monthly", financial_year=2060, start_date=datetime(2024, 4, 1))
+
+
+def test_lifetime_tax_benefits_cap_each_year():
+    """Test lifetime deductions apply the section caps fiscal year by fiscal year"""
+    result = calculate_lifetime_tax_benefits(
+        5000000, 8.5, 30, "monthly", "home_loan", "reducing", 30.0,
+        start_date=datetime(2024, 7, 10)
+    )
+    yearly = result["yearly_breakdown"]
+
+    assert len(yearly) == 31
+    assert yearly[0]["financial_year"] == "2024-25"
+    assert all(year["section_24_deduction"] <= 200000 for year in yearly)
+    assert all(year["section_80c_deduction"] <= 150000 for year in yearly)
+    # Interest dominates early (capped), principal dominates late (capped)
+    assert yearly[1]["section_24_deduction"] == 200000
+    assert yearly[1]["section_80c_deduction"] < 150000
+    assert yearly[-2]["section_80c_deduction"] == 150000
+    assert yearly[-2]["section_24_deduction"] < 200000
+
+    assert sum(year["interest_paid"] for year in yearly) == pytest.approx(result["total_interest"], rel=1e-6)
+    assert sum(result["section_totals"].values()) == pytest.approx(result["lifetime_deduction"], abs=0.05)
+    assert sum(year["tax_savings"] for year in yearly) == pytest.approx(result["lifetime_tax_savings"], abs=0.5)
+
+
 # ========== Loan Eligibility Tests ==========
 
 def test_calculate_loan_eligibility():
@@ -357,6 +736,33 @@ def test_calculate_apr():
     assert result["apr"] > result["nominal_rate"]
 
 
+def test_apr_is_irr_of_net_disbursement():
+    """Test APR equals nominal rate without charges and solves the IRR otherwise"""
+    no_charges = calculate_apr(1000000, 10, 20, "monthly")
+    with_charges = calculate_apr(1000000, 10, 20, "monthly", processing_fee=10000, other_charges=5000)
+    flat = calculate_apr(1000000, 10, 2, "monthly", interest_method="flat")
+
+    assert no_charges["apr"] == pytest.approx(10.0, abs=0.01)
+    assert 10 < with_charges["apr"] < 10.5
+    assert flat["apr"] > 17  # Flat rate hides a much higher true rate
+
+    emi, _, _, n = reducing_balance(1000000, 10, 20, "monthly")
+    rate = solve_periodic_irr(985000, emi, n, 0.1 / 12)
+    assert emi * (1 - (1 + rate) ** -n) / rate == pytest.approx(985000, rel=1e-9)
+
+
+def test_periodic_irr_batch_matches_scalar():
+    """Test vectorized IRR solver agrees with the scalar solver"""
+    nets = [985000, 490000, 2000000]
+    payments = [9650.22, 10624.33, 25000.0]
+    counts = [240, 60, 120]
+    rates = solve_periodic_irr_batch(nets, payments, counts, 0.008)
+
+    for rate, net, payment, count in zip(rates, nets, payments, counts):
+        assert rate == pytest.approx(solve_periodic_irr(net, payment, count), rel=1e-8)
+    assert np.isnan(solve_periodic_irr_batch([100000], [10], [12])[0])
+
+
 # ========== Edge Cases and Error Handling ==========
 
 def test_zero_principal_error():
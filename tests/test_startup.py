@@ -0,0 +1,15 @@
+from dunk_ai.benchmarks.startup import measure_import
+
+
+def test_api_import_defers_heavy_dependencies():
+    result = measure_import("dunk_ai.api.main", runs=1)
+    assert result["error"] is None
+    # Market data, charting, ML and LLM stacks load on first use only
+    assert result["heavy"] == []
+
+
+def test_targets_missing_from_the_tree_are_reported_as_unavailable():
+    # The MCP server only ships in src/, not in the installed backend package
+    result = measure_import("dunk_ai.server.mcp_server", runs=1)
+    assert result["missing"]
+    assert not measure_import("dunk_ai.tools.loan_clarity", runs=1)["missing"]